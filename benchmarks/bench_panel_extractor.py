@@ -0,0 +1,333 @@
+"""Benchmark: single-pass panel extractor vs. the BeautifulSoup panel parsers it replaced
+
+Run from the repository root (needs BeautifulSoup: pip install -r benchmarks/requirements.txt):
+    python benchmarks/bench_panel_extractor.py [iterations]
+
+Builds synthetic panel pages (one per server state) and loads the corpus pages, checks that bot.extract_panel() gives the
+same queue position/time, countdown and extend button state as the old parsers, and times both.
+Exits with status 1 if any result differs.
+"""
+import contextlib
+import io
+import os
+import re
+import sys
+import time
+
+from bs4 import BeautifulSoup
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import bot  # noqa: E402
+
+# ---- Parsers as they were in bot.py before extract_panel() (kept verbatim as the reference) ----
+
+EXTEND_BUTTON_PATTERNS = [
+    'server-extend-end',
+    'btn btn-tiny btn-success server-extend-end',
+    'class="extend"',
+    'server-extend',
+    'extend-end',
+    'fas fa-plus',
+]
+
+def find_extend_button(html_content):
+    """Check panel HTML for the extend button (indicates countdown <= 60 seconds)"""
+    for pattern in EXTEND_BUTTON_PATTERNS:
+        if pattern in html_content:
+            print(f"✅ Extend button found using pattern: '{pattern}'")
+            return True
+    
+    # Also check for the countdown div which appears with the button
+    if 'server-end-countdown' in html_content:
+        # The extend button appears in the same section as countdown
+        if 'extend' in html_content.lower() or 'fa-plus' in html_content:
+            print("✅ Extend button likely exists (found countdown + extend references)")
+            return True
+    return False
+
+def parse_queue_from_html(html_content):
+    """Parse queue position and time from Aternos HTML"""
+    queue_position = None
+    queue_time_str = None
+    
+    try:
+        # Try using BeautifulSoup if available
+        try:
+            soup = BeautifulSoup(html_content, 'html.parser')
+            
+            # Find queue position: <span class="server-status-label-right queue-position"> (may have "hidden" class)
+            queue_pos_elem = soup.find('span', class_=lambda x: x and 'queue-position' in x)
+            if queue_pos_elem:
+                queue_position = queue_pos_elem.get_text(strip=True)
+                if queue_position:
+                    print(f"Found queue position in HTML: {queue_position}")
+            
+            # Find queue time: <div class="server-status-label-left queue-time"> (may have "hidden" class)
+            queue_time_elem = soup.find('div', class_=lambda x: x and 'queue-time' in x)
+            if queue_time_elem:
+                queue_time_str = queue_time_elem.get_text(strip=True)
+                if queue_time_str:
+                    print(f"Found queue time in HTML: {queue_time_str}")
+        except ImportError:
+            # BeautifulSoup not available, use regex
+            pass
+        except Exception as e:
+            print(f"Error with BeautifulSoup, trying regex: {e}")
+        
+        # Always try regex as fallback (works even if BeautifulSoup failed)
+        if not queue_position:
+            # Pattern for queue position: "3535 / 3835" or "3535/3835" (handles "hidden" class)
+            pos_match = re.search(r'<span[^>]*class="[^"]*queue-position[^"]*"[^>]*>([^<]+)</span>', html_content, re.IGNORECASE | re.DOTALL)
+            if pos_match:
+                queue_position = pos_match.group(1).strip()
+                if queue_position:
+                    print(f"Found queue position in HTML (regex): {queue_position}")
+        
+        if not queue_time_str:
+            # Pattern for queue time: "ca. 8 min" (handles "hidden" class)
+            time_match = re.search(r'<div[^>]*class="[^"]*queue-time[^"]*"[^>]*>([^<]+)</div>', html_content, re.IGNORECASE | re.DOTALL)
+            if time_match:
+                queue_time_str = time_match.group(1).strip()
+                if queue_time_str:
+                    print(f"Found queue time in HTML (regex): {queue_time_str}")
+        
+        # Also try to find the data in the status div directly
+        if not queue_position or not queue_time_str:
+            # Look for the pattern in the status div: <div class="status queueing">
+            status_match = re.search(r'<div[^>]*class="[^"]*status[^"]*queueing[^"]*"[^>]*>.*?</div>', html_content, re.IGNORECASE | re.DOTALL)
+            if status_match:
+                status_html = status_match.group(0)
+                # Try to extract from this section
+                if not queue_position:
+                    pos_in_status = re.search(r'(\d+\s*[/]\s*\d+)', status_html)
+                    if pos_in_status:
+                        queue_position = pos_in_status.group(1).strip()
+                        print(f"Found queue position in status div: {queue_position}")
+                
+                if not queue_time_str:
+                    time_in_status = re.search(r'ca\.\s*(\d+)\s*min', status_html, re.IGNORECASE)
+                    if time_in_status:
+                        queue_time_str = f"ca. {time_in_status.group(1)} min"
+                        print(f"Found queue time in status div: {queue_time_str}")
+    except Exception as e:
+        print(f"Error parsing HTML: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    return queue_position, queue_time_str
+
+def parse_countdown_from_html(html_content):
+    """Parse countdown timer from Aternos HTML (format: M:SS or SS)"""
+    countdown_seconds = None
+    extend_button_exists = False
+    
+    try:
+        # First, check if extend button exists (indicates countdown <= 60 seconds)
+        if 'server-extend-end' in html_content or 'btn btn-tiny btn-success server-extend-end' in html_content:
+            extend_button_exists = True
+            print("✅ Extend button found in HTML - countdown is <= 60 seconds")
+        
+        # Try using BeautifulSoup if available
+        try:
+            soup = BeautifulSoup(html_content, 'html.parser')
+            
+            # Find countdown: <div class="server-end-countdown">0:35</div>
+            # Also check for bis_skin_checked attribute
+            countdown_elem = soup.find('div', class_=lambda x: x and 'server-end-countdown' in x)
+            if not countdown_elem:
+                # Try finding by text pattern
+                countdown_elem = soup.find('div', string=re.compile(r'\d+:\d+'))
+            
+            if countdown_elem:
+                countdown_text = countdown_elem.get_text(strip=True)
+                if countdown_text:
+                    # Parse format like "0:35" or "35"
+                    if ':' in countdown_text:
+                        parts = countdown_text.split(':')
+                        if len(parts) == 2:
+                            try:
+                                minutes = int(parts[0])
+                                seconds = int(parts[1])
+                                countdown_seconds = minutes * 60 + seconds
+                            except ValueError:
+                                pass
+                    else:
+                        # Just seconds
+                        try:
+                            countdown_seconds = int(countdown_text)
+                        except ValueError:
+                            pass
+                    
+                    if countdown_seconds is not None:
+                        print(f"Found countdown in HTML: {countdown_text} ({countdown_seconds}s)")
+        except ImportError:
+            # BeautifulSoup not available, use regex
+            pass
+        except Exception as e:
+            print(f"Error with BeautifulSoup, trying regex: {e}")
+        
+        # Always try regex as fallback
+        if countdown_seconds is None:
+            # Pattern for countdown: <div class="server-end-countdown">0:35</div>
+            # Handle bis_skin_checked attribute
+            countdown_match = re.search(r'<div[^>]*class="[^"]*server-end-countdown[^"]*"[^>]*>([^<]+)</div>', html_content, re.IGNORECASE | re.DOTALL)
+            if countdown_match:
+                countdown_text = countdown_match.group(1).strip()
+                # Parse format like "0:35" or "35"
+                if ':' in countdown_text:
+                    parts = countdown_text.split(':')
+                    if len(parts) == 2:
+                        try:
+                            minutes = int(parts[0])
+                            seconds = int(parts[1])
+                            countdown_seconds = minutes * 60 + seconds
+                        except ValueError:
+                            pass
+                else:
+                    # Just seconds
+                    try:
+                        countdown_seconds = int(countdown_text)
+                    except ValueError:
+                        pass
+                
+                if countdown_seconds is not None:
+                    print(f"Found countdown in HTML (regex): {countdown_text} ({countdown_seconds}s)")
+        
+        # If extend button exists but we couldn't parse countdown, assume it's <= 60 seconds
+        if extend_button_exists and countdown_seconds is None:
+            print("⚠️ Extend button found but couldn't parse exact countdown, assuming <= 60 seconds")
+            countdown_seconds = 60  # Set to 60 as a safe default when button is visible
+        
+    except Exception as e:
+        print(f"Error parsing countdown HTML: {e}")
+        import traceback
+        traceback.print_exc()
+    
+    return countdown_seconds
+
+
+def legacy_extract(html_content):
+    return {
+        'queue': parse_queue_from_html(html_content),
+        'countdown_seconds': parse_countdown_from_html(html_content),
+        'extend_button_exists': find_extend_button(html_content),
+    }
+
+def new_extract(html_content):
+    fields = bot.extract_panel(html_content)
+    return {
+        'queue': (fields['queue_position'], fields['queue_time_str']),
+        'countdown_seconds': fields['countdown_seconds'],
+        'extend_button_exists': fields['extend_button_exists'],
+    }
+
+# ---- Synthetic panel pages ----
+
+def page_chrome(body):
+    """Wrap a status section in roughly the size and shape of the real panel page"""
+    nav = ''.join(
+        f'<li class="nav-item"><a class="nav-link" href="/{name}/"><i class="fas fa-{name}"></i>'
+        f'<span class="nav-label">{name.title()}</span></a></li>'
+        for name in ('server', 'options', 'console', 'log', 'players', 'software', 'plugins', 'worlds',
+                     'backups', 'access', 'files', 'ports')
+    )
+    filler = ''.join(
+        f'<div class="card card-{i}"><div class="card-title">Option {i}</div>'
+        f'<div class="card-body"><span class="option-value">value {i}</span>'
+        f'<input type="checkbox" name="opt{i}" data-id="{i}"></div></div>'
+        for i in range(300)
+    )
+    script = '<script>' + 'var lang = {"queue": "Queue", "online": "Online"};' * 40 + '</script>'
+    return (
+        '<!DOCTYPE html><html lang="en"><head><meta charset="utf-8"><title>Server | Aternos</title>'
+        '<link rel="stylesheet" href="/panel/css/main.css">' + script + '</head>'
+        f'<body class="page-server"><header class="header"><ul class="navigation">{nav}</ul></header>'
+        f'<main class="page-content"><div class="server-status">{body}</div>{filler}</main>'
+        '<footer class="footer"><span class="copyright">Aternos</span></footer></body></html>'
+    )
+
+SAMPLES = {
+    'offline': page_chrome(
+        '<div class="status offline"><div class="statuslabel"><span class="statuslabel-label">Offline</span></div></div>'
+        '<div class="server-status-label-left queue-time hidden"></div>'
+        '<span class="server-status-label-right queue-position hidden"></span>'
+    ),
+    'queueing': page_chrome(
+        '<div class="status queueing"><div class="statuslabel"><span class="statuslabel-label">Waiting in queue</span></div></div>'
+        '<div class="server-status-label-left queue-time">ca. 8 min</div>'
+        '<span class="server-status-label-right queue-position">3535 / 3835</span>'
+    ),
+    'queueing-nested': page_chrome(
+        '<div class="status queueing"><div class="statuslabel"><span class="statuslabel-label">Waiting in queue</span></div></div>'
+        '<div class="server-status-label-left queue-time"><i class="fas fa-clock"></i> ca. 3 min</div>'
+        '<span class="server-status-label-right queue-position"><b>12</b> / 40</span>'
+    ),
+    'queueing-status-div': page_chrome(
+        '<div class="status queueing">Waiting in queue 52 / 977, ca. 4 min</div>'
+        '<div class="server-status-label-left queue-time hidden"></div>'
+    ),
+    'starting': page_chrome(
+        '<div class="status loading starting"><div class="statuslabel"><span class="statuslabel-label">Starting ...</span></div></div>'
+    ),
+    'online': page_chrome(
+        '<div class="status online"><div class="statuslabel"><span class="statuslabel-label">Online</span></div></div>'
+        '<div class="server-end-countdown" bis_skin_checked="1">3:12</div>'
+    ),
+    'online-extend': page_chrome(
+        '<div class="status online"><div class="statuslabel"><span class="statuslabel-label">Online</span></div></div>'
+        '<div class="server-end-countdown" bis_skin_checked="1">0:35</div>'
+        '<button class="btn btn-tiny btn-success server-extend-end"><i class="fas fa-plus"></i></button>'
+    ),
+    'online-extend-no-countdown': page_chrome(
+        '<div class="status online"><div class="statuslabel"><span class="statuslabel-label">Online</span></div></div>'
+        '<div class="server-end-countdown"></div>'
+        '<button class="btn btn-tiny btn-success server-extend-end"><i class="fas fa-plus"></i></button>'
+    ),
+}
+
+# Corpus pages (benchmarks/corpus/panel) are compared too
+CORPUS_PANEL_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'corpus', 'panel')
+for filename in sorted(os.listdir(CORPUS_PANEL_DIR)) if os.path.isdir(CORPUS_PANEL_DIR) else []:
+    if filename.endswith('.html'):
+        with open(os.path.join(CORPUS_PANEL_DIR, filename), 'r', encoding='utf-8') as f:
+            SAMPLES[f'corpus/{filename[:-5]}'] = f.read()
+
+def best_time(func, html_content, iterations):
+    """Best per-call time in milliseconds over a few rounds"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(html_content)
+        best = min(best, (time.perf_counter() - start) / iterations)
+    return best * 1000
+
+def main():
+    iterations = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    mismatches = 0
+    total_old = total_new = 0.0
+    print(f"{'sample':<28} {'size':>8} {'old ms':>9} {'new ms':>9} {'speedup':>8}  result")
+    for name, html_content in SAMPLES.items():
+        # The old parsers print what they find; keep the table readable
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = legacy_extract(html_content)
+            old_ms = best_time(legacy_extract, html_content, iterations)
+        actual = new_extract(html_content)
+        new_ms = best_time(new_extract, html_content, iterations)
+        total_old += old_ms
+        total_new += new_ms
+        same = actual == expected
+        mismatches += not same
+        print(f"{name:<28} {len(html_content):>8} {old_ms:>9.3f} {new_ms:>9.3f} {old_ms / new_ms:>7.1f}x  "
+              f"{'same' if same else 'DIFFERENT'}")
+        if not same:
+            print(f"    old: {expected}")
+            print(f"    new: {actual}")
+    print(f"{'total':<28} {'':>8} {total_old:>9.3f} {total_new:>9.3f} {total_old / total_new:>7.1f}x")
+    if mismatches:
+        print(f"❌ {mismatches} sample(s) differ from the old parsers")
+        sys.exit(1)
+    print('✅ All samples match the old parsers')
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,147 @@
+"""Parser benchmark and regression check over the recorded panel/ajax corpus
+
+Run from the repository root:
+    python benchmarks/run_corpus.py [--iterations N] [--save results.json] [--baseline results.json]
+
+Every case in benchmarks/corpus/cases.json names a corpus file and the expected output of one
+or more parsers. For each (file, parser) pair this reports the best time per call, the peak
+memory allocated during one call (tracemalloc) and whether the output matches. --save writes
+the numbers to a JSON file; --baseline compares against such a file from an earlier commit.
+Exits with status 1 if any output differs from the expected one.
+"""
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CORPUS_DIR = os.path.join(BENCH_DIR, 'corpus')
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+import bot  # noqa: E402
+
+def parse_last_status(html_content):
+    """lastStatus JSON embedded in the panel page, as fetch_server_page reads it"""
+    info_data = json.loads(bot.LAST_STATUS_RE.search(html_content)[1])
+    return {
+        'status': info_data.get('status'),
+        'class': info_data.get('class'),
+        'countdown': info_data.get('countdown'),
+        'queue': bot.queue_from_status_info(info_data),
+    }
+
+class StatusHolder:
+    """Stands in for an AternosServer that only has a status dict"""
+    def __init__(self, info_data):
+        self._info = info_data
+
+def parse_confirm(data):
+    """Confirmation detection as every code path sees it (ServerSnapshot.needs_confirm)"""
+    info_data = json.loads(bot.LAST_STATUS_RE.search(data)[1]) if isinstance(data, str) else data
+    snapshot = bot.ServerSnapshot.from_server(StatusHolder(info_data))
+    return {'needs_confirm': snapshot.needs_confirm, 'reason': snapshot.confirm_reason}
+
+# Parser name -> function taking the loaded corpus file (str, or decoded object for .json files)
+PARSERS = {
+    'panel': bot.extract_panel,
+    'last_status': parse_last_status,
+    'status_info': bot.queue_from_status_info,
+    'queue_api': bot.parse_queue_api_data,
+    'confirm': parse_confirm,
+}
+
+def load_input(relative_path):
+    with open(os.path.join(CORPUS_DIR, relative_path), 'r', encoding='utf-8') as f:
+        text = f.read()
+    return json.loads(text) if relative_path.endswith('.json') else text
+
+def normalize(value):
+    """Compare outputs the way they are stored in cases.json (tuples become lists)"""
+    return json.loads(json.dumps(value))
+
+def load_cases():
+    with open(os.path.join(CORPUS_DIR, 'cases.json'), 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+def run_parser(parser_name, data):
+    """One parser's output as stored in cases.json"""
+    # Parsers may log what they find; keep the table readable
+    with contextlib.redirect_stdout(io.StringIO()):
+        return normalize(PARSERS[parser_name](data))
+
+def measure(func, data, iterations):
+    """Best time per call (microseconds) over a few rounds, and peak bytes allocated by one call"""
+    best = float('inf')
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(iterations):
+            func(data)
+        best = min(best, (time.perf_counter() - start) / iterations)
+    tracemalloc.start()
+    try:
+        func(data)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return best * 1e6, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--iterations', type=int, default=50)
+    parser.add_argument('--save', help='write results to this JSON file')
+    parser.add_argument('--baseline', help='compare timings with results saved by --save')
+    args = parser.parse_args()
+    
+    cases = load_cases()
+    baseline = {}
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+    
+    results = {}
+    failures = 0
+    per_parser = {}
+    print(f"{'case':<42} {'parser':<12} {'time us':>9} {'peak KB':>8} {'vs base':>8}  result")
+    for relative_path, expectations in cases.items():
+        data = load_input(relative_path)
+        for parser_name, expected in expectations.items():
+            actual = run_parser(parser_name, data)
+            with contextlib.redirect_stdout(io.StringIO()):
+                micros, peak = measure(PARSERS[parser_name], data, args.iterations)
+            ok = actual == expected
+            failures += not ok
+            key = f'{relative_path}::{parser_name}'
+            results[key] = {'time_us': round(micros, 2), 'peak_bytes': peak, 'ok': ok}
+            stats = per_parser.setdefault(parser_name, {'cases': 0, 'failed': 0, 'time_us': 0.0})
+            stats['cases'] += 1
+            stats['failed'] += not ok
+            stats['time_us'] += micros
+            
+            change = ''
+            if key in baseline and baseline[key]['time_us']:
+                change = f"{(micros / baseline[key]['time_us'] - 1) * 100:+.0f}%"
+            print(f"{relative_path:<42} {parser_name:<12} {micros:>9.1f} {peak / 1024:>8.1f} {change:>8}  "
+                  f"{'ok' if ok else 'WRONG'}")
+            if not ok:
+                print(f"    expected: {expected}")
+                print(f"    got:      {actual}")
+    
+    print()
+    for parser_name, stats in per_parser.items():
+        print(f"{parser_name:<12} {stats['cases']} cases, {stats['failed']} wrong, "
+              f"{stats['time_us']:.1f} us total")
+    
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'saved_at': time.time(), 'iterations': args.iterations, 'results': results}, f, indent=2)
+        print(f"Results saved to {args.save}")
+    if failures:
+        print(f"❌ {failures} parser output(s) differ from cases.json")
+        sys.exit(1)
+    print('✅ All parser outputs match cases.json')
+
+if __name__ == '__main__':
+    main()
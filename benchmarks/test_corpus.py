@@ -0,0 +1,19 @@
+"""Every case in benchmarks/corpus/cases.json as a test
+
+Run from the repository root:
+    python -m pytest benchmarks
+"""
+import pytest
+
+import run_corpus
+
+CASES = [
+    (relative_path, parser_name, expected)
+    for relative_path, expectations in run_corpus.load_cases().items()
+    for parser_name, expected in expectations.items()
+]
+
+@pytest.mark.parametrize('relative_path,parser_name,expected', CASES,
+                         ids=[f'{relative_path}::{parser_name}' for relative_path, parser_name, _ in CASES])
+def test_corpus_case(relative_path, parser_name, expected):
+    assert run_corpus.run_parser(parser_name, run_corpus.load_input(relative_path)) == expected
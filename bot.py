@@ -7,7 +7,18 @@ from discord.ui import Button, View
 from dotenv import load_dotenv
 import time 
 import re
-from bs4 import BeautifulSoup
+import random
+import hashlib
+import functools
+import contextlib
+import sqlite3
+import threading
+import heapq
+import collections
+import copy
+import itertools
+import weakref
+from concurrent.futures import ThreadPoolExecutor
 import cloudscraper
 import requests
 
@@ -103,14 +114,225 @@ load_dotenv()
 # Get Discord token from .env
 DISCORD_TOKEN = os.getenv('DISCORD_TOKEN')
 
-# Storage file for server credentials
+# Server credentials file of older versions (imported into SETTINGS_DB)
 CREDENTIALS_FILE = 'server_credentials.json'
 
 # Create Discord bot
+# MESSAGE_CONTENT_INTENT=false drops the privileged message content intent: the gateway no longer sends
+# message text and no messages are cached. Slash commands work as usual; prefix commands only work
+# when mentioning the bot (e.g. "@Bot status")
+MESSAGE_CONTENT_INTENT = os.getenv('MESSAGE_CONTENT_INTENT', 'true').lower() in ('1', 'true', 'yes', 'on')
 intents = discord.Intents.default()
-intents.message_content = True
+intents.message_content = MESSAGE_CONTENT_INTENT
 intents.guilds = True
-bot = commands.Bot(command_prefix='!', intents=intents)
+# Rate limits longer than this are raised (discord.RateLimited) instead of waited out, so the outbox can
+# park the route and keep other channels moving (discord.py's minimum is 30)
+DISCORD_MAX_RATELIMIT_WAIT = 30
+bot = commands.Bot(
+    command_prefix='!' if MESSAGE_CONTENT_INTENT else commands.when_mentioned,
+    intents=intents,
+    max_messages=1000 if MESSAGE_CONTENT_INTENT else None,
+    max_ratelimit_timeout=DISCORD_MAX_RATELIMIT_WAIT
+)
+slash_commands_synced = False
+
+# Outgoing Discord messages and edits share a per-route budget (Discord allows about 5 per 5 seconds per channel).
+# This is a static approximation, not learned from Discord's X-RateLimit-* headers: discord.py keeps honouring
+# those (and retrying 429s) underneath, the budget only decides which queued request goes first
+DISCORD_ROUTE_LIMIT = int(os.getenv('DISCORD_ROUTE_LIMIT', 5))
+DISCORD_ROUTE_WINDOW = float(os.getenv('DISCORD_ROUTE_WINDOW', 5))
+# Outbox priorities (lower goes first)
+OUTBOX_URGENT = 0  # Confirmation prompts and results, failures
+OUTBOX_NORMAL = 1  # Command replies, notices
+OUTBOX_COSMETIC = 2  # Progress updates
+
+class OutboxItem:
+    """One queued Discord request"""
+    __slots__ = ('route', 'func', 'args', 'kwargs', 'priority', 'edit_key', 'future', 'dispatched')
+    
+    def __init__(self, route, func, args, kwargs, priority, edit_key):
+        self.route = route
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.priority = priority
+        self.edit_key = edit_key
+        self.future = asyncio.get_running_loop().create_future()
+        self.dispatched = False
+
+class RouteBucket:
+    """Recent requests on one Discord route, to stay under its rate limit (a fixed budget, see DISCORD_ROUTE_LIMIT)"""
+    def __init__(self, limit=DISCORD_ROUTE_LIMIT, window=DISCORD_ROUTE_WINDOW):
+        self.limit = limit
+        self.window = window
+        self.sent = collections.deque()  # Request times within the window
+        self.blocked_until = 0.0  # Set by a 429
+    
+    def ready_at(self, now):
+        """When the next request on this route may go"""
+        while self.sent and now - self.sent[0] >= self.window:
+            self.sent.popleft()
+        at = self.blocked_until
+        if len(self.sent) >= self.limit:
+            at = max(at, self.sent[0] + self.window)
+        return at
+    
+    def use(self, now):
+        self.sent.append(now)
+    
+    def block(self, seconds):
+        self.blocked_until = max(self.blocked_until, time.time() + seconds)
+
+class DiscordOutbox:
+    """Central queue of outgoing Discord messages and edits
+
+    Requests go out by priority as their route's bucket allows, so a confirm prompt doesn't wait behind
+    progress edits. A queued edit of a message that gets edited again is merged into the newer one.
+    """
+    def __init__(self):
+        self.heap = []  # (priority, seq, item)
+        self.seq = itertools.count()
+        self.buckets = {}  # route -> RouteBucket
+        self.queued_edits = {}  # message id -> queued OutboxItem
+        self.wakeup = None
+        self.runner = None
+        self.sent = 0
+        self.merged = 0
+        self.rate_limited = 0
+    
+    def submit(self, route, func, *args, priority=OUTBOX_NORMAL, edit_key=None, **kwargs):
+        """Queue func(*args, **kwargs) on a route; returns a future with its result"""
+        if edit_key is not None:
+            queued = self.queued_edits.get(edit_key)
+            if queued is not None and not queued.dispatched:
+                # The stale edit is dropped: the newer one is applied on top of it in its place
+                queued.kwargs.update(kwargs)
+                self.merged += 1
+                if priority < queued.priority:
+                    queued.priority = priority
+                    self._push(queued)
+                return queued.future
+        item = OutboxItem(route, func, args, kwargs, priority, edit_key)
+        if edit_key is not None:
+            self.queued_edits[edit_key] = item
+        self._push(item)
+        return item.future
+    
+    def _push(self, item):
+        heapq.heappush(self.heap, (item.priority, next(self.seq), item))
+        if self.wakeup is None:
+            self.wakeup = asyncio.Event()
+        self.wakeup.set()
+        if self.runner is None or self.runner.done():
+            self.runner = asyncio.ensure_future(self._run())
+    
+    def bucket(self, route):
+        bucket = self.buckets.get(route)
+        if bucket is None:
+            bucket = self.buckets[route] = RouteBucket()
+        return bucket
+    
+    async def _run(self):
+        while True:
+            now = time.time()
+            blocked = []
+            wait = None
+            while self.heap:
+                entry = heapq.heappop(self.heap)
+                priority, _, item = entry
+                # Skip entries of items already sent, re-prioritized, or no longer awaited
+                if item.dispatched or priority != item.priority or item.future.done():
+                    continue
+                ready_at = self.bucket(item.route).ready_at(now)
+                if ready_at > now:
+                    blocked.append(entry)
+                    wait = ready_at - now if wait is None else min(wait, ready_at - now)
+                    continue
+                self.bucket(item.route).use(now)
+                item.dispatched = True
+                if self.queued_edits.get(item.edit_key) is item:
+                    del self.queued_edits[item.edit_key]
+                asyncio.ensure_future(self._dispatch(item))
+            for entry in blocked:
+                heapq.heappush(self.heap, entry)
+            if not self.heap:
+                return
+            self.wakeup.clear()
+            try:
+                await asyncio.wait_for(self.wakeup.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
+    
+    async def _dispatch(self, item):
+        try:
+            result = await item.func(*item.args, **item.kwargs)
+        except (discord.RateLimited, discord.HTTPException) as e:
+            retry_after = getattr(e, 'retry_after', None)
+            if retry_after is None and getattr(e, 'status', None) == 429:
+                retry_after = DISCORD_ROUTE_WINDOW
+            if retry_after is None:
+                if not item.future.done():
+                    item.future.set_exception(e)
+                return
+            # Park the route and send the request again when it's free
+            print(f'⚠️ Discord rate limit on {item.route[0]} route, retrying in {retry_after:.1f}s')
+            self.rate_limited += 1
+            self.bucket(item.route).block(retry_after)
+            newer = self.queued_edits.get(item.edit_key) if item.edit_key is not None else None
+            if newer is not None:
+                # The message was edited again meanwhile: send one edit with both
+                newer.kwargs = {**item.kwargs, **newer.kwargs}
+                newer.future.add_done_callback(functools.partial(self._copy_result, item.future))
+                return
+            item.dispatched = False
+            if item.edit_key is not None:
+                self.queued_edits[item.edit_key] = item
+            self._push(item)
+            return
+        except Exception as e:
+            if not item.future.done():
+                item.future.set_exception(e)
+            return
+        self.sent += 1
+        if not item.future.done():
+            item.future.set_result(result)
+    
+    @staticmethod
+    def _copy_result(future, source):
+        if future.done():
+            return
+        if source.exception() is not None:
+            future.set_exception(source.exception())
+        else:
+            future.set_result(source.result())
+    
+    def describe(self):
+        """Plain-text stats for !debug and the health endpoint"""
+        queued = len({id(item) for _, _, item in self.heap if not item.dispatched})
+        return (f'Discord outbox: {queued} queued, {self.sent} sent, {self.merged} stale edits merged, '
+                f'{self.rate_limited} rate limited')
+
+discord_outbox = DiscordOutbox()
+
+async def outbox_send(target, *args, priority=OUTBOX_NORMAL, **kwargs):
+    """target.send() (a channel or command context) through the outbox; returns the sent message"""
+    channel = getattr(target, 'channel', target)
+    future = discord_outbox.submit(('send', channel.id), target.send, *args, priority=priority, **kwargs)
+    return await asyncio.shield(future)
+
+async def outbox_edit(message, priority=OUTBOX_NORMAL, **kwargs):
+    """message.edit() through the outbox; a newer edit of the same message replaces it while it waits"""
+    future = discord_outbox.submit(
+        ('edit', message.channel.id), message.edit, priority=priority, edit_key=message.id, **kwargs
+    )
+    return await asyncio.shield(future)
+
+async def outbox_followup(interaction, *args, priority=OUTBOX_NORMAL, **kwargs):
+    """interaction.followup.send() through the outbox"""
+    future = discord_outbox.submit(
+        ('followup', interaction.id), interaction.followup.send, *args, priority=priority, **kwargs
+    )
+    return await asyncio.shield(future)
 
 # Store Aternos clients per server
 server_clients = {}
@@ -122,69 +344,922 @@ queue_monitoring_tasks = {}
 # Store auto-start monitoring tasks
 auto_start_tasks = {}
 
+# Store extend timers (armed while an auto-started server is online with no players)
+extend_jobs = {}
+
 # Auto-start settings file
 AUTO_START_FILE = 'auto_start_settings.json'
 
-def load_credentials():
-    """Load server credentials from JSON file"""
-    if os.path.exists(CREDENTIALS_FILE):
-        with open(CREDENTIALS_FILE, 'r') as f:
-            return json.load(f)
-    return {}
+# Polling preset settings file
+POLLING_FILE = 'polling_settings.json'
+
+# Saved Aternos sessions (cookies, ajax token, server id) so restarts can skip login
+SESSION_CACHE_FILE = 'session_cache.json'
+# How long a saved session is trusted before a full login is required again (seconds)
+SESSION_CACHE_TTL = float(os.getenv('SESSION_CACHE_TTL', 12 * 60 * 60))
+
+# Credentials, settings and saved sessions live in this SQLite database; the JSON files above
+# are only read once, to import settings from older versions
+SETTINGS_DB = os.getenv('SETTINGS_DB', 'bot_settings.db')
+# How often (seconds) cached settings are checked against changes made by another process
+STORE_SYNC_INTERVAL = float(os.getenv('STORE_SYNC_INTERVAL', 5))
+
+class SettingsStore:
+    """Per-guild settings in SQLite (WAL), read through an in-memory copy that every write updates
+
+    Each kind (credentials, auto_start, ...) maps guild ids to JSON values. Writes are single
+    transactions, so concurrent tasks and other bot processes can't lose each other's changes;
+    changes made by another process are picked up within STORE_SYNC_INTERVAL seconds.
+    The database is opened, imported and loaded at startup. After that, reads only use the memory copy,
+    and writes and reloads run in order on a writer thread, so waiting for another process' write lock
+    never blocks the event loop.
+    """
+    DELETED = object()  # Pending value of a delete
+    
+    def __init__(self, path=SETTINGS_DB, legacy_files=None):
+        self.path = path
+        self.legacy_files = legacy_files or {}  # kind -> JSON file imported at startup
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix='settings-writer')
+        self.lock = threading.RLock()  # Guards the memory copy; never held while waiting on the database
+        self.cache = {}  # kind -> {guild id: value}
+        self.pending = {}  # (kind, guild id) -> (write number, value) until the write is committed
+        self.write_seq = itertools.count(1)
+        self.data_version = None
+        self.synced_at = time.time()
+        # Used here at startup, then only on the writer thread
+        self.conn = self._open()
+        self._migrate_json()
+        self._sync()
+    
+    def _open(self):
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('CREATE TABLE IF NOT EXISTS settings (kind TEXT NOT NULL, guild_id TEXT NOT NULL, '
+                     'value TEXT NOT NULL, PRIMARY KEY (kind, guild_id))')
+        conn.execute('CREATE TABLE IF NOT EXISTS migrations (name TEXT PRIMARY KEY, migrated_at REAL NOT NULL)')
+        return conn
+    
+    def _migrate_json(self):
+        """Import the old JSON settings files once (the files are left in place as a backup)"""
+        for kind, filename in self.legacy_files.items():
+            if not os.path.exists(filename):
+                continue
+            with self._transaction() as conn:
+                if conn.execute('SELECT 1 FROM migrations WHERE name = ?', (filename,)).fetchone():
+                    continue
+                try:
+                    with open(filename, 'r') as f:
+                        data = json.load(f)
+                except (OSError, ValueError) as e:
+                    print(f'⚠️ Could not import {filename}, skipping it: {e}')
+                    continue
+                # Rows written since (by this or another process) win over the old file
+                conn.executemany(
+                    'INSERT OR IGNORE INTO settings (kind, guild_id, value) VALUES (?, ?, ?)',
+                    [(kind, str(guild_id), json.dumps(value)) for guild_id, value in data.items()]
+                )
+                conn.execute('INSERT INTO migrations (name, migrated_at) VALUES (?, ?)', (filename, time.time()))
+                print(f'📦 Imported {len(data)} entries from {filename} into {self.path}')
+    
+    @contextlib.contextmanager
+    def _transaction(self):
+        """Write transaction; BEGIN IMMEDIATE takes the write lock up front so other processes wait their turn"""
+        conn = self.conn
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
+        conn.execute('COMMIT')
+    
+    def _sync(self):
+        """Reload everything if another process changed the database since the last load (startup, writer thread)"""
+        try:
+            # data_version only changes for commits made through other connections
+            version = self.conn.execute('PRAGMA data_version').fetchone()[0]
+            if version == self.data_version:
+                return
+            cache = {}
+            for kind, guild_id, value in self.conn.execute('SELECT kind, guild_id, value FROM settings'):
+                cache.setdefault(kind, {})[guild_id] = json.loads(value)
+        except (sqlite3.Error, ValueError) as e:
+            print(f'⚠️ Could not reload settings from {self.path}: {e}')
+            return
+        with self.lock:
+            # Writes still queued for the writer thread aren't in the database yet
+            for (kind, guild_key), (_, value) in self.pending.items():
+                if value is self.DELETED:
+                    cache.get(kind, {}).pop(guild_key, None)
+                else:
+                    cache.setdefault(kind, {})[guild_key] = value
+            self.cache = cache
+        self.data_version = version
+    
+    def _fresh(self):
+        """The memory copy; every STORE_SYNC_INTERVAL seconds a reload check is queued on the writer thread"""
+        now = time.time()
+        if now - self.synced_at >= STORE_SYNC_INTERVAL:
+            self.synced_at = now
+            self.writer.submit(self._sync)
+        return self.cache
+    
+    def get(self, kind, guild_id, default=None):
+        return self._fresh().get(kind, {}).get(str(guild_id), default)
+    
+    def all(self, kind):
+        """Copy of every guild's value for a kind"""
+        cache = self._fresh()
+        with self.lock:
+            return dict(cache.get(kind, {}))
+    
+    def set(self, kind, guild_id, value):
+        return self._submit(kind, {str(guild_id): value})
+    
+    def set_many(self, kind, values):
+        """Set several guilds' values in one transaction"""
+        return self._submit(kind, {str(guild_id): value for guild_id, value in values.items()})
+    
+    def delete(self, kind, guild_id):
+        return self._submit(kind, {str(guild_id): self.DELETED})
+    
+    def _submit(self, kind, changes):
+        """Apply changes (guild id -> value or DELETED) to the memory copy and queue their transaction"""
+        self._fresh()
+        seq = next(self.write_seq)
+        with self.lock:
+            values = self.cache.setdefault(kind, {})
+            for guild_key, value in changes.items():
+                self.pending[(kind, guild_key)] = (seq, value)
+                if value is self.DELETED:
+                    values.pop(guild_key, None)
+                else:
+                    values[guild_key] = value
+        future = self.writer.submit(self._write, kind, changes)
+        future.add_done_callback(functools.partial(self._written, kind, list(changes), seq))
+        return future
+    
+    def _write(self, kind, changes):
+        """Writer thread: commit one batch of changes (SQLite waits up to 10s for another process' lock)"""
+        with self._transaction() as conn:
+            for guild_key, value in changes.items():
+                if value is self.DELETED:
+                    conn.execute('DELETE FROM settings WHERE kind = ? AND guild_id = ?', (kind, guild_key))
+                else:
+                    conn.execute('INSERT OR REPLACE INTO settings (kind, guild_id, value) VALUES (?, ?, ?)',
+                                 (kind, guild_key, json.dumps(value)))
+    
+    def _written(self, kind, guild_keys, seq, future):
+        """Writer thread: the batch is committed (or failed, which is logged here)"""
+        with self.lock:
+            for guild_key in guild_keys:
+                # A newer write of the same setting stays pending
+                if self.pending.get((kind, guild_key), (None,))[0] == seq:
+                    del self.pending[(kind, guild_key)]
+        if future.exception() is not None:
+            print(f'❌ Could not save {kind} settings to {self.path}: {future.exception()}')
+    
+    def flush(self):
+        """Wait for every queued write (tests, shutdown)"""
+        self.writer.submit(lambda: None).result()
 
-def save_credentials(credentials):
-    """Save server credentials to JSON file"""
-    with open(CREDENTIALS_FILE, 'w') as f:
-        json.dump(credentials, f, indent=2)
+settings_store = SettingsStore(legacy_files={
+    'credentials': CREDENTIALS_FILE,
+    'auto_start': AUTO_START_FILE,
+    'polling': POLLING_FILE,
+    'session': SESSION_CACHE_FILE
+})
 
 def get_server_credentials(guild_id):
     """Get credentials for a specific server"""
-    credentials = load_credentials()
-    return credentials.get(str(guild_id), {})
+    return settings_store.get('credentials', guild_id, {})
 
 def set_server_credentials(guild_id, username, password):
     """Set credentials for a specific server"""
-    credentials = load_credentials()
-    credentials[str(guild_id)] = {
+    settings_store.set('credentials', guild_id, {
         'username': username,
         'password': password
-    }
-    save_credentials(credentials)
-
-def load_auto_start_settings():
-    """Load auto-start settings from JSON file"""
-    if os.path.exists(AUTO_START_FILE):
-        with open(AUTO_START_FILE, 'r') as f:
-            return json.load(f)
-    return {}
-
-def save_auto_start_settings(settings):
-    """Save auto-start settings to JSON file"""
-    with open(AUTO_START_FILE, 'w') as f:
-        json.dump(settings, f, indent=2)
+    })
 
 def get_auto_start_enabled(guild_id):
     """Check if auto-start is enabled for a server"""
-    settings = load_auto_start_settings()
-    return settings.get(str(guild_id), False)
+    return settings_store.get('auto_start', guild_id, False)
 
 def set_auto_start_enabled(guild_id, enabled):
     """Enable or disable auto-start for a server"""
-    settings = load_auto_start_settings()
-    settings[str(guild_id)] = enabled
-    save_auto_start_settings(settings)
+    settings_store.set('auto_start', guild_id, enabled)
+
+def get_polling_preset(guild_id):
+    """Get the polling preset of a server"""
+    return settings_store.get('polling', guild_id, DEFAULT_POLLING_PRESET)
+
+def set_polling_preset(guild_id, preset):
+    """Set the polling preset of a server"""
+    settings_store.set('polling', guild_id, preset)
+
+def password_fingerprint(password):
+    """Short hash so a password change invalidates saved sessions without storing the password"""
+    return hashlib.sha256(password.encode('utf-8')).hexdigest()[:16]
+
+def get_cached_session(guild_id, username, password):
+    """Get a saved, unexpired session for a server if it belongs to these credentials"""
+    entry = settings_store.get('session', guild_id)
+    if not entry:
+        return None
+    if account_key(entry.get('username', '')) != account_key(username):
+        return None
+    if entry.get('password_fingerprint') != password_fingerprint(password):
+        return None
+    if entry.get('expires_at', 0) < time.time():
+        return None
+    return entry
+
+def save_account_sessions(account):
+    """Save the account's session for every guild attached to it"""
+    atconn = account.client.atconn
+    session_cookie = atconn.atcookie or atconn.session.cookies.get('ATERNOS_SESSION', '')
+    if not session_cookie:
+        return
+    cookies = [
+        {'name': c.name, 'value': c.value, 'domain': c.domain, 'path': c.path}
+        for c in atconn.session.cookies
+        if c.name != 'ATERNOS_SESSION'
+    ]
+    now = time.time()
+    entry = {
+        'username': account.username,
+        'password_fingerprint': password_fingerprint(account.password),
+        'session': session_cookie,
+        'cookies': cookies,
+        'token': atconn.token,
+        'sec': atconn.sec,
+        'server_id': account.server.servid,
+        'saved_at': now,
+        'expires_at': now + SESSION_CACHE_TTL
+    }
+    # Queued for the settings writer thread, which logs a failed write
+    settings_store.set_many('session', {guild_key: entry for guild_key in account.guilds})
+
+def drop_cached_session(guild_id):
+    """Forget the saved session of a server"""
+    if settings_store.get('session', guild_id) is not None:
+        settings_store.delete('session', guild_id)
+
+# Blocking python-aternos/cloudscraper calls run in this pool, never on the event loop
+ATERNOS_IO_WORKERS = int(os.getenv('ATERNOS_IO_WORKERS', 16))
+# Timeout (seconds) for a single blocking Aternos call
+ATERNOS_CALL_TIMEOUT = float(os.getenv('ATERNOS_CALL_TIMEOUT', 45))
+# Login has to solve Cloudflare (scraper delay=15), so it gets a longer timeout
+ATERNOS_LOGIN_TIMEOUT = float(os.getenv('ATERNOS_LOGIN_TIMEOUT', 120))
+# Timeout passed to raw session.get/post calls
+ATERNOS_HTTP_TIMEOUT = float(os.getenv('ATERNOS_HTTP_TIMEOUT', 20))
+
+# Shared throttle for every outbound Aternos request (all guilds and accounts together)
+ATERNOS_RATE = float(os.getenv('ATERNOS_RATE', 3))  # requests per second
+ATERNOS_BURST = int(os.getenv('ATERNOS_BURST', 6))
+# Pause for status/background requests after Aternos answers 503 (doubles while 503s continue)
+ATERNOS_503_BACKOFF = float(os.getenv('ATERNOS_503_BACKOFF', 5))
+ATERNOS_503_BACKOFF_MAX = float(os.getenv('ATERNOS_503_BACKOFF_MAX', 60))
+
+# Lower value = served first
+PRIORITY_CONFIRM = 0
+PRIORITY_ACTION = 1  # start, stop, extend, login
+PRIORITY_STATUS = 2  # commands and buttons reading the status
+PRIORITY_BACKGROUND = 3  # monitor polls
+PRIORITY_NAMES = {
+    PRIORITY_CONFIRM: 'confirm',
+    PRIORITY_ACTION: 'action',
+    PRIORITY_STATUS: 'status',
+    PRIORITY_BACKGROUND: 'background',
+}
+
+class SharedPriority:
+    """Priority of a call shared by several callers; the most urgent caller decides, even while it waits"""
+    def __init__(self, value):
+        self.value = value
+        self.waiter = None  # (limiter, future) while the call waits for a token
+    
+    def raise_to(self, priority):
+        if priority >= self.value:
+            return
+        self.value = priority
+        if self.waiter is not None and not self.waiter[1].done():
+            self.waiter[0].requeue(self.waiter[1], priority)
+
+class RateLimiter:
+    """Token bucket with priority classes; waiting requests are served lowest priority value first"""
+    def __init__(self, rate=ATERNOS_RATE, burst=ATERNOS_BURST):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = float(burst)
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+        self.backoff = 0.0
+        self.waiters = []  # heap of (priority, seq, future)
+        self.seq = itertools.count()
+        self.wakeup = None
+        self.dispatcher = None
+        self.stats = {priority: {'granted': 0, 'waited': 0, 'total_wait': 0.0, 'max_wait': 0.0} for priority in PRIORITY_NAMES}
+        self.throttled = 0  # 503 answers seen
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def _delay(self, priority):
+        """Seconds until a request of this priority may go out"""
+        self._refill()
+        delay = 0.0 if self.tokens >= 1 else (1 - self.tokens) / self.rate
+        # Confirm/action requests are not held back by the 503 pause, only by the bucket
+        if priority >= PRIORITY_STATUS:
+            delay = max(delay, self.paused_until - time.monotonic())
+        return delay
+    
+    async def acquire(self, priority=PRIORITY_STATUS):
+        """Wait for a token (priority may be a SharedPriority that gets raised while waiting)"""
+        shared = priority if isinstance(priority, SharedPriority) else None
+        if shared is not None:
+            priority = shared.value
+        start = time.monotonic()
+        if not self.waiters and self._delay(priority) <= 0:
+            self.tokens -= 1
+            self._record(priority, 0.0)
+            return
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self.waiters, (priority, next(self.seq), future))
+        self._kick()
+        if shared is not None:
+            shared.waiter = (self, future)
+        try:
+            await future  # A cancelled waiter is skipped by the dispatcher
+        finally:
+            if shared is not None:
+                shared.waiter = None
+        self._record(shared.value if shared is not None else priority, time.monotonic() - start)
+    
+    def requeue(self, future, priority):
+        """Move a waiting request up to a more urgent priority (its old heap entry is skipped once served)"""
+        heapq.heappush(self.waiters, (priority, next(self.seq), future))
+        self._kick()
+    
+    def _kick(self):
+        if self.wakeup is None:
+            self.wakeup = asyncio.Event()
+        self.wakeup.set()
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.ensure_future(self._dispatch())
+    
+    async def _dispatch(self):
+        while self.waiters:
+            priority, _, future = self.waiters[0]
+            if future.done():
+                heapq.heappop(self.waiters)
+                continue
+            delay = self._delay(priority)
+            if delay > 0:
+                # Sleep until the next token, or until a more urgent request arrives
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            heapq.heappop(self.waiters)
+            self.tokens -= 1
+            future.set_result(None)
+    
+    def _record(self, priority, waited):
+        stats = self.stats[priority]
+        stats['granted'] += 1
+        if waited > 0:
+            stats['waited'] += 1
+            stats['total_wait'] += waited
+            stats['max_wait'] = max(stats['max_wait'], waited)
+    
+    def report_503(self):
+        """Aternos is overloaded: pause status/background traffic, longer while it keeps happening"""
+        self.throttled += 1
+        self.backoff = min(ATERNOS_503_BACKOFF_MAX, self.backoff * 2 if self.backoff else ATERNOS_503_BACKOFF)
+        self.paused_until = max(self.paused_until, time.monotonic() + self.backoff)
+        print(f'⏸️ Aternos returned 503, pausing status polls for {self.backoff:g}s')
+    
+    def report_ok(self):
+        self.backoff = 0.0
+    
+    def queue_depth(self):
+        """Waiting requests per priority class"""
+        depth = {name: 0 for name in PRIORITY_NAMES.values()}
+        # A requeued request has several entries; it counts once, at its most urgent priority
+        waiting = {}
+        for priority, _, future in list(self.waiters):
+            if not future.done():
+                waiting[future] = min(priority, waiting.get(future, priority))
+        for priority in waiting.values():
+            depth[PRIORITY_NAMES[priority]] += 1
+        return depth
+    
+    def describe(self):
+        """Plain-text stats for !debug and the health endpoint"""
+        lines = [f'Aternos rate limit: {self.rate:g}/s (burst {self.burst}), 503s seen: {self.throttled}']
+        paused = self.paused_until - time.monotonic()
+        if paused > 0:
+            lines.append(f'Status polls paused for {paused:.1f}s after 503')
+        depth = self.queue_depth()
+        for priority, name in PRIORITY_NAMES.items():
+            stats = self.stats[priority]
+            avg_wait = stats['total_wait'] / stats['waited'] if stats['waited'] else 0.0
+            lines.append(f"{name}: queued {depth[name]}, sent {stats['granted']}, "
+                         f"waited {stats['waited']} (avg {avg_wait:.2f}s, max {stats['max_wait']:.2f}s)")
+        return '\n'.join(lines)
+
+aternos_limiter = RateLimiter()
+
+def is_503(value):
+    """True for a 503 response or an exception caused by one"""
+    if getattr(value, 'status_code', None) == 503:
+        return True
+    if isinstance(value, BaseException):
+        error_str = str(value)
+        return '503' in error_str or 'Service Unavailable' in error_str
+    return False
+
+aternos_executor = ThreadPoolExecutor(max_workers=ATERNOS_IO_WORKERS, thread_name_prefix='aternos-io')
+
+# One lock per Aternos connection so calls on the same account never overlap
+account_locks = weakref.WeakKeyDictionary()
+
+def get_account_lock(atconn):
+    """Get the lock that serializes calls on one Aternos connection"""
+    lock = account_locks.get(atconn)
+    if lock is None:
+        lock = asyncio.Lock()
+        account_locks[atconn] = lock
+    return lock
+
+def _release_when_done(future, lock):
+    """Release the account lock once the worker thread has really finished"""
+    def done(fut):
+        if not fut.cancelled():
+            fut.exception()  # Mark exception as retrieved
+        lock.release()
+    future.add_done_callback(done)
+
+async def run_aternos_call(atconn, func, *args, timeout=ATERNOS_CALL_TIMEOUT, priority=PRIORITY_STATUS, **kwargs):
+    """Run a blocking Aternos call in the I/O pool, rate limited, serialized per account, with a timeout"""
+    name = getattr(func, '__name__', 'call')
+    try:
+        await asyncio.wait_for(aternos_limiter.acquire(priority), timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f'Aternos {name}() waited more than {timeout:g}s for the rate limiter') from None
+    
+    lock = get_account_lock(atconn)
+    try:
+        await asyncio.wait_for(lock.acquire(), timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f'Aternos {name}() waited more than {timeout:g}s for the account to be free') from None
+    
+    loop = asyncio.get_running_loop()
+    try:
+        future = loop.run_in_executor(aternos_executor, functools.partial(func, *args, **kwargs))
+    except BaseException:
+        lock.release()
+        raise
+    
+    try:
+        result = await asyncio.wait_for(asyncio.shield(future), timeout)
+    except asyncio.TimeoutError:
+        raise TimeoutError(f'Aternos {name}() timed out after {timeout:g}s') from None
+    except Exception as e:
+        if is_503(e):
+            aternos_limiter.report_503()
+        raise
+    finally:
+        # On timeout/cancel the thread keeps running, so keep the account locked until it ends
+        _release_when_done(future, lock)
+    
+    if is_503(result):
+        aternos_limiter.report_503()
+    else:
+        aternos_limiter.report_ok()
+    return result
+
+def _server_conn(aternos_server):
+    """Connection object used as the serialization key for a server"""
+    return getattr(aternos_server, 'atconn', aternos_server)
+
+# lastStatus JSON embedded in the server panel page (same pattern python-aternos uses)
+LAST_STATUS_RE = re.compile(r'<script>\s*var lastStatus\s*?=\s*?(\{.+?\});?\s*<\/script>')
+
+def fetch_server_page(aternos_server):
+    """Same request as AternosServer.fetch(), but also keeps the panel HTML for the snapshot cache"""
+    if not hasattr(aternos_server, 'atserver_request'):
+        aternos_server.fetch()
+        return None
+    page = aternos_server.atserver_request('https://aternos.org/server', 'GET')
+    html_content = page.text
+    match = LAST_STATUS_RE.search(html_content)
+    if match is None:
+        raise Exception('Unable to parse lastStatus object')
+    aternos_server._info = json.loads(match[1])
+    return html_content
+
+# Status reads from commands and buttons accept a result this many seconds old
+STATUS_MAX_AGE = float(os.getenv('STATUS_MAX_AGE', 2))
+# !status answers from the last status (usually a monitor's) while it is younger than this
+STATUS_COMMAND_MAX_AGE = float(os.getenv('STATUS_COMMAND_MAX_AGE', 15))
+
+class SingleFlight:
+    """Concurrent calls with the same key share one in-flight call and its result"""
+    def __init__(self):
+        self.inflight = {}  # key -> asyncio.Task
+        self.priorities = {}  # key -> SharedPriority of the in-flight call
+        self.results = {}  # key -> (finished_at, result)
+    
+    def result_age(self, key):
+        """Seconds since the last successful call for key finished (inf if never)"""
+        cached = self.results.get(key)
+        return time.time() - cached[0] if cached else float('inf')
+    
+    def remember(self, key, result):
+        """Record a result obtained elsewhere as fresh"""
+        self.results[key] = (time.time(), result)
+    
+    def forget(self, key):
+        self.results.pop(key, None)
+    
+    async def run(self, key, func, max_age=0.0, priority=PRIORITY_STATUS):
+        """Return a result at most max_age seconds old, joining an in-flight call instead of starting another
+
+        func gets a SharedPriority; a caller joining with a more urgent priority raises it for everyone.
+        """
+        cached = self.results.get(key)
+        if cached is not None and time.time() - cached[0] <= max_age:
+            return cached[1]
+        task = self.inflight.get(key)
+        if task is None:
+            shared = SharedPriority(priority)
+            task = asyncio.ensure_future(func(shared))
+            self.inflight[key] = task
+            self.priorities[key] = shared
+            task.add_done_callback(functools.partial(self._finish, key))
+        else:
+            self.priorities[key].raise_to(priority)
+        # One caller being cancelled must not cancel the call for everyone else
+        return await asyncio.shield(task)
+    
+    def _finish(self, key, task):
+        if self.inflight.get(key) is task:
+            del self.inflight[key]
+            del self.priorities[key]
+        if task.cancelled() or task.exception() is not None:
+            return
+        self.results[key] = (time.time(), task.result())
+
+# Status fetches, keyed by server id
+status_flight = SingleFlight()
+
+def server_key(aternos_server):
+    """Key for per-server caches (panel snapshots, status fetches)"""
+    return getattr(aternos_server, 'servid', id(aternos_server))
+
+async def _fetch_server_status(aternos_server, priority):
+    html_content = await run_aternos_call(_server_conn(aternos_server), fetch_server_page, aternos_server, priority=priority)
+    if html_content is not None:
+        store_panel_snapshot(aternos_server, 'https://aternos.org/server', html_content)
+    queue_drain_model.observe_server(aternos_server)
+    return aternos_server
+
+async def aternos_fetch(aternos_server, max_age=0.0, priority=PRIORITY_STATUS):
+    """Non-blocking aternos_server.fetch(), coalesced with concurrent fetches of the same server"""
+    # max_age: how old (seconds) a previous result may be; 0 only joins a fetch already in flight.
+    # The downloaded panel page becomes the server's panel snapshot.
+    fetched = await status_flight.run(
+        server_key(aternos_server), functools.partial(_fetch_server_status, aternos_server), max_age, priority
+    )
+    if fetched is not aternos_server and hasattr(fetched, '_info'):
+        # Same server fetched through another account's object
+        aternos_server._info = fetched._info
+
+async def aternos_start(aternos_server):
+    """Non-blocking aternos_server.start()"""
+    return await run_aternos_call(_server_conn(aternos_server), aternos_server.start, priority=PRIORITY_ACTION)
+
+async def aternos_stop(aternos_server):
+    """Non-blocking aternos_server.stop()"""
+    return await run_aternos_call(_server_conn(aternos_server), aternos_server.stop, priority=PRIORITY_ACTION)
+
+async def aternos_confirm(aternos_server):
+    """Non-blocking aternos_server.confirm()"""
+    return await run_aternos_call(_server_conn(aternos_server), aternos_server.confirm, priority=PRIORITY_CONFIRM)
+
+async def aternos_request(atconn, url, method, priority=PRIORITY_STATUS, **kwargs):
+    """Non-blocking atconn.request_cloudflare()"""
+    return await run_aternos_call(atconn, atconn.request_cloudflare, url, method, priority=priority, **kwargs)
+
+async def aternos_session_get(atconn, url, priority=PRIORITY_STATUS, **kwargs):
+    """Non-blocking GET on the connection's current session"""
+    kwargs.setdefault('timeout', ATERNOS_HTTP_TIMEOUT)
+    # Resolve atconn.session inside the worker: request_cloudflare() replaces it on every call
+    def session_get():
+        return atconn.session.get(url, **kwargs)
+    return await run_aternos_call(atconn, session_get, priority=priority)
+
+async def aternos_session_post(atconn, url, priority=PRIORITY_STATUS, **kwargs):
+    """Non-blocking POST on the connection's current session"""
+    kwargs.setdefault('timeout', ATERNOS_HTTP_TIMEOUT)
+    def session_post():
+        return atconn.session.post(url, **kwargs)
+    return await run_aternos_call(atconn, session_post, priority=priority)
+
+# Minimum seconds between two status polls of the same Aternos account
+ACCOUNT_POLL_INTERVAL = float(os.getenv('ACCOUNT_POLL_INTERVAL', 1))
+# Seconds during which a start sent by one guild is not repeated by another guild on the same account
+ACCOUNT_START_COOLDOWN = float(os.getenv('ACCOUNT_START_COOLDOWN', 30))
+
+class AccountSession:
+    """One logged-in Aternos account, shared by every guild that uses the same login"""
+    def __init__(self, username, password):
+        self.key = account_key(username)
+        self.username = username
+        self.password = password
+        self.client = None
+        self.server = None
+        self.guilds = set()
+        self.logged_in_at = 0.0
+        self.last_start_at = 0.0
+        self.login_lock = asyncio.Lock()
+    
+    @property
+    def refcount(self):
+        return len(self.guilds)
+    
+    def publish(self):
+        """Point every attached guild at this account's client and server"""
+        for guild_key in self.guilds:
+            server_clients[guild_key] = self.client
+            server_servers[guild_key] = self.server
+    
+    def poll_interval(self):
+        """Seconds between status polls this account needs: the shortest next check of its monitored guilds"""
+        polling = [guild_key for guild_key in self.guilds if guild_key in auto_start_tasks or guild_key in queue_monitoring_tasks]
+        if self.server is None or not polling:
+            return ACCOUNT_POLL_INTERVAL
+        status = snapshot_of(self.server).status
+        position = queue_position_of(self.server)
+        interval = min(PollingPolicy(guild_key).next_delay(status, position, server_key(self.server)) for guild_key in polling)
+        # Less the scheduler's jitter: a guild's own last poll is never young enough to be reused for its next one
+        return max(ACCOUNT_POLL_INTERVAL, interval * (1 - SCHEDULER_JITTER))
+    
+    async def refresh(self, max_age=None, priority=PRIORITY_BACKGROUND):
+        """Fetch the server status once for every guild bound to this account
+
+        By default a status younger than the account's poll interval is reused, so monitors of several guilds,
+        each on its own schedule, share one poll per interval.
+        """
+        if self.server is None:
+            return None
+        if max_age is None:
+            max_age = self.poll_interval()
+        await aternos_fetch(self.server, max_age, priority)
+        return self.server
+
+# Aternos accounts keyed by lowercase username, and which account each guild is bound to
+account_sessions = {}
+guild_accounts = {}
+
+def account_key(username):
+    """Registry key for an Aternos username"""
+    return username.strip().lower()
+
+def get_guild_account(guild_id):
+    """Get the shared account session a guild is bound to (or None)"""
+    key = guild_accounts.get(str(guild_id))
+    return account_sessions.get(key) if key else None
+
+def attach_guild_account(guild_id, account):
+    """Bind a guild to an account session (takes a reference)"""
+    guild_key = str(guild_id)
+    account.guilds.add(guild_key)
+    guild_accounts[guild_key] = account.key
+    account.publish()
+
+def release_guild_account(guild_id):
+    """Drop a guild's reference to its account; the session is freed with the last guild"""
+    guild_key = str(guild_id)
+    key = guild_accounts.pop(guild_key, None)
+    server_clients.pop(guild_key, None)
+    server_servers.pop(guild_key, None)
+    account = account_sessions.get(key) if key else None
+    if account is None:
+        return
+    account.guilds.discard(guild_key)
+    if account.refcount == 0:
+        del account_sessions[account.key]
+        if account.server is not None:
+            stop_status_stream(account.server)
+        print(f'🔌 Released Aternos session for {account.username} (no guilds left)')
+
+async def refresh_guild_server(guild_id, aternos_server, max_age=None, priority=PRIORITY_BACKGROUND):
+    """Refresh a guild's server status, sharing one poll between guilds on the same account
 
-async def connect_to_aternos(guild_id):
-    """Connect to Aternos for a specific server"""
+    max_age defaults to the account's poll interval (see AccountSession.poll_interval).
+    """
+    account = get_guild_account(guild_id)
+    if account is None or account.server is not aternos_server:
+        account = None
+    if max_age is None:
+        max_age = account.poll_interval() if account is not None else ACCOUNT_POLL_INTERVAL
+    # With a live status stream, pushed statuses replace most polls
+    if ensure_status_stream(aternos_server) is not None and live_status_stream(aternos_server) is not None:
+        max_age = max(max_age, STREAM_MAX_AGE)
+    if account is not None:
+        await account.refresh(max_age, priority)
+    else:
+        await aternos_fetch(aternos_server, max_age, priority)
+    return aternos_server
+
+def claim_account_start(guild_id):
+    """Return False if another guild on the same account just sent a start command"""
+    account = get_guild_account(guild_id)
+    if account is None:
+        return True
+    now = time.time()
+    if now - account.last_start_at < ACCOUNT_START_COOLDOWN:
+        return False
+    account.last_start_at = now
+    return True
+
+# Optional push mode: listen to the server's status over the Aternos websocket instead of polling
+ATERNOS_STREAMING = os.getenv('ATERNOS_STREAMING', 'false').lower() in ('1', 'true', 'yes', 'on')
+# While the stream is up, a pushed status counts as fresh for this long (a safety fetch runs after that)
+STREAM_MAX_AGE = float(os.getenv('STREAM_MAX_AGE', 60))
+STREAM_RECONNECT_MIN = float(os.getenv('STREAM_RECONNECT_MIN', 2))
+STREAM_RECONNECT_MAX = float(os.getenv('STREAM_RECONNECT_MAX', 120))
+
+def open_status_socket(aternos_server):
+    """Create the server's AternosWss (blocking part, runs in the I/O pool)"""
+    atconn = aternos_server.atconn
+    # request_cloudflare() moves the session cookie out of the jar; AternosWss reads it from there
+    if getattr(atconn, 'atcookie', '') and 'ATERNOS_SESSION' not in atconn.session.cookies:
+        atconn.session.cookies.set('ATERNOS_SESSION', atconn.atcookie)
+    return aternos_server.wss()
+
+class StatusStream:
+    """Keeps a websocket open for one server and applies pushed status messages to it"""
+    def __init__(self, aternos_server):
+        self.server = aternos_server
+        self.key = server_key(aternos_server)
+        self.wss = None
+        self.connected = False
+        self.last_push_at = 0.0
+        self.pushes = 0
+        self.task = asyncio.ensure_future(self.run())
+    
+    @property
+    def live(self):
+        return self.connected and self.wss is not None and not self.wss.msgs.done()
+    
+    async def on_status(self, msg):
+        """Status push: same payload as the panel's lastStatus"""
+        self.server._info = msg
+        status_flight.remember(self.key, self.server)
+        queue_drain_model.observe_server(self.server)
+        self.last_push_at = time.time()
+        self.pushes += 1
+        # Run the monitors watching this server now instead of at their next deadline
+        monitor_scheduler.wake(self.key)
+    
+    async def run(self):
+        from python_aternos.atwss import Streams
+        delay = STREAM_RECONNECT_MIN
+        while True:
+            try:
+                wss = await run_aternos_call(_server_conn(self.server), open_status_socket, self.server, priority=PRIORITY_BACKGROUND)
+                wss.wssreceiver(Streams.status)(self.on_status)
+                await wss.connect()
+                self.wss = wss
+                self.connected = True
+                delay = STREAM_RECONNECT_MIN
+                print(f'📡 Status stream connected for server {self.key}')
+                try:
+                    # The receiver task ends when the socket closes
+                    await wss.msgs
+                finally:
+                    self.connected = False
+                    await self.close_socket()
+                print(f'📡 Status stream closed for server {self.key}, polling until it reconnects')
+            except asyncio.CancelledError:
+                self.connected = False
+                await self.close_socket()
+                raise
+            except Exception as e:
+                self.connected = False
+                print(f'⚠️ Status stream error for server {self.key}: {type(e).__name__}: {e} (retrying in {delay:g}s)')
+            await asyncio.sleep(delay)
+            delay = min(STREAM_RECONNECT_MAX, delay * 2)
+    
+    async def close_socket(self):
+        wss, self.wss = self.wss, None
+        if wss is None:
+            return
+        try:
+            await wss.close()
+        except Exception:
+            pass
+    
+    def stop(self):
+        self.task.cancel()
+
+# Status streams keyed by server id
+status_streams = {}
+
+def ensure_status_stream(aternos_server):
+    """Start (or restart after a re-login) the status stream of a server; None if streaming is off"""
+    if not ATERNOS_STREAMING or not hasattr(aternos_server, 'wss'):
+        return None
+    key = server_key(aternos_server)
+    stream = status_streams.get(key)
+    if stream is not None and stream.server is aternos_server and not stream.task.done():
+        return stream
+    if stream is not None:
+        stream.stop()
+    stream = StatusStream(aternos_server)
+    status_streams[key] = stream
+    return stream
+
+def stop_status_stream(aternos_server):
+    stream = status_streams.pop(server_key(aternos_server), None)
+    if stream is not None:
+        stream.stop()
+
+def live_status_stream(aternos_server):
+    """The server's status stream if it is connected right now, else None"""
+    stream = status_streams.get(server_key(aternos_server))
+    if stream is not None and stream.server is aternos_server and stream.live:
+        return stream
+    return None
+
+async def connect_to_aternos(guild_id, force_login=False):
+    """Connect a server to Aternos, reusing the account session if another guild already logged in"""
     creds = get_server_credentials(guild_id)
     if not creds.get('username') or not creds.get('password'):
         print(f'No credentials found for guild {guild_id}')
         return False
     
+    guild_key = str(guild_id)
+    key = account_key(creds['username'])
+    
+    # Guild switched to another account: drop its reference to the old one
+    if guild_accounts.get(guild_key) not in (None, key):
+        release_guild_account(guild_id)
+    
+    account = account_sessions.get(key)
+    if account is None:
+        account = AccountSession(creds['username'], creds['password'])
+        account_sessions[key] = account
+    elif account.password != creds['password']:
+        # Password changed: the existing session must not be reused
+        account.password = creds['password']
+        force_login = True
+    
+    requested_at = time.time()
+    async with account.login_lock:
+        # Reuse the session unless a fresh login was requested and none happened while we waited
+        if account.server is not None and (not force_login or account.logged_in_at >= requested_at):
+            attach_guild_account(guild_id, account)
+            print(f'🔗 Guild {guild_id} attached to Aternos session of {account.username} ({account.refcount} guild(s))')
+            result = True
+        else:
+            result = False
+            cached = None if force_login else get_cached_session(guild_id, account.username, account.password)
+            if cached:
+                result = await restore_aternos_account(account, guild_id, cached)
+            if result is not True:
+                result = await login_aternos_account(account, guild_id)
+            if result is True:
+                attach_guild_account(guild_id, account)
+                save_account_sessions(account)
+    
+    if result is True:
+        # Start auto-start monitoring if enabled
+        if get_auto_start_enabled(guild_id):
+            if guild_key not in auto_start_tasks:
+                auto_start_tasks[guild_key] = monitor_scheduler.add(AutoStartJob(guild_id))
+                print(f'✅ Auto-start monitoring started for guild {guild_id}')
+    elif account.refcount == 0 and account.server is None:
+        # Nobody is using this account yet, forget it so the next attempt starts clean
+        account_sessions.pop(key, None)
+    
+    return result
+
+async def login_aternos_account(account, guild_id):
+    """Log an account session in to Aternos and select its first server"""
     try:
         print(f'Attempting to connect to Aternos for guild {guild_id}...')
-        print(f'Username: {creds["username"]}')
-        print(f'Password length: {len(creds["password"])} characters')
+        print(f'Username: {account.username}')
+        print(f'Password length: {len(account.password)} characters')
         
         # Create cloudscraper session first with more aggressive settings
         print('🔧 Creating cloudscraper session for Cloudflare bypass...')
@@ -234,7 +1309,7 @@ async def connect_to_aternos(guild_id):
         # Attempt login
         print('🔐 Attempting login with Cloudflare bypass...')
         try:
-            client.login(creds['username'], creds['password'])
+            await run_aternos_call(client.atconn, client.login, account.username, account.password, timeout=ATERNOS_LOGIN_TIMEOUT, priority=PRIORITY_ACTION)
         except Exception as login_error:
             error_str = str(login_error)
             error_type = type(login_error).__name__
@@ -262,22 +1337,17 @@ async def connect_to_aternos(guild_id):
         
         print(f'✅ Login successful for guild {guild_id}')
         
-        servers = client.account.list_servers()
+        servers = await run_aternos_call(client.atconn, client.account.list_servers, priority=PRIORITY_ACTION)
         print(f'Found {len(servers)} server(s) for guild {guild_id}')
         
         if servers:
             server = servers[0]
-            server.fetch()
-            server_clients[str(guild_id)] = client
-            server_servers[str(guild_id)] = server
-            
-            # Start auto-start monitoring if enabled
-            if get_auto_start_enabled(guild_id):
-                if str(guild_id) not in auto_start_tasks:
-                    task = asyncio.create_task(monitor_auto_start(guild_id))
-                    auto_start_tasks[str(guild_id)] = task
-                    print(f'✅ Auto-start monitoring started for guild {guild_id}')
-            
+            await aternos_fetch(server)
+            account.client = client
+            account.server = server
+            account.logged_in_at = time.time()
+            # Guilds already on this account switch to the new session too
+            account.publish()
             return True
         else:
             print(f'⚠️ No servers found for guild {guild_id}')
@@ -304,8 +1374,171 @@ async def connect_to_aternos(guild_id):
         traceback.print_exc()
         return error_msg  # Return error message instead of False
 
+async def restore_aternos_account(account, guild_id, cached):
+    """Restore a saved session and check it with one status fetch; False if Aternos rejects it"""
+    try:
+        print(f'♻️ Restoring saved Aternos session for guild {guild_id} ({account.username})...')
+        client = Client()
+        atconn = client.atconn
+        for cookie in cached.get('cookies', []):
+            atconn.session.cookies.set(cookie['name'], cookie['value'], domain=cookie.get('domain', ''), path=cookie.get('path', '/'))
+        atconn.session.cookies['ATERNOS_SESSION'] = cached['session']
+        atconn.atcookie = cached['session']
+        atconn.token = cached.get('token', '')
+        atconn.sec = cached.get('sec', '')
+        
+        client.account.refresh_servers([cached['server_id']])
+        server = client.account.servers[0]
+        
+        # Cheap validity probe: an expired session can't load the server page. It goes straight to this
+        # connection: through status_flight it could join another object's fetch or get a cached result
+        await _fetch_server_status(server, PRIORITY_STATUS)
+        status_flight.remember(server_key(server), server)
+        
+        account.client = client
+        account.server = server
+        account.logged_in_at = time.time()
+        account.publish()
+        print(f'✅ Restored saved session for guild {guild_id} (login skipped)')
+        return True
+    except Exception as e:
+        print(f'⚠️ Saved session for guild {guild_id} was rejected, falling back to full login: {type(e).__name__}: {e}')
+        drop_cached_session(guild_id)
+        return False
+
+# Lazy mode: at startup only guilds with auto-start log in, the rest on their first command
+LAZY_CONNECT = os.getenv('LAZY_CONNECT', 'false').lower() in ('1', 'true', 'yes', 'on')
+# In lazy mode, sessions of guilds without commands for this long are released (seconds)
+IDLE_RELEASE_SECONDS = float(os.getenv('IDLE_RELEASE_SECONDS', 30 * 60))
+IDLE_CHECK_INTERVAL = 60
+
+# Last command/button use per guild
+guild_activity = {}
+
+async def ensure_connected(guild_id):
+    """Get a guild's Aternos server, connecting first if it isn't connected yet (marks the guild active)"""
+    guild_key = str(guild_id)
+    guild_activity[guild_key] = time.time()
+    aternos_server = server_servers.get(guild_key)
+    if aternos_server is None:
+        creds = get_server_credentials(guild_id)
+        if creds.get('username') and creds.get('password'):
+            print(f'🔌 Connecting guild {guild_id} on first use...')
+            if await connect_to_aternos(guild_id) is True:
+                aternos_server = server_servers.get(guild_key)
+    return aternos_server
+
+def guild_is_busy(guild_key):
+    """Guilds with auto-start or a running queue monitor keep their session"""
+    return guild_key in queue_monitoring_tasks or guild_key in auto_start_tasks or get_auto_start_enabled(guild_key)
+
+def release_idle_guilds():
+    """Release the Aternos sessions of guilds that have been idle for IDLE_RELEASE_SECONDS"""
+    now = time.time()
+    for guild_key in list(guild_accounts):
+        if guild_is_busy(guild_key):
+            continue
+        # Sessions opened elsewhere (startup, !setup) get a full window from when they're first seen
+        if now - guild_activity.setdefault(guild_key, now) >= IDLE_RELEASE_SECONDS:
+            # The saved session stays in the session cache, so the next command reconnects without a login
+            release_guild_account(guild_key)
+            guild_activity.pop(guild_key, None)
+            print(f'💤 Released idle Aternos session of guild {guild_key}')
+
+# Guild connections made in parallel at startup, each after a random delay so logins don't all hit Cloudflare at once
+STARTUP_CONCURRENCY = int(os.getenv('STARTUP_CONCURRENCY', 4))
+STARTUP_JITTER = float(os.getenv('STARTUP_JITTER', 2))  # max seconds
+
+# Startup progress, shown on the health endpoint
+startup_progress = {
+    'running': False,
+    'total': 0,
+    'done': 0,
+    'connected': 0,
+    'failed': 0,
+    'skipped': 0,
+    'deferred': 0,
+    'started_at': None,
+    'finished_at': None,
+}
+
+def startup_priority(guild):
+    """Guilds with auto-start connect first, guilds without credentials last"""
+    creds = get_server_credentials(guild.id)
+    if not creds.get('username') or not creds.get('password'):
+        return 2
+    if get_auto_start_enabled(guild.id):
+        return 0
+    return 1
+
+async def connect_guild_on_startup(guild, slots):
+    """Connect one guild during startup (limited by slots) and start its auto-start monitor"""
+    # The random delay counts from now, while the guild waits for a slot, so a slot only sits idle for
+    # what is left of it (the first few logins) and the slots are still handed out in priority order
+    connect_after = time.time() + random.uniform(0, STARTUP_JITTER) if STARTUP_JITTER > 0 else 0
+    async with slots:
+        result = False
+        try:
+            creds = get_server_credentials(guild.id)
+            if not creds.get('username') or not creds.get('password'):
+                startup_progress['skipped'] += 1
+                return
+            if LAZY_CONNECT and startup_priority(guild) > 0:
+                # Connected on its first command instead
+                startup_progress['deferred'] += 1
+                return
+            if connect_after > time.time():
+                await asyncio.sleep(connect_after - time.time())
+            result = await connect_to_aternos(guild.id)
+            startup_progress['connected' if result is True else 'failed'] += 1
+        except Exception as e:
+            print(f'❌ Startup connection failed for {guild.name}: {e}')
+            startup_progress['failed'] += 1
+        finally:
+            startup_progress['done'] += 1
+        
+        # Start auto-start monitoring if enabled
+        if get_auto_start_enabled(guild.id):
+            if str(guild.id) not in auto_start_tasks:
+                auto_start_tasks[str(guild.id)] = monitor_scheduler.add(AutoStartJob(guild.id))
+                print(f'✅ Auto-start monitoring enabled for {guild.name}')
+
+async def connect_all_guilds(guilds):
+    """Connect every guild to Aternos, STARTUP_CONCURRENCY at a time, most urgent first"""
+    ordered = sorted(guilds, key=startup_priority)
+    startup_progress.update(
+        running=True, total=len(ordered), done=0, connected=0, failed=0, skipped=0, deferred=0,
+        started_at=time.time(), finished_at=None,
+    )
+    print(f'🚀 Connecting {len(ordered)} server(s), {STARTUP_CONCURRENCY} at a time...')
+    slots = asyncio.Semaphore(STARTUP_CONCURRENCY)
+    try:
+        # Semaphore waiters are served in order, so the sort order is the connect order
+        await asyncio.gather(*(connect_guild_on_startup(guild, slots) for guild in ordered))
+    finally:
+        startup_progress['running'] = False
+        startup_progress['finished_at'] = time.time()
+    took = startup_progress['finished_at'] - startup_progress['started_at']
+    print(f"✅ Startup finished in {took:.0f}s: {startup_progress['connected']} connected, "
+          f"{startup_progress['failed']} failed, {startup_progress['deferred']} deferred until first use, "
+          f"{startup_progress['skipped']} without credentials")
+
+def describe_startup():
+    """Plain-text startup progress for the health endpoint"""
+    progress = startup_progress
+    if progress['started_at'] is None:
+        return 'Startup: waiting for Discord'
+    if progress['running']:
+        state = f"running for {time.time() - progress['started_at']:.0f}s"
+    else:
+        state = f"finished in {progress['finished_at'] - progress['started_at']:.0f}s"
+    return (f"Startup: {progress['done']}/{progress['total']} servers ({state}), "
+            f"{progress['connected']} connected, {progress['failed']} failed, "
+            f"{progress['deferred']} deferred until first use, {progress['skipped']} without credentials")
+
 @bot.event
 async def on_ready():
+    global idle_release_job, status_feed_job, health_report_job, slash_commands_synced
     print(f'{bot.user} has logged in!')
     print(f'Bot is in {len(bot.guilds)} server(s)')
     
@@ -313,16 +1546,42 @@ async def on_ready():
     for guild in bot.guilds:
         print(f'  - {guild.name} (ID: {guild.id})')
     
-    # Connect to Aternos for all servers with credentials
-    for guild in bot.guilds:
-        await connect_to_aternos(guild.id)
-        
-        # Start auto-start monitoring if enabled
-        if get_auto_start_enabled(guild.id):
-            if str(guild.id) not in auto_start_tasks:
-                task = asyncio.create_task(monitor_auto_start(guild.id))
-                auto_start_tasks[str(guild.id)] = task
-                print(f'✅ Auto-start monitoring enabled for {guild.name}')
+    # Register /start, /stop, /status and /confirm (once per run; on_ready fires again after reconnects)
+    if not slash_commands_synced:
+        try:
+            synced = await bot.tree.sync()
+            slash_commands_synced = True
+            print(f'✅ Synced {len(synced)} slash command(s)')
+        except Exception as e:
+            print(f'⚠️ Could not sync slash commands: {e}')
+    
+    if health_report_job is None:
+        health_report_job = monitor_scheduler.add(HealthReportJob())
+    
+    # on_ready fires again after reconnects; don't run two startups at once
+    if startup_progress['running']:
+        print('⏭️ Startup connections already in progress')
+        return
+    
+    if LAZY_CONNECT and idle_release_job is None:
+        idle_release_job = monitor_scheduler.add(IdleReleaseJob(), IDLE_CHECK_INTERVAL)
+    if STATUS_API and status_feed_job is None:
+        status_feed_job = monitor_scheduler.add(StatusFeedJob())
+    
+    # Connect to Aternos for all servers with credentials (saved sessions skip the login)
+    await connect_all_guilds(bot.guilds)
+
+@bot.event
+async def on_guild_remove(guild):
+    """When bot leaves a server, stop its monitors and release its Aternos session"""
+    guild_key = str(guild.id)
+    for tasks in (auto_start_tasks, queue_monitoring_tasks):
+        task = tasks.pop(guild_key, None)
+        if task:
+            task.cancel()
+    release_guild_account(guild.id)
+    drop_cached_session(guild.id)
+    print(f'👋 Bot removed from server: {guild.name} (ID: {guild.id})')
 
 @bot.event
 async def on_guild_join(guild):
@@ -345,7 +1604,7 @@ async def on_guild_join(guild):
                         value='I\'m setting up the configuration channel now...',
                         inline=False
                     )
-                    await channel.send(embed=embed)
+                    await outbox_send(channel, embed=embed)
                     welcome_sent = True
                     print(f'  ✓ Sent welcome message to #{channel.name}')
                     break
@@ -358,7 +1617,7 @@ async def on_guild_join(guild):
             # Try to find a channel to send a message instead
             for channel in guild.text_channels:
                 if channel.permissions_for(guild.me).send_messages:
-                    await channel.send(
+                    await outbox_send(channel,
                         '⚠️ **Setup Required:**\n'
                         'I need "Manage Channels" permission to create the setup channel.\n'
                         'Please give me this permission and use `!create-setup-channel` in any channel, '
@@ -399,7 +1658,7 @@ async def on_guild_join(guild):
                     ),
                     inline=False
                 )
-                await setup_channel.send(embed=embed)
+                await outbox_send(setup_channel, embed=embed)
                 print(f'  ✓ Created setup channel: #{setup_channel.name}')
                 
                 # Send confirmation to first available channel
@@ -407,7 +1666,7 @@ async def on_guild_join(guild):
                     for channel in guild.text_channels:
                         if channel.permissions_for(guild.me).send_messages and channel.id != setup_channel.id:
                             try:
-                                await channel.send(f'✅ **Setup channel created!** Please go to {setup_channel.mention} to configure your Aternos credentials.')
+                                await outbox_send(channel, f'✅ **Setup channel created!** Please go to {setup_channel.mention} to configure your Aternos credentials.')
                                 break
                             except:
                                 continue
@@ -428,49 +1687,49 @@ async def on_guild_join(guild):
 async def set_username(ctx, *, username: str):
     """Set Aternos username (only in server-setup channel)"""
     if ctx.channel.name != 'server-setup':
-        await ctx.send('❌ This command can only be used in the `server-setup` channel.')
+        await outbox_send(ctx, '❌ This command can only be used in the `server-setup` channel.', priority=OUTBOX_URGENT)
         return
     
     set_server_credentials(ctx.guild.id, username, get_server_credentials(ctx.guild.id).get('password', ''))
-    await ctx.send(f'✅ Username set to: `{username}`\nNow use `!password YourPassword` to set your password.')
+    await outbox_send(ctx, f'✅ Username set to: `{username}`\nNow use `!password YourPassword` to set your password.')
 
 @bot.command(name='password')
 async def set_password(ctx, *, password: str):
     """Set Aternos password (only in server-setup channel)"""
     if ctx.channel.name != 'server-setup':
-        await ctx.send('❌ This command can only be used in the `server-setup` channel.')
+        await outbox_send(ctx, '❌ This command can only be used in the `server-setup` channel.', priority=OUTBOX_URGENT)
         return
     
     set_server_credentials(ctx.guild.id, get_server_credentials(ctx.guild.id).get('username', ''), password)
-    await ctx.send('✅ Password set!\nUse `!setup-test` to test your credentials.')
+    await outbox_send(ctx, '✅ Password set!\nUse `!setup-test` to test your credentials.')
 
 @bot.command(name='setup-test')
 async def test_setup(ctx):
     """Test Aternos credentials"""
     if ctx.channel.name != 'server-setup':
-        await ctx.send('❌ This command can only be used in the `server-setup` channel.')
+        await outbox_send(ctx, '❌ This command can only be used in the `server-setup` channel.', priority=OUTBOX_URGENT)
         return
     
     creds = get_server_credentials(ctx.guild.id)
     if not creds.get('username') or not creds.get('password'):
-        await ctx.send('❌ Please set both username and password first!')
+        await outbox_send(ctx, '❌ Please set both username and password first!', priority=OUTBOX_URGENT)
         return
     
-    test_msg = await ctx.send('🔄 Testing credentials...')
+    test_msg = await outbox_send(ctx, '🔄 Testing credentials...')
     
     result = await connect_to_aternos(ctx.guild.id)
     if result is True:
         server = server_servers.get(str(ctx.guild.id))
         if server:
             server_addr = getattr(server, 'address', 'Server')
-            await test_msg.edit(content=f'✅ **Credentials valid!**\nConnected to server: `{server_addr}`\n\nYou can now use `!start`, `!stop`, and `!status` in other channels.')
+            await outbox_edit(test_msg, content=f'✅ **Credentials valid!**\nConnected to server: `{server_addr}`\n\nYou can now use `!start`, `!stop`, and `!status` in other channels.')
         else:
-            await test_msg.edit(content='✅ Credentials valid but no servers found.')
+            await outbox_edit(test_msg, content='✅ Credentials valid but no servers found.')
     elif isinstance(result, str):
         # result is an error message
-        await test_msg.edit(content=f'❌ **Authentication failed:**\n```{result}```\n\n**Troubleshooting:**\n• Verify your username and password are correct\n• Try logging into https://aternos.org manually\n• Check if your account is locked or needs verification\n• Make sure there are no extra spaces in the password')
+        await outbox_edit(test_msg, content=f'❌ **Authentication failed:**\n```{result}```\n\n**Troubleshooting:**\n• Verify your username and password are correct\n• Try logging into https://aternos.org manually\n• Check if your account is locked or needs verification\n• Make sure there are no extra spaces in the password', priority=OUTBOX_URGENT)
     else:
-        await test_msg.edit(content='❌ Invalid credentials. Please check your username and password.\n\n**Make sure:**\n• Username and password are set correctly\n• No extra spaces before/after\n• Account is not locked')
+        await outbox_edit(test_msg, content='❌ Invalid credentials. Please check your username and password.\n\n**Make sure:**\n• Username and password are set correctly\n• No extra spaces before/after\n• Account is not locked', priority=OUTBOX_URGENT)
 
 @bot.command(name='create-setup-channel')
 @commands.has_permissions(manage_channels=True)
@@ -480,7 +1739,7 @@ async def create_setup_channel_cmd(ctx):
     setup_channel = discord.utils.get(ctx.guild.text_channels, name='server-setup')
     
     if setup_channel:
-        await ctx.send('✅ Setup channel already exists!')
+        await outbox_send(ctx, '✅ Setup channel already exists!')
         return
     
     try:
@@ -506,11 +1765,11 @@ async def create_setup_channel_cmd(ctx):
             ),
             inline=False
         )
-        await setup_channel.send(embed=embed)
+        await outbox_send(setup_channel, embed=embed)
         
-        await ctx.send(f'✅ Created setup channel: {setup_channel.mention}')
+        await outbox_send(ctx, f'✅ Created setup channel: {setup_channel.mention}')
     except Exception as e:
-        await ctx.send(f'❌ Error creating channel: {e}')
+        await outbox_send(ctx, f'❌ Error creating channel: {e}', priority=OUTBOX_URGENT)
 
 class ConfirmButton(View):
     """View with confirm and stop buttons for queue confirmation"""
@@ -535,9 +1794,9 @@ class ConfirmButton(View):
             return
         
         try:
-            aternos_server = server_servers.get(str(self.guild_id))
+            aternos_server = await ensure_connected(self.guild_id)
             if not aternos_server:
-                await interaction.followup.send('❌ Server not found!', ephemeral=True)
+                await outbox_followup(interaction, '❌ Server not found!', ephemeral=True, priority=OUTBOX_URGENT)
                 return
             
             # Try to confirm the start
@@ -551,35 +1810,21 @@ class ConfirmButton(View):
                 
                 # Refresh server status first
                 print("1. Refreshing server status...")
-                aternos_server.fetch()
-                current_status = aternos_server.status
+                await aternos_fetch(aternos_server, STATUS_MAX_AGE, PRIORITY_CONFIRM)
+                snapshot = snapshot_of(aternos_server)
+                current_status = snapshot.status
                 print(f"   Status after fetch: {current_status}")
                 
-                # Check _info for confirmation status
-                print("2. Checking _info for confirmation requirements...")
-                needs_confirm = False
-                if hasattr(aternos_server, '_info'):
-                    info_data = getattr(aternos_server, '_info')
-                    if isinstance(info_data, dict):
-                        print(f"   _info keys: {list(info_data.keys())}")
-                        if 'queue' in info_data:
-                            queue_info = info_data.get('queue', {})
-                            if isinstance(queue_info, dict):
-                                pending = queue_info.get('pending', '')
-                                position = queue_info.get('position', None)
-                                print(f"   Queue pending: '{pending}', position: {position}")
-                                if pending and str(pending).lower() == 'pending':
-                                    needs_confirm = True
-                                    print("   ✅ Confirmation needed (pending='pending')")
+                # Confirmation requirements from the status
+                print("2. Checking status for confirmation requirements...")
+                print(f"   Queue pending: '{snapshot.queue_pending}', position: {snapshot.queue_position}")
+                needs_confirm = snapshot.needs_confirm
+                if needs_confirm:
+                    print(f"   ✅ Confirmation needed ({snapshot.confirm_reason})")
                 
-                # Check css_class
                 print("3. Checking css_class...")
-                css_class = getattr(aternos_server, 'css_class', 'N/A')
+                css_class = snapshot.css_class
                 print(f"   css_class: '{css_class}'")
-                if css_class and 'pending' in str(css_class).lower():
-                    if 'queueing' not in str(css_class).lower():
-                        needs_confirm = True
-                        print("   ✅ Confirmation needed (css_class contains 'pending')")
                 
                 # Check if confirm method exists
                 print("4. Checking confirm() method...")
@@ -602,7 +1847,7 @@ class ConfirmButton(View):
                 
                 # Only confirm if we actually need to
                 if not needs_confirm and current_status == 'waiting':
-                    await interaction.followup.send(
+                    await outbox_followup(interaction,
                         '⚠️ **Server is still in queue.**\n'
                         'Confirmation is only needed when the queue finishes.\n'
                         f'Current status: `{current_status}`'
@@ -613,7 +1858,7 @@ class ConfirmButton(View):
                 print("7. Attempting to refresh connection...")
                 try:
                     # Re-fetch to get fresh token
-                    aternos_server.fetch()
+                    await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
                     print("   ✅ Server status refreshed")
                 except Exception as refresh_error:
                     print(f"   ⚠️ Could not refresh: {refresh_error}")
@@ -621,10 +1866,10 @@ class ConfirmButton(View):
                 # FORCE RE-AUTHENTICATION before confirming to get fresh token
                 print("8. Force re-authenticating with Aternos to get fresh token...")
                 try:
-                    if await connect_to_aternos(self.guild_id):
+                    if await connect_to_aternos(self.guild_id, force_login=True):
                         aternos_server = server_servers.get(str(self.guild_id))
                         if aternos_server:
-                            aternos_server.fetch()
+                            await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
                             print("   ✅ Re-authenticated and refreshed server")
                         else:
                             print("   ⚠️ Re-authenticated but server not found")
@@ -639,7 +1884,7 @@ class ConfirmButton(View):
                 
                 # Final status check right before confirming
                 print("8.6. Final status check before confirming...")
-                aternos_server.fetch()
+                await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
                 final_status = aternos_server.status
                 print(f"   Final status: {final_status}")
                 
@@ -649,127 +1894,7 @@ class ConfirmButton(View):
                 last_error = None
                 
                 try:
-                    # Get the connection
-                    if hasattr(aternos_server, 'atconn'):
-                        atconn = aternos_server.atconn
-                        server_id = aternos_server.servid
-                        
-                        # Method 1: Use request_cloudflare (most reliable for Aternos)
-                        if hasattr(atconn, 'request_cloudflare'):
-                            try:
-                                print("   Trying request_cloudflare method...")
-                                confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                
-                                # Debug: Check session cookies/headers if possible
-                                if hasattr(atconn, 'session'):
-                                    session = atconn.session
-                                    print("   Session available, checking cookies...")
-                                    try:
-                                        if hasattr(session, 'cookies'):
-                                            cookies = dict(session.cookies)
-                                            print(f"   Session cookies keys: {list(cookies.keys())[:5]}...")  # First 5 keys
-                                    except:
-                                        pass
-                                
-                                # Try GET first (website might use GET)
-                                try:
-                                    print("   Attempting GET request...")
-                                    response = atconn.request_cloudflare(confirm_url, 'GET')
-                                    print(f"   ✅ GET response received: {response}")
-                                    print(f"   Response type: {type(response)}")
-                                    
-                                    # Any response means the request was accepted
-                                    if response is not None:
-                                        confirm_success = True
-                                        print("   ✅✅✅ CONFIRMATION SUCCESSFUL via GET!")
-                                    else:
-                                        raise Exception("Got None response")
-                                        
-                                except Exception as get_error:
-                                    error_str = str(get_error)
-                                    print(f"   ⚠️ GET failed: {error_str}")
-                                    
-                                    # If it's a 400, the request format might be wrong - try POST
-                                    # But also check if server actually needs confirmation
-                                    if '400' in error_str or 'Bad Request' in error_str:
-                                        print("   Got 400 error - server might not be ready for confirmation")
-                                        print("   Will try POST as alternative...")
-                                    
-                                    # Try POST as alternative
-                                    try:
-                                        print("   Attempting POST request...")
-                                        response = atconn.request_cloudflare(confirm_url, 'POST')
-                                        print(f"   ✅ POST response received: {response}")
-                                        
-                                        if response is not None:
-                                            confirm_success = True
-                                            print("   ✅✅✅ CONFIRMATION SUCCESSFUL via POST!")
-                                        else:
-                                            raise Exception("Got None response from POST")
-                                    except Exception as post_error:
-                                        post_error_str = str(post_error)
-                                        print(f"   ⚠️ POST also failed: {post_error_str}")
-                                        
-                                        # If both fail with 400, the server might not be ready
-                                        if '400' in post_error_str or 'Bad Request' in post_error_str:
-                                            raise Exception(f"Server returned 400 Bad Request. This usually means:\n"
-                                                          f"1. Server doesn't need confirmation right now\n"
-                                                          f"2. Token/SEC expired (try restarting bot)\n"
-                                                          f"3. Server status changed\n"
-                                                          f"Error: {post_error_str}")
-                                        raise post_error
-                                        
-                            except Exception as cf_error:
-                                error_str = str(cf_error)
-                                print(f"   ❌ request_cloudflare completely failed: {cf_error}")
-                                print(f"   Error details: {type(cf_error).__name__}")
-                                last_error = cf_error
-                        
-                        # Method 2: Direct session call if request_cloudflare didn't work
-                        if not confirm_success and hasattr(atconn, 'session'):
-                            try:
-                                print("   Trying direct session call...")
-                                session = atconn.session
-                                import aiohttp
-                                import requests
-                                
-                                confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                
-                                if isinstance(session, aiohttp.ClientSession):
-                                    async with session.get(confirm_url) as response:
-                                        if response.status == 200:
-                                            result = await response.text()
-                                            print(f"   ✅ Direct session GET successful: {result}")
-                                            confirm_success = True
-                                elif isinstance(session, requests.Session):
-                                    loop = asyncio.get_event_loop()
-                                    response = await loop.run_in_executor(None, session.get, confirm_url)
-                                    if response.status_code == 200:
-                                        print(f"   ✅ Direct session GET successful: {response.text}")
-                                        confirm_success = True
-                            except Exception as session_error:
-                                print(f"   ⚠️ Direct session call failed: {session_error}")
-                                if not last_error:
-                                    last_error = session_error
-                        
-                        # Method 3: Try library confirm() method as last resort
-                        if not confirm_success:
-                            try:
-                                print("   Trying library confirm() method as fallback...")
-                                aternos_server.confirm()
-                                print("   ✅ Library confirm() method called")
-                                confirm_success = True
-                            except Exception as lib_error:
-                                print(f"   ⚠️ Library confirm() failed: {lib_error}")
-                                if not last_error:
-                                    last_error = lib_error
-                    else:
-                        # No atconn, try library method
-                        print("   No atconn, trying library confirm() method...")
-                        aternos_server.confirm()
-                        print("   ✅ Library confirm() method called")
-                        confirm_success = True
-                        
+                    confirm_success, last_error = await attempt_confirm(aternos_server)
                 except Exception as confirm_error:
                     print(f"   ❌ All confirm methods failed")
                     last_error = confirm_error
@@ -779,6 +1904,12 @@ class ConfirmButton(View):
                 if confirm_success:
                     self.confirmed = True
                     print("   ✅✅✅ CONFIRMATION SUCCESSFUL!")
+                elif last_error and ('400' in str(last_error) or 'Bad Request' in str(last_error)):
+                    raise Exception(f"Server returned 400 Bad Request. This usually means:\n"
+                                  f"1. Server doesn't need confirmation right now\n"
+                                  f"2. Token/SEC expired (try restarting bot)\n"
+                                  f"3. Server status changed\n"
+                                  f"Error: {last_error}")
                 else:
                     raise Exception(f"All confirmation methods failed. Last error: {last_error}")
                 
@@ -788,12 +1919,12 @@ class ConfirmButton(View):
                 
                 # Edit the message to disable buttons
                 try:
-                    await interaction.message.edit(view=self)
+                    await outbox_edit(interaction.message, view=self)
                 except Exception as edit_error:
                     print(f'Could not edit message (non-critical): {edit_error}')
                 
                 # Send success message
-                await interaction.followup.send('✅ **Confirmation sent!** Starting server...\n⏳ Please wait, server is starting...')
+                await outbox_followup(interaction, '✅ **Confirmation sent!** Starting server...\n⏳ Please wait, server is starting...', priority=OUTBOX_URGENT)
                 
             except Exception as e:
                 error_msg = str(e)
@@ -808,39 +1939,30 @@ class ConfirmButton(View):
                     try:
                         # Force re-authentication
                         guild_id_str = str(self.guild_id)
-                        if await connect_to_aternos(self.guild_id):
+                        if await connect_to_aternos(self.guild_id, force_login=True):
                             print("✅ Re-authenticated successfully with fresh token")
                             aternos_server = server_servers.get(guild_id_str)
                             if aternos_server:
                                 # Fetch fresh status
-                                aternos_server.fetch()
+                                await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
                                 print(f"   Fresh status: {aternos_server.status}")
                                 
                                 # Check if still needs confirmation
-                                still_needs_confirm = False
-                                if hasattr(aternos_server, '_info'):
-                                    info_data = getattr(aternos_server, '_info')
-                                    if isinstance(info_data, dict) and 'queue' in info_data:
-                                        queue_info = info_data.get('queue', {})
-                                        if isinstance(queue_info, dict):
-                                            pending = queue_info.get('pending', '')
-                                            if pending and str(pending).lower() == 'pending':
-                                                still_needs_confirm = True
-                                
-                                if still_needs_confirm or aternos_server.status != 'online':
+                                fresh = snapshot_of(aternos_server)
+                                if fresh.needs_confirm or fresh.status != 'online':
                                     # Try confirm again with fresh token
                                     try:
                                         print("   Attempting confirm() with fresh token...")
-                                        aternos_server.confirm()
+                                        await aternos_confirm(aternos_server)
                                         print("   ✅ Confirm successful with fresh token!")
                                         self.confirmed = True
                                         for item in self.children:
                                             item.disabled = True
                                         try:
-                                            await interaction.message.edit(view=self)
+                                            await outbox_edit(interaction.message, view=self)
                                         except:
                                             pass
-                                        await interaction.followup.send('✅ **Confirmation sent!** (After re-authentication)\n⏳ Starting server...')
+                                        await outbox_followup(interaction, '✅ **Confirmation sent!** (After re-authentication)\n⏳ Starting server...', priority=OUTBOX_URGENT)
                                         return
                                     except Exception as retry_error:
                                         print(f"❌ Confirm failed after re-auth: {retry_error}")
@@ -855,7 +1977,7 @@ class ConfirmButton(View):
                 
                 # Send error message
                 try:
-                    await interaction.followup.send(
+                    await outbox_followup(interaction,
                         f'❌ **Error confirming:** {error_msg}\n\n'
                         f'**Possible causes:**\n'
                         f'• Server might not need confirmation right now\n'
@@ -864,7 +1986,8 @@ class ConfirmButton(View):
                         f'**Try:**\n'
                         f'• Check Aternos website manually\n'
                         f'• Use `!confirm` command\n'
-                        f'• Restart the bot if error persists'
+                        f'• Restart the bot if error persists',
+                        priority=OUTBOX_URGENT
                     )
                 except:
                     pass
@@ -873,7 +1996,7 @@ class ConfirmButton(View):
             import traceback
             traceback.print_exc()
             try:
-                await interaction.followup.send('❌ An error occurred. Please try again or use `!confirm` command.', ephemeral=True)
+                await outbox_followup(interaction, '❌ An error occurred. Please try again or use `!confirm` command.', ephemeral=True, priority=OUTBOX_URGENT)
             except:
                 pass
     
@@ -893,17 +2016,17 @@ class ConfirmButton(View):
             return
         
         try:
-            aternos_server = server_servers.get(str(self.guild_id))
+            aternos_server = await ensure_connected(self.guild_id)
             if not aternos_server:
-                await interaction.followup.send('❌ Server not found!', ephemeral=True)
+                await outbox_followup(interaction, '❌ Server not found!', ephemeral=True, priority=OUTBOX_URGENT)
                 return
             
             try:
                 # Refresh server status first
-                aternos_server.fetch()
+                await aternos_fetch(aternos_server, STATUS_MAX_AGE)
                 
                 # Stop the server
-                aternos_server.stop()
+                await aternos_stop(aternos_server)
                 
                 # Disable both buttons
                 for item in self.children:
@@ -911,11 +2034,11 @@ class ConfirmButton(View):
                 
                 # Edit the message to disable buttons
                 try:
-                    await interaction.message.edit(view=self)
+                    await outbox_edit(interaction.message, view=self)
                 except Exception as edit_error:
                     print(f'Could not edit message (non-critical): {edit_error}')
                 
-                await interaction.followup.send('✅ **Server stop command sent!**')
+                await outbox_followup(interaction, '✅ **Server stop command sent!**')
                 
             except Exception as e:
                 error_msg = str(e)
@@ -923,7 +2046,7 @@ class ConfirmButton(View):
                 import traceback
                 traceback.print_exc()
                 try:
-                    await interaction.followup.send(f'❌ **Error stopping server:** {error_msg}')
+                    await outbox_followup(interaction, f'❌ **Error stopping server:** {error_msg}', priority=OUTBOX_URGENT)
                 except:
                     pass
         except Exception as e:
@@ -931,373 +2054,264 @@ class ConfirmButton(View):
             import traceback
             traceback.print_exc()
             try:
-                await interaction.followup.send('❌ An error occurred. Please try again.', ephemeral=True)
+                await outbox_followup(interaction, '❌ An error occurred. Please try again.', ephemeral=True, priority=OUTBOX_URGENT)
             except:
                 pass
 
-async def fetch_queue_data_from_panel(aternos_server):
-    """Fetch queue position and time from Aternos panel page HTML"""
+# Seconds a panel page is reused by every parser before it is downloaded again
+PANEL_SNAPSHOT_TTL = float(os.getenv('PANEL_SNAPSHOT_TTL', 3))
+
+# Opening tags that carry a class attribute, with the text right after them
+PANEL_TAG_RE = re.compile(r'<(div|span)\b[^>]*?\bclass=["\']([^"\']*)["\'][^>]*>([^<]*)', re.IGNORECASE)
+# Extend button markers, matched anywhere in the panel HTML
+EXTEND_MARKER_RE = re.compile(r'server-extend|extend-end|class="extend"|fas fa-plus')
+QUEUE_POSITION_RE = re.compile(r'(\d+\s*[/]\s*\d+)')
+QUEUE_TIME_RE = re.compile(r'ca\.\s*(\d+)\s*min', re.IGNORECASE)
+COUNTDOWN_TEXT_RE = re.compile(r'\d+:\d+')
+# Any div (with or without a class) holding nothing but text
+DIV_TEXT_RE = re.compile(r'<div\b[^>]*>([^<]*)</', re.IGNORECASE)
+TAG_RE = re.compile(r'<[^>]*>')
+
+def element_text(html_content, match, tag):
+    """Stripped text of the element a PANEL_TAG_RE match opens (text up to its first closing tag)"""
+    text = match.group(3)
+    end = match.end()
+    if html_content.startswith('</', end):
+        return text.strip()
+    # Nested markup: join the stripped text pieces like BeautifulSoup's get_text(strip=True)
+    close = html_content.find(f'</{tag}', end)
+    chunk = html_content[match.start(3):close if close != -1 else len(html_content)]
+    return ''.join(part.strip() for part in TAG_RE.split(chunk))
+
+def parse_countdown_text(countdown_text):
+    """Seconds from a countdown like "0:35" or "35" (None if it isn't one)"""
+    try:
+        if ':' in countdown_text:
+            parts = countdown_text.split(':')
+            if len(parts) == 2:
+                return int(parts[0]) * 60 + int(parts[1])
+            return None
+        return int(countdown_text)
+    except ValueError:
+        return None
+
+def extract_panel(html_content):
+    """Queue position/time, countdown, extend button and status class from panel HTML in one scan
+
+    Replaces a BeautifulSoup tree plus regex fallbacks per field; benchmarks/bench_panel_extractor.py
+    checks that the results match those parsers.
+    """
     queue_position = None
     queue_time_str = None
+    queue_elements_seen = set()  # Queue elements found, even if empty
+    countdown_text = None
+    countdown_seen = False
+    status_class = None
+    queueing_div = None
     
-    try:
-        if hasattr(aternos_server, 'atconn') and hasattr(aternos_server, 'servid'):
-            atconn = aternos_server.atconn
-            server_id = aternos_server.servid
-            
-            # Try multiple URLs
-            urls_to_try = [
-                'https://aternos.org/server/',  # Main panel
-                f'https://aternos.org/server/?id={server_id}',  # Server-specific
-                'https://aternos.org/panel/',  # Panel page
-            ]
-            
-            # Use the session from atconn
-            if hasattr(atconn, 'session'):
-                session = atconn.session
-                import aiohttp
-                import requests
-                
-                for panel_url in urls_to_try:
-                    try:
-                        if isinstance(session, aiohttp.ClientSession):
-                            # Async aiohttp session
-                            async with session.get(panel_url) as response:
-                                print(f"Fetching queue data from: {panel_url} (status: {response.status})")
-                                if response.status == 200:
-                                    html_content = await response.text()
-                                    queue_position, queue_time_str = parse_queue_from_html(html_content)
-                                    if queue_position or queue_time_str:
-                                        print(f"Successfully found queue data from {panel_url}")
-                                        break
-                                else:
-                                    print(f"Failed to fetch {panel_url}: Status {response.status}")
-                        elif isinstance(session, requests.Session):
-                            # Sync requests session
-                            loop = asyncio.get_event_loop()
-                            response = await loop.run_in_executor(None, session.get, panel_url)
-                            print(f"Fetching queue data from: {panel_url} (status: {response.status_code})")
-                            if response.status_code == 200:
-                                html_content = response.text
-                                queue_position, queue_time_str = parse_queue_from_html(html_content)
-                                if queue_position or queue_time_str:
-                                    print(f"Successfully found queue data from {panel_url}")
-                                    break
-                            else:
-                                print(f"Failed to fetch {panel_url}: Status {response.status_code}")
-                    except Exception as e:
-                        print(f"Error fetching {panel_url}: {e}")
-                        continue
-                        
-                # If HTML parsing didn't work, try the queue API endpoint
-                if not queue_position and not queue_time_str:
-                    try:
-                        queue_api_url = f'https://aternos.org/panel/ajax/queue.php?id={server_id}'
-                        print(f"Trying queue API: {queue_api_url}")
-                        
-                        if isinstance(session, aiohttp.ClientSession):
-                            async with session.get(queue_api_url) as response:
-                                if response.status == 200:
-                                    try:
-                                        api_data = await response.json()
-                                        print(f"Queue API response: {api_data}")
-                                        # Parse API response
-                                        if isinstance(api_data, dict):
-                                            # Look for position in various formats
-                                            for key in ['position', 'pos', 'queue_pos', 'current']:
-                                                if key in api_data:
-                                                    pos_val = api_data[key]
-                                                    if isinstance(pos_val, (int, str)):
-                                                        queue_position = str(pos_val)
-                                                        # Check for max position
-                                                        for max_key in ['max', 'max_position', 'total']:
-                                                            if max_key in api_data:
-                                                                max_val = api_data[max_key]
-                                                                queue_position = f"{pos_val} / {max_val}"
-                                                                break
-                                                        break
-                                            
-                                            # Look for time
-                                            for key in ['time', 'wait', 'eta', 'estimated']:
-                                                if key in api_data:
-                                                    time_val = api_data[key]
-                                                    if isinstance(time_val, (int, float)):
-                                                        minutes = int(time_val / 60) if time_val > 60 else int(time_val)
-                                                        queue_time_str = f"ca. {minutes} min"
-                                                        break
-                                    except:
-                                        # Try as text/HTML
-                                        text_data = await response.text()
-                                        queue_position, queue_time_str = parse_queue_from_html(text_data)
-                                elif response.status == 503:
-                                    # Service Unavailable - silently skip
-                                    pass
-                        elif isinstance(session, requests.Session):
-                            loop = asyncio.get_event_loop()
-                            response = await loop.run_in_executor(None, session.get, queue_api_url)
-                            if response.status_code == 200:
-                                try:
-                                    api_data = response.json()
-                                    print(f"Queue API response: {api_data}")
-                                    # Same parsing as above
-                                    if isinstance(api_data, dict):
-                                        for key in ['position', 'pos', 'queue_pos', 'current']:
-                                            if key in api_data:
-                                                pos_val = api_data[key]
-                                                if isinstance(pos_val, (int, str)):
-                                                    queue_position = str(pos_val)
-                                                    for max_key in ['max', 'max_position', 'total']:
-                                                        if max_key in api_data:
-                                                            max_val = api_data[max_key]
-                                                            queue_position = f"{pos_val} / {max_val}"
-                                                            break
-                                                    break
-                                        
-                                        for key in ['time', 'wait', 'eta', 'estimated']:
-                                            if key in api_data:
-                                                time_val = api_data[key]
-                                                if isinstance(time_val, (int, float)):
-                                                    minutes = int(time_val / 60) if time_val > 60 else int(time_val)
-                                                    queue_time_str = f"ca. {minutes} min"
-                                                    break
-                                except:
-                                    text_data = response.text
-                                    queue_position, queue_time_str = parse_queue_from_html(text_data)
-                            elif response.status_code == 503:
-                                # Service Unavailable - silently skip
-                                pass
-                    except Exception as e:
-                        error_str = str(e)
-                        # Don't spam console with 503 errors
-                        if '503' not in error_str and 'Service Unavailable' not in error_str:
-                            print(f"Error fetching queue API: {e}")
-            else:
-                print("No session available in atconn")
-    except Exception as e:
-        print(f"Error in fetch_queue_data_from_panel: {e}")
-        import traceback
-        traceback.print_exc()
+    for match in PANEL_TAG_RE.finditer(html_content):
+        tag = match.group(1).lower()
+        classes = match.group(2)
+        if tag == 'span':
+            if queue_position is None and 'queue-position' in classes:
+                queue_elements_seen.add('position')
+                queue_position = element_text(html_content, match, tag) or None
+            continue
+        if queue_time_str is None and 'queue-time' in classes:
+            queue_elements_seen.add('time')
+            queue_time_str = element_text(html_content, match, tag) or None
+        elif not countdown_seen and 'server-end-countdown' in classes:
+            countdown_seen = True
+            countdown_text = element_text(html_content, match, tag)
+        if status_class is None and 'status' in classes.split():
+            status_class = ' '.join(c for c in classes.split() if c != 'status') or None
+        if queueing_div is None:
+            status_at = classes.find('status')
+            if status_at != -1 and classes.find('queueing', status_at) != -1:
+                queueing_div = match
     
-    return queue_position, queue_time_str
+    if countdown_text is None and not countdown_seen:
+        # No countdown div: the first div whose only text looks like a time
+        for match in DIV_TEXT_RE.finditer(html_content):
+            if COUNTDOWN_TEXT_RE.search(match.group(1)):
+                countdown_text = match.group(1).strip()
+                break
+    
+    if queueing_div is not None and (queue_position is None or queue_time_str is None):
+        # Queue data written straight into <div class="status queueing">
+        close = html_content.find('</div>', queueing_div.end())
+        status_html = html_content[queueing_div.start():close + 6 if close != -1 else len(html_content)]
+        if queue_position is None:
+            pos_in_status = QUEUE_POSITION_RE.search(status_html)
+            if pos_in_status:
+                queue_position = pos_in_status.group(1).strip()
+        if queue_time_str is None:
+            time_in_status = QUEUE_TIME_RE.search(status_html)
+            if time_in_status:
+                queue_time_str = f"ca. {time_in_status.group(1)} min"
+    
+    # An empty queue element reads as "" rather than None, as before
+    if queue_position is None and 'position' in queue_elements_seen:
+        queue_position = ''
+    if queue_time_str is None and 'time' in queue_elements_seen:
+        queue_time_str = ''
+    
+    countdown_seconds = parse_countdown_text(countdown_text) if countdown_text else None
+    if countdown_seconds is None and 'server-extend-end' in html_content:
+        # The extend button only shows in the last minute
+        countdown_seconds = 60
+    
+    extend_button_exists = EXTEND_MARKER_RE.search(html_content) is not None
+    if not extend_button_exists and 'server-end-countdown' in html_content:
+        # The extend button appears in the same section as the countdown
+        extend_button_exists = 'fa-plus' in html_content or 'extend' in html_content.lower()
+    
+    return {
+        'queue_position': queue_position,
+        'queue_time_str': queue_time_str,
+        'countdown_seconds': countdown_seconds,
+        'extend_button_exists': extend_button_exists,
+        'status_class': status_class,
+    }
 
 def parse_queue_from_html(html_content):
     """Parse queue position and time from Aternos HTML"""
-    queue_position = None
-    queue_time_str = None
+    fields = extract_panel(html_content)
+    return fields['queue_position'], fields['queue_time_str']
+
+def parse_countdown_from_html(html_content):
+    """Parse countdown timer from Aternos HTML (format: M:SS or SS)"""
+    return extract_panel(html_content)['countdown_seconds']
+
+def find_extend_button(html_content):
+    """Check panel HTML for the extend button (indicates countdown <= 60 seconds)"""
+    return extract_panel(html_content)['extend_button_exists']
+
+class PanelSnapshot:
+    """One download of a server's panel page, parsed once and shared by every caller (the HTML isn't kept)"""
+    def __init__(self, url, html_content):
+        self.url = url
+        self.fetched_at = time.time()
+        self.size = len(html_content)
+        fields = extract_panel(html_content)
+        self.queue_position = fields['queue_position']
+        self.queue_time_str = fields['queue_time_str']
+        self.countdown_seconds = fields['countdown_seconds']
+        self.extend_button_exists = fields['extend_button_exists']
+        self.status_class = fields['status_class']
     
-    try:
-        # Try using BeautifulSoup if available
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+
+# Latest panel snapshot per Aternos server id
+panel_snapshots = {}
+panel_snapshot_locks = {}
+
+def store_panel_snapshot(aternos_server, url, html_content):
+    """Remember a freshly downloaded panel page for a server"""
+    snapshot = PanelSnapshot(url, html_content)
+    panel_snapshots[server_key(aternos_server)] = snapshot
+    return snapshot
+
+async def get_panel_snapshot(aternos_server, max_age=PANEL_SNAPSHOT_TTL):
+    """Get a server's panel snapshot, downloading the page at most once per max_age"""
+    key = server_key(aternos_server)
+    snapshot = panel_snapshots.get(key)
+    if snapshot is not None and snapshot.age < max_age:
+        return snapshot
+    
+    lock = panel_snapshot_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        # Another caller may have refreshed it while we waited
+        snapshot = panel_snapshots.get(key)
+        if snapshot is not None and snapshot.age < max_age:
+            return snapshot
         try:
-            soup = BeautifulSoup(html_content, 'html.parser')
-            
-            # Find queue position: <span class="server-status-label-right queue-position"> (may have "hidden" class)
-            queue_pos_elem = soup.find('span', class_=lambda x: x and 'queue-position' in x)
-            if queue_pos_elem:
-                queue_position = queue_pos_elem.get_text(strip=True)
-                if queue_position:
-                    print(f"Found queue position in HTML: {queue_position}")
-            
-            # Find queue time: <div class="server-status-label-left queue-time"> (may have "hidden" class)
-            queue_time_elem = soup.find('div', class_=lambda x: x and 'queue-time' in x)
-            if queue_time_elem:
-                queue_time_str = queue_time_elem.get_text(strip=True)
-                if queue_time_str:
-                    print(f"Found queue time in HTML: {queue_time_str}")
-        except ImportError:
-            # BeautifulSoup not available, use regex
-            pass
+            # The status fetch downloads the panel page and stores it as the snapshot
+            await aternos_fetch(aternos_server, priority=PRIORITY_BACKGROUND)
         except Exception as e:
-            print(f"Error with BeautifulSoup, trying regex: {e}")
-        
-        # Always try regex as fallback (works even if BeautifulSoup failed)
-        if not queue_position:
-            # Pattern for queue position: "3535 / 3835" or "3535/3835" (handles "hidden" class)
-            pos_match = re.search(r'<span[^>]*class="[^"]*queue-position[^"]*"[^>]*>([^<]+)</span>', html_content, re.IGNORECASE | re.DOTALL)
-            if pos_match:
-                queue_position = pos_match.group(1).strip()
-                if queue_position:
-                    print(f"Found queue position in HTML (regex): {queue_position}")
-        
-        if not queue_time_str:
-            # Pattern for queue time: "ca. 8 min" (handles "hidden" class)
-            time_match = re.search(r'<div[^>]*class="[^"]*queue-time[^"]*"[^>]*>([^<]+)</div>', html_content, re.IGNORECASE | re.DOTALL)
-            if time_match:
-                queue_time_str = time_match.group(1).strip()
-                if queue_time_str:
-                    print(f"Found queue time in HTML (regex): {queue_time_str}")
-        
-        # Also try to find the data in the status div directly
-        if not queue_position or not queue_time_str:
-            # Look for the pattern in the status div: <div class="status queueing">
-            status_match = re.search(r'<div[^>]*class="[^"]*status[^"]*queueing[^"]*"[^>]*>.*?</div>', html_content, re.IGNORECASE | re.DOTALL)
-            if status_match:
-                status_html = status_match.group(0)
-                # Try to extract from this section
-                if not queue_position:
-                    pos_in_status = re.search(r'(\d+\s*[/]\s*\d+)', status_html)
-                    if pos_in_status:
-                        queue_position = pos_in_status.group(1).strip()
-                        print(f"Found queue position in status div: {queue_position}")
-                
-                if not queue_time_str:
-                    time_in_status = re.search(r'ca\.\s*(\d+)\s*min', status_html, re.IGNORECASE)
-                    if time_in_status:
-                        queue_time_str = f"ca. {time_in_status.group(1)} min"
-                        print(f"Found queue time in status div: {queue_time_str}")
-    except Exception as e:
-        print(f"Error parsing HTML: {e}")
-        import traceback
-        traceback.print_exc()
-    
+            print(f"Error fetching panel page: {e}")
+            return await fetch_panel_fallback(aternos_server)
+        return panel_snapshots.get(key)
+
+async def fetch_panel_fallback(aternos_server):
+    """Try the other panel URLs when the main server page can't be loaded"""
+    if not hasattr(aternos_server, 'atconn') or not hasattr(aternos_server, 'servid'):
+        return None
+    atconn = aternos_server.atconn
+    server_id = aternos_server.servid
+    for endpoint in endpoint_registry.ordered('panel', PANEL_FALLBACK_ENDPOINTS):
+        panel_url = endpoint_url(endpoint, server_id)
+        try:
+            response = await aternos_request(atconn, panel_url, 'GET', priority=PRIORITY_BACKGROUND, reqcookies={'ATERNOS_SERVER': server_id})
+            if response.status_code == 200 and response.text:
+                endpoint_registry.record_success('panel', endpoint)
+                print(f"Fetched panel page from fallback: {panel_url}")
+                return store_panel_snapshot(aternos_server, panel_url, response.text)
+            endpoint_registry.record_failure('panel', endpoint)
+        except Exception as e:
+            endpoint_registry.record_failure('panel', endpoint)
+            print(f"Error fetching {panel_url}: {e}")
+    return None
+
+def queue_from_status_info(info_data):
+    """Queue position ("pos / max") and time ("ca. N min") from a lastStatus/status push dict"""
+    if not isinstance(info_data, dict) or not isinstance(info_data.get('queue'), dict):
+        return None, None
+    queue_info = info_data['queue']
+    queue_position = None
+    queue_time_str = None
+    position = queue_info.get('position')
+    if position:
+        max_position = queue_info.get('count') or queue_info.get('max')
+        queue_position = f"{position} / {max_position}" if max_position else str(position)
+    minutes = queue_info.get('minutes')
+    if isinstance(minutes, (int, float)) and minutes >= 0:
+        queue_time_str = f"ca. {int(minutes)} min"
     return queue_position, queue_time_str
 
-def parse_countdown_from_html(html_content):
-    """Parse countdown timer from Aternos HTML (format: M:SS or SS)"""
-    countdown_seconds = None
-    extend_button_exists = False
+async def fetch_queue_data_from_panel(aternos_server):
+    """Fetch queue position and time from Aternos panel page HTML"""
+    queue_position = None
+    queue_time_str = None
     
     try:
-        # First, check if extend button exists (indicates countdown <= 60 seconds)
-        if 'server-extend-end' in html_content or 'btn btn-tiny btn-success server-extend-end' in html_content:
-            extend_button_exists = True
-            print("✅ Extend button found in HTML - countdown is <= 60 seconds")
-        
-        # Try using BeautifulSoup if available
-        try:
-            soup = BeautifulSoup(html_content, 'html.parser')
+        if hasattr(aternos_server, 'atconn') and hasattr(aternos_server, 'servid'):
+            # A live status stream already pushed the queue data
+            if live_status_stream(aternos_server) is not None:
+                queue_position, queue_time_str = queue_from_status_info(getattr(aternos_server, '_info', None))
+                if queue_position or queue_time_str:
+                    return queue_position, queue_time_str
             
-            # Find countdown: <div class="server-end-countdown">0:35</div>
-            # Also check for bis_skin_checked attribute
-            countdown_elem = soup.find('div', class_=lambda x: x and 'server-end-countdown' in x)
-            if not countdown_elem:
-                # Try finding by text pattern
-                countdown_elem = soup.find('div', string=re.compile(r'\d+:\d+'))
+            # Queue data from the shared panel snapshot (no extra download within the TTL)
+            snapshot = await get_panel_snapshot(aternos_server)
+            if snapshot is not None:
+                queue_position, queue_time_str = snapshot.queue_position, snapshot.queue_time_str
+                if queue_position or queue_time_str:
+                    print(f"Queue data from panel snapshot ({snapshot.age:.1f}s old)")
             
-            if countdown_elem:
-                countdown_text = countdown_elem.get_text(strip=True)
-                if countdown_text:
-                    # Parse format like "0:35" or "35"
-                    if ':' in countdown_text:
-                        parts = countdown_text.split(':')
-                        if len(parts) == 2:
-                            try:
-                                minutes = int(parts[0])
-                                seconds = int(parts[1])
-                                countdown_seconds = minutes * 60 + seconds
-                            except ValueError:
-                                pass
-                    else:
-                        # Just seconds
-                        try:
-                            countdown_seconds = int(countdown_text)
-                        except ValueError:
-                            pass
-                    
-                    if countdown_seconds is not None:
-                        print(f"Found countdown in HTML: {countdown_text} ({countdown_seconds}s)")
-        except ImportError:
-            # BeautifulSoup not available, use regex
-            pass
-        except Exception as e:
-            print(f"Error with BeautifulSoup, trying regex: {e}")
-        
-        # Always try regex as fallback
-        if countdown_seconds is None:
-            # Pattern for countdown: <div class="server-end-countdown">0:35</div>
-            # Handle bis_skin_checked attribute
-            countdown_match = re.search(r'<div[^>]*class="[^"]*server-end-countdown[^"]*"[^>]*>([^<]+)</div>', html_content, re.IGNORECASE | re.DOTALL)
-            if countdown_match:
-                countdown_text = countdown_match.group(1).strip()
-                # Parse format like "0:35" or "35"
-                if ':' in countdown_text:
-                    parts = countdown_text.split(':')
-                    if len(parts) == 2:
-                        try:
-                            minutes = int(parts[0])
-                            seconds = int(parts[1])
-                            countdown_seconds = minutes * 60 + seconds
-                        except ValueError:
-                            pass
-                else:
-                    # Just seconds
-                    try:
-                        countdown_seconds = int(countdown_text)
-                    except ValueError:
-                        pass
-                
-                if countdown_seconds is not None:
-                    print(f"Found countdown in HTML (regex): {countdown_text} ({countdown_seconds}s)")
-        
-        # If extend button exists but we couldn't parse countdown, assume it's <= 60 seconds
-        if extend_button_exists and countdown_seconds is None:
-            print("⚠️ Extend button found but couldn't parse exact countdown, assuming <= 60 seconds")
-            countdown_seconds = 60  # Set to 60 as a safe default when button is visible
-        
+            # If HTML parsing didn't work, try the queue API endpoint
+            if not queue_position and not queue_time_str:
+                api_position, api_max, api_seconds = await fetch_queue_api(aternos_server)
+                if api_position is not None:
+                    queue_position = f"{api_position} / {api_max}" if api_max is not None else str(api_position)
+                if api_seconds is not None:
+                    minutes = int(api_seconds / 60) if api_seconds > 60 else int(api_seconds)
+                    queue_time_str = f"ca. {minutes} min"
     except Exception as e:
-        print(f"Error parsing countdown HTML: {e}")
+        print(f"Error in fetch_queue_data_from_panel: {e}")
         import traceback
         traceback.print_exc()
     
-    return countdown_seconds
+    return queue_position, queue_time_str
 
 async def check_extend_button_exists(aternos_server):
     """Check if extend button exists in HTML (indicates countdown <= 60 seconds)"""
     try:
-        if hasattr(aternos_server, 'atconn') and hasattr(aternos_server, 'servid'):
-            atconn = aternos_server.atconn
-            server_id = aternos_server.servid
-            
-            # Try multiple URLs
-            urls_to_try = [
-                f'https://aternos.org/server/?id={server_id}',
-                'https://aternos.org/server/',
-            ]
-            
-            if hasattr(atconn, 'session'):
-                session = atconn.session
-                import aiohttp
-                import requests
-                
-                for panel_url in urls_to_try:
-                    try:
-                        html_content = None
-                        if isinstance(session, aiohttp.ClientSession):
-                            async with session.get(panel_url) as response:
-                                if response.status == 200:
-                                    html_content = await response.text()
-                        elif isinstance(session, requests.Session):
-                            loop = asyncio.get_event_loop()
-                            response = await loop.run_in_executor(None, session.get, panel_url)
-                            if response.status_code == 200:
-                                html_content = response.text
-                        
-                        if html_content:
-                            # Try multiple search patterns for the extend button
-                            button_patterns = [
-                                'server-extend-end',
-                                'btn btn-tiny btn-success server-extend-end',
-                                'server-extend-end',
-                                'class="extend"',
-                                'server-extend',
-                                'extend-end',
-                                'fas fa-plus',
-                            ]
-                            
-                            for pattern in button_patterns:
-                                if pattern in html_content:
-                                    print(f"✅ Extend button found using pattern: '{pattern}'")
-                                    return True
-                            
-                            # Also check for the countdown div which appears with the button
-                            if 'server-end-countdown' in html_content:
-                                # If countdown exists, check if extend div is nearby
-                                # The extend button appears in the same section as countdown
-                                if 'extend' in html_content.lower() or 'fa-plus' in html_content:
-                                    print(f"✅ Extend button likely exists (found countdown + extend references)")
-                                    return True
-                    except Exception as e:
-                        print(f"Error checking extend button from {panel_url}: {e}")
-                        continue
+        snapshot = await get_panel_snapshot(aternos_server)
+        if snapshot is not None:
+            return snapshot.extend_button_exists
     except Exception as e:
         print(f"Error in check_extend_button_exists: {e}")
         import traceback
@@ -1306,81 +2320,17 @@ async def check_extend_button_exists(aternos_server):
     return False
 
 async def fetch_countdown_and_button(aternos_server):
-    """Fetch countdown timer and check for extend button from Aternos panel page HTML"""
+    """Get countdown timer and extend button state from the shared panel snapshot"""
     countdown_seconds = None
     extend_button_exists = False
     
     try:
-        if hasattr(aternos_server, 'atconn') and hasattr(aternos_server, 'servid'):
-            atconn = aternos_server.atconn
-            server_id = aternos_server.servid
-            
-            # Try multiple URLs - prioritize server-specific URL
-            urls_to_try = [
-                f'https://aternos.org/server/?id={server_id}',  # Server-specific (most reliable)
-                'https://aternos.org/server/',  # Main panel
-            ]
-            
-            # Use the session from atconn
-            if hasattr(atconn, 'session'):
-                session = atconn.session
-                import aiohttp
-                import requests
-                
-                for panel_url in urls_to_try:
-                    try:
-                        html_content = None
-                        if isinstance(session, aiohttp.ClientSession):
-                            # Async aiohttp session
-                            async with session.get(panel_url) as response:
-                                if response.status == 200:
-                                    html_content = await response.text()
-                                else:
-                                    print(f"Failed to fetch {panel_url}: Status {response.status}")
-                        elif isinstance(session, requests.Session):
-                            # Sync requests session
-                            loop = asyncio.get_event_loop()
-                            response = await loop.run_in_executor(None, session.get, panel_url)
-                            if response.status_code == 200:
-                                html_content = response.text
-                            else:
-                                print(f"Failed to fetch {panel_url}: Status {response.status_code}")
-                        
-                        if html_content:
-                            # Check for extend button first (more reliable indicator)
-                            button_patterns = [
-                                'server-extend-end',
-                                'btn btn-tiny btn-success server-extend-end',
-                                'class="extend"',
-                                'server-extend',
-                                'extend-end',
-                                'fas fa-plus',
-                            ]
-                            
-                            for pattern in button_patterns:
-                                if pattern in html_content:
-                                    extend_button_exists = True
-                                    print(f"✅ Extend button found using pattern: '{pattern}'")
-                                    break
-                            
-                            # Also check for countdown div which appears with the button
-                            if 'server-end-countdown' in html_content:
-                                # If countdown exists, check if extend div is nearby
-                                if 'extend' in html_content.lower() or 'fa-plus' in html_content:
-                                    extend_button_exists = True
-                                    print(f"✅ Extend button likely exists (found countdown + extend references)")
-                            
-                            # Parse countdown from HTML
-                            countdown_seconds = parse_countdown_from_html(html_content)
-                            
-                            if countdown_seconds is not None or extend_button_exists:
-                                print(f"✅ Successfully fetched data from {panel_url}")
-                                break
-                    except Exception as e:
-                        print(f"Error fetching {panel_url}: {e}")
-                        import traceback
-                        traceback.print_exc()
-                        continue
+        snapshot = await get_panel_snapshot(aternos_server)
+        if snapshot is not None:
+            extend_button_exists = snapshot.extend_button_exists
+            countdown_seconds = snapshot.countdown_seconds
+            if countdown_seconds is not None or extend_button_exists:
+                print(f"✅ Countdown data from panel snapshot ({snapshot.age:.1f}s old)")
     except Exception as e:
         print(f"Error in fetch_countdown_and_button: {e}")
         import traceback
@@ -1390,80 +2340,608 @@ async def fetch_countdown_and_button(aternos_server):
 
 def get_players_online(aternos_server):
     """Get number of players currently online"""
+    return snapshot_of(aternos_server).players
+
+def mentions_confirm(value, unless):
+    """'confirm' anywhere, or 'pending' when the value doesn't also say `unless`"""
+    return 'confirm' in value or ('pending' in value and unless not in value)
+
+# Confirmation rules, checked in order: (field, test on the lowercased field)
+CONFIRM_RULES = (
+    ('queue.pending', lambda value: value == 'pending'),
+    ('queue.pending', lambda value: 'confirm' in value),
+    ('queue.position', lambda value: value is not None and value <= 1),
+    ('label', lambda value: mentions_confirm(value, 'waiting')),
+    ('class', lambda value: mentions_confirm(value, 'queueing')),
+    ('css_class', lambda value: mentions_confirm(value, 'queueing')),
+    ('lang', lambda value: mentions_confirm(value, 'waiting')),
+    ('message', lambda value: mentions_confirm(value, 'waiting')),
+    ('status_text', lambda value: mentions_confirm(value, 'waiting')),
+    ('action', lambda value: mentions_confirm(value, 'waiting')),
+    ('status', lambda value: mentions_confirm(value, 'waiting')),
+)
+# Text fields the rules look at; if none mentions either word only the position rule can match
+CONFIRM_WORDS_RE = re.compile(r'confirm|pending')
+
+def detect_confirm(info_data, status, css_class):
+    """Why the server waits for a start confirmation (None if it doesn't), from CONFIRM_RULES"""
+    queue_info = info_data.get('queue') if isinstance(info_data.get('queue'), dict) else {}
+    message = info_data.get('message')
+    if isinstance(message, dict):
+        message = message.get('text')
+    raw = {
+        'queue.pending': queue_info.get('pending'),
+        'label': info_data.get('label'),
+        'class': info_data.get('class'),
+        'css_class': css_class,
+        'lang': info_data.get('lang'),
+        'message': message,
+        'status_text': info_data.get('status_text'),
+        'action': info_data.get('action'),
+        'status': status,
+    }
+    fields = {name: str(value).lower() for name, value in raw.items() if value and isinstance(value, (str, int))}
+    position = queue_info.get('position')
+    fields['queue.position'] = position if isinstance(position, int) and not isinstance(position, bool) else None
+    raw['queue.position'] = position
+    
+    words_seen = CONFIRM_WORDS_RE.search(' '.join(v for v in fields.values() if isinstance(v, str)))
+    for field, test in CONFIRM_RULES:
+        if field not in fields or (field != 'queue.position' and not words_seen):
+            continue
+        if test(fields[field]):
+            return f"{field}='{raw[field]}'"
+    return None
+
+class ServerSnapshot:
+    """Immutable, normalized result of one status fetch; equal snapshots mean nothing changed"""
+    __slots__ = ('status', 'status_num', 'css_class', 'label', 'queue_position', 'queue_count', 'queue_pending',
+                 'queue_eta', 'countdown', 'players', 'players_list', 'needs_confirm', 'confirm_reason',
+                 'extendable', 'info', 'fetched_at')
+    # Fields that take part in comparisons (not the raw info dict or the time)
+    FIELDS = __slots__[:-2]
+    
+    def __init__(self, **fields):
+        for name in self.__slots__:
+            object.__setattr__(self, name, fields.get(name))
+    
+    def __setattr__(self, name, value):
+        raise AttributeError('ServerSnapshot is immutable')
+    
+    def __delattr__(self, name):
+        raise AttributeError('ServerSnapshot is immutable')
+    
+    def _key(self):
+        return tuple(getattr(self, name) for name in self.FIELDS)
+    
+    def __eq__(self, other):
+        if not isinstance(other, ServerSnapshot):
+            return NotImplemented
+        return self._key() == other._key()
+    
+    def __hash__(self):
+        return hash(self._key())
+    
+    def __repr__(self):
+        return f"ServerSnapshot(status={self.status!r}, queue={self.queue_position_str!r}, countdown={self.countdown!r}, players={self.players!r}, needs_confirm={self.needs_confirm!r})"
+    
+    @property
+    def age(self):
+        return time.time() - self.fetched_at
+    
+    @property
+    def countdown_remaining(self):
+        """The countdown as of now (it kept running since the fetch)"""
+        if self.countdown is None:
+            return None
+        return max(0, self.countdown - self.age)
+    
+    @property
+    def in_queue(self):
+        return self.status in ('waiting', 'queueing') or 'queue' in str(self.css_class or '') or self.queue_position is not None
+    
+    @property
+    def queue_position_str(self):
+        """Queue position like the panel shows it ("pos / count")"""
+        if self.queue_position is None:
+            return None
+        return f"{self.queue_position} / {self.queue_count}" if self.queue_count is not None else str(self.queue_position)
+    
+    @classmethod
+    def from_server(cls, aternos_server):
+        info_data = getattr(aternos_server, '_info', None)
+        if not isinstance(info_data, dict):
+            info_data = {}
+        status = info_data.get('lang')
+        if status is None:
+            try:
+                status = aternos_server.status
+            except Exception:
+                status = None
+        css_class = info_data.get('class')
+        
+        queue_info = info_data.get('queue') if isinstance(info_data.get('queue'), dict) else {}
+        queue_position = as_int(queue_info.get('position'))
+        queue_eta = queue_info.get('time') if isinstance(queue_info.get('time'), str) else None
+        if queue_eta is None and isinstance(queue_info.get('minutes'), (int, float)):
+            queue_eta = f"ca. {int(queue_info['minutes'])} min"
+        
+        countdown = as_int(info_data.get('countdown'))
+        if countdown is not None and countdown < 0:
+            countdown = None
+        players_list = tuple(info_data.get('playerlist') or ())
+        players = as_int(info_data.get('players'))
+        
+        confirm_reason = detect_confirm(info_data, status, css_class)
+        fetch_age = status_flight.result_age(server_key(aternos_server))
+        return cls(
+            status=status,
+            status_num=as_int(info_data.get('status')),
+            css_class=css_class,
+            label=info_data.get('label'),
+            queue_position=queue_position,
+            queue_count=as_int(queue_info.get('count')),
+            queue_pending=queue_info.get('pending'),
+            queue_eta=queue_eta,
+            countdown=countdown,
+            players=players if players is not None else len(players_list),
+            players_list=players_list,
+            needs_confirm=confirm_reason is not None,
+            confirm_reason=confirm_reason,
+            extendable=status == 'online' and countdown is not None and countdown < EXTEND_THRESHOLD,
+            info=info_data,
+            fetched_at=time.time() - (fetch_age if fetch_age != float('inf') else 0),
+        )
+
+def as_int(value):
+    """int from an int or digit string (None otherwise)"""
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, str) and value.strip().isdigit():
+        return int(value)
+    return None
+
+# Latest snapshot per Aternos server id
+server_snapshots = {}
+
+def snapshot_of(aternos_server):
+    """The server's current snapshot, normalized once per status fetch"""
+    key = server_key(aternos_server)
+    info_data = getattr(aternos_server, '_info', None)
+    snapshot = server_snapshots.get(key)
+    if snapshot is None or snapshot.info is not info_data:
+        snapshot = ServerSnapshot.from_server(aternos_server)
+        server_snapshots[key] = snapshot
+    return snapshot
+
+# Endpoint scores halve after this many seconds, so demoted endpoints get another chance later
+ENDPOINT_DECAY_HALF_LIFE = float(os.getenv('ENDPOINT_DECAY_HALF_LIFE', 600))
+
+class EndpointRegistry:
+    """Remembers which endpoint (strategy, URL, method) last worked per operation and tries it first"""
+    def __init__(self, half_life=ENDPOINT_DECAY_HALF_LIFE):
+        self.half_life = half_life
+        self.scores = {}  # (operation, endpoint) -> (score, updated_at)
+        self.last_success = {}  # operation -> endpoint
+    
+    def score(self, operation, endpoint, now=None):
+        """Current score, decayed towards 0 since the last update"""
+        now = now or time.time()
+        score, updated_at = self.scores.get((operation, endpoint), (0.0, now))
+        return score * 0.5 ** ((now - updated_at) / self.half_life)
+    
+    def ordered(self, operation, endpoints):
+        """Endpoints in the order to try: last success, then by score, then original order"""
+        now = time.time()
+        best = self.last_success.get(operation)
+        ranked = sorted(
+            enumerate(endpoints),
+            key=lambda item: (item[1] != best, -self.score(operation, item[1], now), item[0])
+        )
+        return [endpoint for _, endpoint in ranked]
+    
+    def record_success(self, operation, endpoint):
+        now = time.time()
+        score = max(self.score(operation, endpoint, now), 0.0) + 1.0
+        self.scores[(operation, endpoint)] = (score, now)
+        self.last_success[operation] = endpoint
+    
+    def record_failure(self, operation, endpoint):
+        now = time.time()
+        score = min(self.score(operation, endpoint, now), 0.0) - 1.0
+        self.scores[(operation, endpoint)] = (score, now)
+        if self.last_success.get(operation) == endpoint:
+            del self.last_success[operation]
+
+endpoint_registry = EndpointRegistry()
+
+# Endpoints are (strategy, URL template, method); '{server_id}' is filled in per server
+CONFIRM_URL = 'https://aternos.org/ajax/server/confirm?id={server_id}'
+CONFIRM_ENDPOINTS = [
+    ('library', None, None),
+    ('cloudflare', CONFIRM_URL, 'POST'),
+    ('cloudflare', CONFIRM_URL, 'GET'),
+    ('session', CONFIRM_URL, 'POST'),
+]
+
+EXTEND_URLS = [
+    'https://aternos.org/ajax/server/extend',
+    'https://aternos.org/ajax/server/extend?id={server_id}',
+    'https://aternos.org/panel/ajax/extend.php',
+    'https://aternos.org/panel/ajax/extend.php?id={server_id}',
+]
+EXTEND_ENDPOINTS = [
+    ('cloudflare', url, method) for url in EXTEND_URLS for method in ('POST', 'GET')
+] + [('session', url, 'POST') for url in EXTEND_URLS]
+
+QUEUE_API_URL = 'https://aternos.org/panel/ajax/queue.php?id={server_id}'
+QUEUE_API_ENDPOINTS = [
+    ('cloudflare', QUEUE_API_URL, 'GET'),
+    ('session', QUEUE_API_URL, 'GET'),
+]
+
+PANEL_FALLBACK_ENDPOINTS = [
+    ('cloudflare', 'https://aternos.org/server/?id={server_id}', 'GET'),  # Server-specific
+    ('cloudflare', 'https://aternos.org/panel/', 'GET'),  # Panel page
+]
+
+def endpoint_url(endpoint, server_id):
+    """Fill the server id into an endpoint's URL (dropping the query if there is no id)"""
+    url = endpoint[1]
+    if server_id:
+        return url.format(server_id=server_id)
+    return url.split('?', 1)[0]
+
+def describe_endpoint(endpoint, server_id=None):
+    strategy, _, method = endpoint
+    if strategy == 'library':
+        return 'library confirm()'
+    return f"{strategy} {method} {endpoint_url(endpoint, server_id)}"
+
+def endpoint_available(aternos_server, endpoint):
+    """Check the server object supports an endpoint's strategy"""
+    strategy = endpoint[0]
+    if strategy == 'library':
+        return hasattr(aternos_server, 'confirm') and callable(aternos_server.confirm)
+    atconn = getattr(aternos_server, 'atconn', None)
+    if atconn is None:
+        return False
+    if strategy == 'cloudflare':
+        return hasattr(atconn, 'request_cloudflare')
+    # requests.Session is patched to CloudflareSession; the connection's CloudScraper derives from the original
+    return isinstance(getattr(atconn, 'session', None), _OriginalSession)
+
+def confirm_accepted(response):
+    """Whether Aternos' answer to a confirm request says it went through: a 2xx JSON reply with success set
+
+    A 2xx HTML page (login or Cloudflare challenge) or {"success": false, ...} is not an accepted confirm.
+    """
+    if response is None or not 200 <= response.status_code < 300:
+        return False
     try:
-        players_list = getattr(aternos_server, 'players_list', None)
-        if players_list is not None:
-            if isinstance(players_list, list):
-                return len(players_list)
-            elif isinstance(players_list, (int, str)):
-                return int(players_list)
-        return 0
-    except Exception as e:
-        print(f"Error getting players online: {e}")
-        return 0
+        data = response.json()
+    except ValueError:
+        return False
+    return isinstance(data, dict) and bool(data.get('success'))
+
+async def send_confirm_request(aternos_server, endpoint):
+    """Send one confirm request through an endpoint; True if it was accepted"""
+    strategy, _, method = endpoint
+    if strategy == 'library':
+        # python-aternos raises on an error status and doesn't return the body
+        await aternos_confirm(aternos_server)
+        return True
+    atconn = aternos_server.atconn
+    confirm_url = endpoint_url(endpoint, getattr(aternos_server, 'servid', None))
+    if strategy == 'cloudflare':
+        response = await aternos_request(atconn, confirm_url, method, priority=PRIORITY_CONFIRM)
+    else:
+        response = await aternos_session_post(atconn, confirm_url, priority=PRIORITY_CONFIRM, data={}, timeout=10)
+    if not confirm_accepted(response):
+        print(f"   Confirm via {describe_endpoint(endpoint)} not accepted (HTTP {getattr(response, 'status_code', None)})")
+        return False
+    return True
+
+def private_server_copy(aternos_server):
+    """Copy of a server whose connection has its own CloudScraper and cookie jar
+
+    request_cloudflare() replaces the connection's session and edits its cookies, so requests that overlap
+    on one account each need their own. Take the copy while holding the account lock.
+    """
+    atconn = aternos_server.atconn
+    private_conn = copy.copy(atconn)
+    private_conn.session = cloudscraper.CloudScraper(captcha=getattr(atconn.session, 'captcha', {}))
+    private_conn.session.cookies.update(atconn.session.cookies)
+    private_server = copy.copy(aternos_server)
+    private_server.atconn = private_conn
+    return private_server
+
+# Hedged confirm: send this many of the best confirm strategies at once and keep the first success
+# (1 = try them one after another)
+CONFIRM_HEDGE_WIDTH = int(os.getenv('CONFIRM_HEDGE_WIDTH', 3))
+
+class ConfirmStats:
+    """Per-strategy confirm outcomes and latencies (request time, and time from detection to an accepted confirm)"""
+    def __init__(self):
+        self.strategies = {}  # strategy description -> counters
+    
+    def record(self, name, outcome, request_seconds=None, detect_seconds=None):
+        """outcome: 'won' (first accepted), 'accepted' (accepted after another won), 'failed' or 'cancelled'"""
+        entry = self.strategies.setdefault(name, {
+            'attempts': 0, 'won': 0, 'accepted': 0, 'failed': 0, 'cancelled': 0,
+            'request_total': 0.0, 'requests_timed': 0, 'detect_total': 0.0, 'detect_best': None
+        })
+        entry['attempts'] += 1
+        entry[outcome] += 1
+        if request_seconds is not None:
+            entry['request_total'] += request_seconds
+            entry['requests_timed'] += 1
+        if detect_seconds is not None:
+            entry['detect_total'] += detect_seconds
+            if entry['detect_best'] is None or detect_seconds < entry['detect_best']:
+                entry['detect_best'] = detect_seconds
+    
+    def describe(self):
+        if not self.strategies:
+            return 'Confirm strategies: no confirms yet'
+        lines = [f'Confirm strategies (hedge width {CONFIRM_HEDGE_WIDTH}):']
+        for name, entry in sorted(tuple(self.strategies.items()), key=lambda item: -item[1]['won']):
+            line = (f"  {name}: won {entry['won']}/{entry['attempts']}, accepted {entry['won'] + entry['accepted']}, "
+                    f"failed {entry['failed']}, cancelled {entry['cancelled']}")
+            if entry['requests_timed']:
+                line += f", request {entry['request_total'] / entry['requests_timed']:.2f}s avg"
+            if entry['won']:
+                line += f", detection to confirm {entry['detect_total'] / entry['won']:.2f}s avg / {entry['detect_best']:.2f}s best"
+            lines.append(line)
+        return '\n'.join(lines)
+
+confirm_stats = ConfirmStats()
+
+async def hedged_confirm(aternos_server, endpoints, label, detected_at):
+    """Send confirms through several endpoints at once; the first accepted one wins and the rest are cancelled"""
+    server_id = getattr(aternos_server, 'servid', None)
+    print(f"   {label}Confirming via {', '.join(describe_endpoint(e, server_id) for e in endpoints)} at once...")
+    # Each request runs on a private copy of the connection, so they overlap without sharing session state
+    # (the copies are taken while no other call uses the account's session)
+    async with get_account_lock(_server_conn(aternos_server)):
+        copies = [private_server_copy(aternos_server) for _ in endpoints]
+    started = time.time()
+    tasks = {
+        asyncio.ensure_future(send_confirm_request(private_server, endpoint)): endpoint
+        for private_server, endpoint in zip(copies, endpoints)
+    }
+    pending = set(tasks)
+    winner = None
+    last_error = None
+    try:
+        while pending and winner is None:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            now = time.time()
+            for task in done:
+                endpoint = tasks[task]
+                name = describe_endpoint(endpoint)
+                try:
+                    accepted = task.result()
+                except Exception as e:
+                    print(f"   {describe_endpoint(endpoint, server_id)} failed: {e}")
+                    accepted = False
+                    last_error = e
+                if not accepted:
+                    endpoint_registry.record_failure('confirm', endpoint)
+                    confirm_stats.record(name, 'failed', now - started)
+                elif winner is None:
+                    winner = endpoint
+                    endpoint_registry.record_success('confirm', endpoint)
+                    confirm_stats.record(name, 'won', now - started, now - detected_at)
+                    print(f"   ✅ Confirm accepted via {describe_endpoint(endpoint, server_id)} "
+                          f"({now - detected_at:.2f}s after detection)")
+                else:
+                    confirm_stats.record(name, 'accepted', now - started)
+    finally:
+        # A cancelled request's thread still finishes; a second confirm of the same server is harmless
+        for task in pending:
+            task.cancel()
+            confirm_stats.record(describe_endpoint(tasks[task]), 'cancelled')
+    return winner is not None, last_error
+
+async def attempt_confirm(aternos_server, label='', detected_at=None):
+    """Try the confirm endpoints once, last known-good first; returns (success, last_error)
+
+    The best CONFIRM_HEDGE_WIDTH endpoints are tried at once, the others one by one if they all fail.
+    detected_at is when the need to confirm was noticed (for the latency stats).
+    """
+    server_id = getattr(aternos_server, 'servid', None)
+    detected_at = detected_at or time.time()
+    last_error = None
+    endpoints = [
+        endpoint for endpoint in endpoint_registry.ordered('confirm', CONFIRM_ENDPOINTS)
+        if endpoint_available(aternos_server, endpoint)
+    ]
+    if CONFIRM_HEDGE_WIDTH > 1 and len(endpoints) > 1 and hasattr(aternos_server, 'atconn'):
+        success, last_error = await hedged_confirm(aternos_server, endpoints[:CONFIRM_HEDGE_WIDTH], label, detected_at)
+        if success:
+            return True, None
+        endpoints = endpoints[CONFIRM_HEDGE_WIDTH:]
+    for endpoint in endpoints:
+        description = describe_endpoint(endpoint, server_id)
+        started = time.time()
+        try:
+            print(f"   {label}Trying {description}...")
+            if await send_confirm_request(aternos_server, endpoint):
+                now = time.time()
+                endpoint_registry.record_success('confirm', endpoint)
+                confirm_stats.record(describe_endpoint(endpoint), 'won', now - started, now - detected_at)
+                print(f"   ✅ Confirm accepted via {description}")
+                return True, None
+            endpoint_registry.record_failure('confirm', endpoint)
+            confirm_stats.record(describe_endpoint(endpoint), 'failed', time.time() - started)
+        except Exception as e:
+            print(f"   {description} failed: {e}")
+            endpoint_registry.record_failure('confirm', endpoint)
+            confirm_stats.record(describe_endpoint(endpoint), 'failed', time.time() - started)
+            last_error = e
+    return False, last_error
+
+# Automatic confirmation by the monitor jobs: attempts per detection, one per step, the next one
+# AUTO_CONFIRM_BACKOFF * attempt seconds later (2s, 4s, 6s, 8s)
+AUTO_CONFIRM_ATTEMPTS = 5
+AUTO_CONFIRM_BACKOFF = 2
+
+async def relogin_for_confirm(guild_id, aternos_server):
+    """Log the guild's account in again and fetch the status with the new session"""
+    await connect_to_aternos(guild_id, force_login=True)
+    aternos_server = server_servers.get(str(guild_id)) or aternos_server
+    await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
+    return aternos_server
+
+async def auto_confirm_attempt(guild_id, aternos_server, attempt, detected_at):
+    """One automatic confirm attempt; returns (success, server object to use from now on)
+
+    A failed status fetch or a token error logs in again, so the next attempt has a fresh session.
+    """
+    try:
+        # Refresh server status and re-authenticate if needed
+        try:
+            await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
+        except Exception:
+            print("   Fetch failed, re-authenticating...")
+            aternos_server = await relogin_for_confirm(guild_id, aternos_server)
+        
+        success, confirm_err = await attempt_confirm(aternos_server, f"Attempt {attempt}/{AUTO_CONFIRM_ATTEMPTS}: ", detected_at)
+        if success:
+            return True, aternos_server
+        
+        # If it's a token error, re-authenticate before the next attempt
+        error_str = str(confirm_err) if confirm_err else ''
+        if '400' in error_str or '401' in error_str or 'token' in error_str.lower():
+            print("   Token error detected, re-authenticating...")
+            aternos_server = await relogin_for_confirm(guild_id, aternos_server)
+    except Exception as confirm_error:
+        print(f"   Error in auto-confirm attempt {attempt}: {confirm_error}")
+        import traceback
+        traceback.print_exc()
+    return False, aternos_server
+
+def parse_queue_api_data(api_data):
+    """Parse a queue.php response (JSON dict or text) into (position, max_position, seconds)"""
+    position = None
+    max_position = None
+    seconds = None
+    
+    if isinstance(api_data, dict):
+        # Try different possible keys for position
+        for pos_key in ['position', 'pos', 'queue_pos', 'queue_position', 'current', 'now']:
+            pos_val = api_data.get(pos_key)
+            if isinstance(pos_val, (int, str)) and str(pos_val).isdigit():
+                position = int(pos_val)
+                break
+        
+        # Try different possible keys for max position
+        for max_key in ['max', 'max_position', 'total', 'queue_max', 'max_queue']:
+            max_val = api_data.get(max_key)
+            if isinstance(max_val, (int, str)) and str(max_val).isdigit():
+                max_position = int(max_val)
+                break
+        
+        # Try different possible keys for time
+        for time_key in ['time', 'wait', 'eta', 'estimated', 'estimate', 'wait_time', 'queue_time']:
+            time_val = api_data.get(time_key)
+            if isinstance(time_val, (int, float)):
+                seconds = int(time_val)
+                break
+            elif isinstance(time_val, str):
+                # Try to parse time string like "8 min" or "480"
+                numbers = re.findall(r'\d+', time_val)
+                if numbers:
+                    num = int(numbers[0])
+                    seconds = num * 60 if 'min' in time_val.lower() else num
+                    break
+    elif isinstance(api_data, str):
+        # Look for position pattern like "3573 / 3852" or "3573/3852"
+        pos_match = re.search(r'(\d+)\s*[/]\s*(\d+)', api_data)
+        if pos_match:
+            position = int(pos_match.group(1))
+            max_position = int(pos_match.group(2))
+        
+        # Look for time pattern like "ca. 8 min" or "8 min"
+        time_match = re.search(r'(\d+)\s*min', api_data, re.IGNORECASE)
+        if time_match:
+            seconds = int(time_match.group(1)) * 60
+    
+    return position, max_position, seconds
+
+async def fetch_queue_api(aternos_server):
+    """Query queue.php through the last known-good endpoint; returns parsed (position, max_position, seconds)"""
+    server_id = getattr(aternos_server, 'servid', None)
+    for endpoint in endpoint_registry.ordered('queue_api', QUEUE_API_ENDPOINTS):
+        if not endpoint_available(aternos_server, endpoint):
+            continue
+        queue_url = endpoint_url(endpoint, server_id)
+        try:
+            if endpoint[0] == 'cloudflare':
+                response = await aternos_request(aternos_server.atconn, queue_url, 'GET', priority=PRIORITY_BACKGROUND)
+            else:
+                response = await aternos_session_get(aternos_server.atconn, queue_url, priority=PRIORITY_BACKGROUND)
+            if response.status_code != 200:
+                endpoint_registry.record_failure('queue_api', endpoint)
+                continue
+            try:
+                api_data = response.json()
+            except ValueError:
+                api_data = response.text
+            print(f"Queue API response: {api_data}")
+            endpoint_registry.record_success('queue_api', endpoint)
+            return parse_queue_api_data(api_data)
+        except Exception as e:
+            endpoint_registry.record_failure('queue_api', endpoint)
+            error_str = str(e)
+            # Don't spam console with 503 errors
+            if '503' not in error_str and 'Service Unavailable' not in error_str:
+                print(f"Error fetching queue API ({describe_endpoint(endpoint, server_id)}): {e}")
+    return None, None, None
 
 async def extend_server_time(aternos_server):
-    """Extend server time by clicking the extend button"""
+    """Extend server time by clicking the extend button (last known-good endpoint first)"""
     try:
         if hasattr(aternos_server, 'atconn') and hasattr(aternos_server, 'servid'):
             atconn = aternos_server.atconn
             server_id = aternos_server.servid
             
-            # Try multiple extend endpoints
-            extend_urls = [
-                'https://aternos.org/ajax/server/extend',
-                f'https://aternos.org/ajax/server/extend?id={server_id}',
-                'https://aternos.org/panel/ajax/extend.php',
-                f'https://aternos.org/panel/ajax/extend.php?id={server_id}',
-            ]
-            
-            if hasattr(atconn, 'request_cloudflare'):
-                for extend_url in extend_urls:
-                    try:
-                        # Try POST request to extend endpoint
-                        print(f"   Trying POST to {extend_url}...")
-                        response = atconn.request_cloudflare(extend_url, 'POST')
+            for endpoint in endpoint_registry.ordered('extend', EXTEND_ENDPOINTS):
+                if not endpoint_available(aternos_server, endpoint):
+                    continue
+                strategy, _, method = endpoint
+                extend_url = endpoint_url(endpoint, server_id)
+                try:
+                    print(f"   Trying {method} to {extend_url} ({strategy})...")
+                    extended = False
+                    if strategy == 'cloudflare':
+                        response = await aternos_request(atconn, extend_url, method, priority=PRIORITY_ACTION)
                         if response is not None:
+                            if method == 'GET':
+                                extended = True
                             # Check if response indicates success
-                            if isinstance(response, dict):
-                                if response.get('status') == 'success' or 'success' in str(response).lower():
-                                    print(f"✅✅✅ Server time extended successfully via {extend_url}!")
-                                    return True
+                            elif isinstance(response, dict):
+                                extended = response.get('status') == 'success' or 'success' in str(response).lower()
                             elif isinstance(response, str):
-                                if 'success' in response.lower() or 'ok' in response.lower():
-                                    print(f"✅✅✅ Server time extended successfully via {extend_url}!")
-                                    return True
+                                extended = 'success' in response.lower() or 'ok' in response.lower()
                             else:
                                 # Any response is likely success
-                                print(f"✅✅✅ Server time extended successfully via {extend_url}!")
-                                return True
-                    except Exception as post_err:
-                        print(f"   POST to {extend_url} failed: {post_err}")
-                        # Try GET as fallback
-                        try:
-                            response = atconn.request_cloudflare(extend_url, 'GET')
-                            if response is not None:
-                                print(f"✅✅✅ Server time extended successfully via {extend_url} (GET)!")
-                                return True
-                        except Exception as get_err:
-                            print(f"   GET to {extend_url} also failed: {get_err}")
-                            continue
-            
-            # Try direct session POST
-            if hasattr(atconn, 'session'):
-                session = atconn.session
-                import requests
-                if isinstance(session, requests.Session):
-                    for extend_url in extend_urls:
-                        try:
-                            loop = asyncio.get_event_loop()
-                            response = await loop.run_in_executor(None, lambda: session.post(extend_url, data={}, timeout=10))
-                            if response.status_code in [200, 201]:
-                                print(f"✅✅✅ Server time extended successfully via {extend_url} (direct POST)!")
-                                return True
-                        except Exception as session_err:
-                            print(f"   Direct session POST to {extend_url} failed: {session_err}")
-                            continue
+                                extended = True
+                    else:
+                        response = await aternos_session_post(atconn, extend_url, priority=PRIORITY_ACTION, data={}, timeout=10)
+                        extended = response.status_code in [200, 201]
+                    
+                    if extended:
+                        endpoint_registry.record_success('extend', endpoint)
+                        print(f"✅✅✅ Server time extended successfully via {extend_url} ({strategy} {method})!")
+                        return True
+                    endpoint_registry.record_failure('extend', endpoint)
+                except Exception as extend_err:
+                    endpoint_registry.record_failure('extend', endpoint)
+                    print(f"   {method} to {extend_url} failed: {extend_err}")
     except Exception as e:
         print(f"Error extending server time: {e}")
         import traceback
@@ -1471,304 +2949,653 @@ async def extend_server_time(aternos_server):
     
     return False
 
-async def monitor_auto_start(guild_id):
-    """Background task to monitor server and auto-start if it goes offline"""
-    print(f"🔄 Auto-start monitoring started for guild {guild_id}")
-    last_status = None
+# All monitors run as jobs on one scheduler instead of one sleeping task each
+SCHEDULER_WORKERS = int(os.getenv('SCHEDULER_WORKERS', 32))  # checks allowed to run at the same time
+SCHEDULER_JITTER = float(os.getenv('SCHEDULER_JITTER', 0.1))  # +/- fraction added to every delay
+
+class MonitorJob:
+    """A periodic check; step() returns seconds until the next run, or None when the job is finished"""
+    registry = None  # Dict (guild id -> job) the job is listed in
+    jitter = True  # Spread the job's runs a little (off for jobs that must run on time)
+    
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+        self.key = str(guild_id)
+        self.deadline = None
+        self.running = None  # Task of the step in progress
+        self.watching = None  # Server key whose status pushes wake this job
+        self.finished = False
+        self.cancelled = False
+    
+    async def step(self):
+        raise NotImplementedError
+    
+    def done(self):
+        return self.finished or self.cancelled
+    
+    def cancel(self):
+        """Stop the job (interrupting a running step)"""
+        if self.done():
+            return
+        self.cancelled = True
+        if self.running is not None:
+            self.running.cancel()
+        self.unregister()
+        monitor_scheduler.discard(self)
+    
+    def unregister(self):
+        """Remove the job from its registry, unless a newer job already replaced it"""
+        if self.registry is not None and self.registry.get(self.key) is self:
+            del self.registry[self.key]
+    
+    def watch(self, aternos_server):
+        """Run the next step early when Aternos pushes a status for this server"""
+        monitor_scheduler.watch(self, server_key(aternos_server))
+
+class MonitorScheduler:
+    """Min-heap of job deadlines worked by a bounded number of concurrent steps"""
+    def __init__(self, workers=SCHEDULER_WORKERS, jitter=SCHEDULER_JITTER):
+        self.workers = workers
+        self.jitter = jitter
+        self.heap = []  # (deadline, seq, job)
+        self.seq = itertools.count()
+        self.jobs = set()
+        self.watchers = {}  # server key -> set of jobs
+        self.slots = None
+        self.wakeup = None
+        self.runner = None
+        self.steps = 0
+        self.max_lateness = 0.0
+        self.total_lateness = 0.0
+    
+    def add(self, job, delay=0.0):
+        """Start running a job"""
+        self.jobs.add(job)
+        self.schedule(job, delay)
+        return job
+    
+    def schedule(self, job, delay):
+        if self.jitter and job.jitter and delay > 0:
+            delay *= 1 + random.uniform(-self.jitter, self.jitter)
+        job.deadline = asyncio.get_running_loop().time() + delay
+        heapq.heappush(self.heap, (job.deadline, next(self.seq), job))
+        self._kick()
+    
+    def wake(self, key):
+        """Run every idle job watching this server now"""
+        now = asyncio.get_running_loop().time()
+        for job in list(self.watchers.get(key, ())):
+            if job.running is None and not job.done() and job.deadline is not None and job.deadline > now:
+                job.deadline = now
+                heapq.heappush(self.heap, (now, next(self.seq), job))
+        self._kick()
+    
+    def watch(self, job, key):
+        if job.watching == key:
+            return
+        self._unwatch(job)
+        job.watching = key
+        self.watchers.setdefault(key, set()).add(job)
+    
+    def _unwatch(self, job):
+        jobs = self.watchers.get(job.watching)
+        if jobs is not None:
+            jobs.discard(job)
+            if not jobs:
+                del self.watchers[job.watching]
+        job.watching = None
+    
+    def discard(self, job):
+        """Forget a finished or cancelled job (its heap entries are skipped when they come up)"""
+        self.jobs.discard(job)
+        self._unwatch(job)
+    
+    def _kick(self):
+        if self.wakeup is None:
+            self.wakeup = asyncio.Event()
+            self.slots = asyncio.Semaphore(self.workers)
+        self.wakeup.set()
+        if self.runner is None or self.runner.done():
+            self.runner = asyncio.ensure_future(self._run())
+    
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            # Drop entries of jobs that were rescheduled, woken, are running or finished
+            while self.heap:
+                deadline, _, job = self.heap[0]
+                if job.done() or job.running is not None or job.deadline != deadline:
+                    heapq.heappop(self.heap)
+                    continue
+                break
+            if not self.heap:
+                return
+            delay = self.heap[0][0] - loop.time()
+            if delay > 0:
+                self.wakeup.clear()
+                try:
+                    await asyncio.wait_for(self.wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.slots.acquire()
+            deadline, _, job = heapq.heappop(self.heap)
+            if job.done() or job.running is not None or job.deadline != deadline:
+                self.slots.release()
+                continue
+            lateness = loop.time() - deadline
+            self.steps += 1
+            self.total_lateness += lateness
+            self.max_lateness = max(self.max_lateness, lateness)
+            job.running = asyncio.ensure_future(self._step(job))
+    
+    async def _step(self, job):
+        delay = None
+        try:
+            delay = await job.step()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            print(f'❌ Error in {type(job).__name__} for guild {job.guild_id}: {e}')
+            import traceback
+            traceback.print_exc()
+            delay = 60
+        finally:
+            job.running = None
+            self.slots.release()
+        if job.cancelled:
+            return
+        if delay is None:
+            job.finished = True
+            job.unregister()
+            self.discard(job)
+            return
+        self.schedule(job, delay)
+    
+    def describe(self):
+        """Plain-text stats for !debug and the health endpoint"""
+        running = sum(1 for job in tuple(self.jobs) if job.running is not None)
+        avg_lateness = self.total_lateness / self.steps if self.steps else 0.0
+        return (f'Monitor jobs: {len(self.jobs)} ({running} running, max {self.workers} at once), '
+                f'steps run: {self.steps}, lateness avg {avg_lateness:.2f}s / max {self.max_lateness:.2f}s')
+
+monitor_scheduler = MonitorScheduler()
+
+class IdleReleaseJob(MonitorJob):
+    """Periodically releases the sessions of idle guilds (lazy mode)"""
+    def __init__(self):
+        super().__init__('idle-release')
+    
+    async def step(self):
+        release_idle_guilds()
+        return IDLE_CHECK_INTERVAL
+
+idle_release_job = None
+
+# The health page text is built on the event loop, where the stats it shows change, and only read by the
+# HTTP thread (iterating the loop's sets and dicts from there can fail mid-change)
+HEALTH_REPORT_INTERVAL = 5
+
+def build_health_report():
+    return ('🤖 Aternos Discord Bot is running!\n\n' + describe_startup() + '\n' + aternos_limiter.describe() + '\n'
+            + monitor_scheduler.describe() + '\n' + confirm_stats.describe() + '\n' + discord_outbox.describe())
+
+health_report = '🤖 Aternos Discord Bot is running!\n\n' + describe_startup()
+
+class HealthReportJob(MonitorJob):
+    """Rebuilds the health page text"""
+    def __init__(self):
+        super().__init__('health-report')
+    
+    async def step(self):
+        global health_report
+        health_report = build_health_report()
+        return HEALTH_REPORT_INTERVAL
+
+health_report_job = None
+
+# Read-only JSON status API (/api/status, /api/status/<guild id>) on the health server. Off unless enabled:
+# it publishes every guild's server name, address and player names to anyone who can reach the port
+STATUS_API = os.getenv('STATUS_API', 'false').lower() in ('1', 'true', 'yes', 'on')
+STATUS_API_INTERVAL = float(os.getenv('STATUS_API_INTERVAL', 2))  # Seconds between rebuilds from memory
+
+class StatusFeed:
+    """JSON documents of every guild's last known server state, built on the event loop from cached
+    snapshots and read by the HTTP thread (readers never cause Aternos or Discord requests)"""
+    def __init__(self):
+        self.payloads = {}  # guild key -> payload of the last build, to skip rebuilding unchanged documents
+        # path -> (body, etag); replaced as a whole, never changed in place, so the HTTP thread can read it
+        self.documents = {'/api/status': self.encode({'guilds': []})}
+    
+    @staticmethod
+    def encode(payload):
+        body = json.dumps(payload, sort_keys=True).encode('utf-8')
+        return body, '"' + hashlib.sha1(body).hexdigest() + '"'
+    
+    def guild_payload(self, guild_key, aternos_server):
+        snapshot = snapshot_of(aternos_server)
+        guild = bot.get_guild(int(guild_key)) if guild_key.isdigit() else None
+        queue = None
+        if snapshot.queue_position is not None and snapshot.queue_position > 0:
+            # The model's estimate once it has learned a rate, Aternos' own until then
+            eta_seconds = queue_drain_model.seconds_until(snapshot.queue_position, key=server_key(aternos_server))
+            queue = {
+                'position': snapshot.queue_position,
+                'count': snapshot.queue_count,
+                'eta': format_eta(eta_seconds) if eta_seconds is not None else snapshot.queue_eta,
+                'eta_seconds': round(eta_seconds) if eta_seconds is not None else None,
+            }
+        return {
+            'guild_id': guild_key,
+            'guild_name': guild.name if guild is not None else None,
+            'address': snapshot.info.get('displayAddress'),
+            'status': snapshot.status,
+            'players': snapshot.players,
+            'players_list': list(snapshot.players_list),
+            'max_players': as_int(snapshot.info.get('slots')),
+            'queue': queue,
+            'countdown': snapshot.countdown,  # Seconds left as of updated_at
+            'needs_confirm': snapshot.needs_confirm,
+            'updated_at': int(snapshot.fetched_at),
+        }
+    
+    def publish(self):
+        """Rebuild the documents from the servers' current snapshots"""
+        guilds = {}
+        for guild_key, aternos_server in list(server_servers.items()):
+            if isinstance(getattr(aternos_server, '_info', None), dict):
+                guilds[guild_key] = self.guild_payload(guild_key, aternos_server)
+        if guilds == self.payloads:
+            return
+        documents = {'/api/status': self.encode({'guilds': [guilds[key] for key in sorted(guilds)]})}
+        for guild_key, payload in guilds.items():
+            if self.payloads.get(guild_key) == payload:
+                documents[f'/api/status/{guild_key}'] = self.documents[f'/api/status/{guild_key}']
+            else:
+                documents[f'/api/status/{guild_key}'] = self.encode(payload)
+        self.payloads = guilds
+        self.documents = documents
+    
+    def get(self, path):
+        """(body, etag) of a document, None if there is none"""
+        return self.documents.get(path.rstrip('/'))
+
+status_feed = StatusFeed()
+
+class StatusFeedJob(MonitorJob):
+    """Keeps the JSON status API up to date"""
+    def __init__(self):
+        super().__init__('status-api')
+    
+    async def step(self):
+        status_feed.publish()
+        return STATUS_API_INTERVAL
+
+status_feed_job = None
+
+# Polling presets (seconds); a guild picks one with !polling
+#   min/max: bounds for queue checks, lead: fraction of the expected time to confirmation to wait,
+#   starting: checks while the server boots, online/idle: checks while online/offline
+POLLING_PRESETS = {
+    'eco': {'min': 2, 'max': 120, 'lead': 0.5, 'starting': 5, 'online': 60, 'idle': 30},
+    'balanced': {'min': 1, 'max': 60, 'lead': 0.3, 'starting': 2, 'online': 30, 'idle': 5},
+    'fast': {'min': 1, 'max': 15, 'lead': 0.15, 'starting': 1, 'online': 10, 'idle': 2},
+}
+DEFAULT_POLLING_PRESET = os.getenv('DEFAULT_POLLING_PRESET', 'balanced')
+# Queue positions at or below this may need confirmation any moment, so they get the minimum interval
+CONFIRM_ZONE_POSITION = 5
+# Countdown (seconds) below which the auto-extend check extends the server
+EXTEND_THRESHOLD = 60
+# Extend this many seconds after the button should have appeared (the countdown is read with some delay)
+EXTEND_FIRE_MARGIN = 2
+EXTEND_VERIFY_DELAY = 3  # Seconds for Aternos to update the countdown before checking an extend worked
+EXTEND_RETRY_DELAY = 5
+EXTEND_MAX_ATTEMPTS = 5  # Unconfirmed extends in a row before the timer gives up
+# Assumed queue speed (positions per second) for poll timing until the model has learned one
+DEFAULT_QUEUE_VELOCITY = 1.0
+
+# Learned queue speed, persisted across restarts
+QUEUE_MODEL_FILE = 'queue_model.json'
+QUEUE_MODEL_ALPHA = float(os.getenv('QUEUE_MODEL_ALPHA', 0.2))  # EWMA weight of a new sample
+QUEUE_SAMPLE_SECONDS = 10  # Minimum time between two samples of one server
+QUEUE_SAMPLE_MAX_GAP = 600  # Samples further apart than this belong to different queues
+QUEUE_MODEL_SAVE_INTERVAL = 60
+MIN_QUEUE_VELOCITY = 0.01  # Positions per second; keeps a stalled queue from predicting forever
+
+class QueueDrainModel:
+    """Learns how fast Aternos queues drain (positions per second), by hour of day, from every server we watch"""
+    def __init__(self, path=QUEUE_MODEL_FILE, alpha=QUEUE_MODEL_ALPHA):
+        self.path = path
+        self.alpha = alpha
+        self.hours = {}  # '0'..'23' -> {'rate': float, 'samples': int}
+        self.global_rate = None
+        self.last_seen = {}  # server key -> (time, position, count)
+        self.server_rates = {}  # server key -> rate in its current queue
+        self.saved_at = 0.0
+        self.dirty = False
+        self.load()
+    
+    def _ewma(self, old, new):
+        return new if old is None else old + self.alpha * (new - old)
+    
+    def observe(self, key, position, count=None, now=None):
+        """Feed a (time, position, count) sample of one server"""
+        now = now or time.time()
+        previous = self.last_seen.get(key)
+        if previous is None or position > previous[1] or now - previous[0] > QUEUE_SAMPLE_MAX_GAP:
+            # First sample, or requeued: start over for this server
+            self.last_seen[key] = (now, position, count)
+            self.server_rates.pop(key, None)
+            return
+        elapsed = now - previous[0]
+        if elapsed < QUEUE_SAMPLE_SECONDS:
+            return
+        rate = (previous[1] - position) / elapsed
+        self.last_seen[key] = (now, position, count)
+        self.server_rates[key] = self._ewma(self.server_rates.get(key), rate)
+        bucket = self.hours.setdefault(str(time.localtime(now).tm_hour), {'rate': None, 'samples': 0})
+        bucket['rate'] = self._ewma(bucket['rate'], rate)
+        bucket['samples'] += 1
+        self.global_rate = self._ewma(self.global_rate, rate)
+        self.dirty = True
+        if now - self.saved_at >= QUEUE_MODEL_SAVE_INTERVAL:
+            self.save()
+    
+    def observe_server(self, aternos_server):
+        """Feed the queue position from a server's current status, if it is queueing"""
+        info_data = getattr(aternos_server, '_info', None)
+        if not isinstance(info_data, dict) or not isinstance(info_data.get('queue'), dict):
+            return
+        position = info_data['queue'].get('position')
+        if isinstance(position, int) and position > 0:
+            self.observe(server_key(aternos_server), position, info_data['queue'].get('count'))
+    
+    def forget(self, key):
+        """The server left the queue"""
+        self.last_seen.pop(key, None)
+        self.server_rates.pop(key, None)
+    
+    def velocity(self, key=None, now=None):
+        """Expected positions per second for a server right now (None until a rate has been learned)"""
+        bucket = self.hours.get(str(time.localtime(now or time.time()).tm_hour))
+        learned = bucket['rate'] if bucket and bucket['samples'] >= 3 else self.global_rate
+        own = self.server_rates.get(key)
+        if own is not None and learned is not None:
+            # The server's own queue counts most, the hour-of-day history smooths it
+            rate = 0.7 * own + 0.3 * learned
+        elif own is not None:
+            rate = own
+        elif learned is not None:
+            rate = learned
+        else:
+            return None
+        return max(MIN_QUEUE_VELOCITY, rate)
+    
+    def seconds_until(self, position, target=1, key=None):
+        """Predicted seconds until a server at this position reaches the target position (None if unknown)"""
+        rate = self.velocity(key)
+        if rate is None:
+            return None
+        return max(0, position - target) / rate
+    
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r') as f:
+                data = json.load(f)
+            self.hours = data.get('hours', {})
+            self.global_rate = data.get('global_rate')
+        except (OSError, ValueError) as e:
+            print(f'⚠️ Could not read queue model, starting fresh: {e}')
+    
+    def save(self):
+        """Write the model on the settings writer thread (in order with other saves, off the event loop)"""
+        if not self.dirty:
+            return
+        text = json.dumps({'hours': self.hours, 'global_rate': self.global_rate}, indent=2)
+        self.dirty = False
+        self.saved_at = time.time()
+        settings_store.writer.submit(self._write, text)
+    
+    def _write(self, text):
+        try:
+            with open(self.path + '.tmp', 'w') as f:
+                f.write(text)
+            os.replace(self.path + '.tmp', self.path)
+        except OSError as e:
+            self.dirty = True
+            print(f'⚠️ Could not save queue model: {e}')
+
+def format_eta(seconds):
+    """'ca. N min' like the Aternos panel (at least 1 min)"""
+    return f"ca. {max(1, round(seconds / 60))} min"
+
+queue_drain_model = QueueDrainModel()
+
+class PollingPolicy:
+    """Picks the delay until a guild's next status check from status, queue position and speed, and countdown"""
+    def __init__(self, guild_id):
+        self.guild_id = guild_id
+    
+    @property
+    def preset(self):
+        return POLLING_PRESETS.get(get_polling_preset(self.guild_id), POLLING_PRESETS['balanced'])
+    
+    def next_delay(self, status, position=None, key=None):
+        """Seconds until the next check"""
+        preset = self.preset
+        if status in ('waiting', 'queueing') or position is not None:
+            if position is None or position <= CONFIRM_ZONE_POSITION:
+                return preset['min']
+            # Sleep part of the predicted time until confirmation can be needed
+            seconds_to_confirm = queue_drain_model.seconds_until(position, CONFIRM_ZONE_POSITION, key)
+            if seconds_to_confirm is None:
+                seconds_to_confirm = max(0, position - CONFIRM_ZONE_POSITION) / DEFAULT_QUEUE_VELOCITY
+            return min(preset['max'], max(preset['min'], seconds_to_confirm * preset['lead']))
+        if status in ('starting', 'loading', 'preparing', 'loading_preparing', 'saving', 'stopping'):
+            return preset['starting']
+        if status == 'online':
+            # The extend timer wakes up on its own when the countdown runs low
+            return preset['online']
+        return preset['idle']
+
+def describe_polling(guild_id):
+    """How often a guild's server is checked, from its polling preset"""
+    name = get_polling_preset(guild_id)
+    values = PollingPolicy(guild_id).preset
+    if name not in POLLING_PRESETS:
+        name = 'balanced'
+    return (f"Checking with the `{name}` polling preset: every {values['idle']}s while offline, "
+            f"{values['online']}s while online, {values['min']}-{values['max']}s in the queue "
+            f"(more often near confirmation). Change it with `!polling`.")
+
+def queue_position_of(aternos_server, fallback=None):
+    """Numeric queue position from the server's status (or from a "pos / max" string)"""
+    position = snapshot_of(aternos_server).queue_position
+    if position is not None and position > 0:
+        return position
+    if fallback is not None:
+        match = re.match(r'\s*(\d+)', str(fallback))
+        if match:
+            return int(match.group(1))
+    return None
+
+class ExtendJob(MonitorJob):
+    """Sleeps until a server's extend button appears (from its countdown), extends then and checks it worked"""
+    registry = extend_jobs
+    jitter = False
+    
+    def __init__(self, guild_id, aternos_server):
+        super().__init__(guild_id)
+        self.aternos_server = aternos_server
+        self.pending = None  # (seconds left when extended, endpoint used) until the next status confirms it
+        self.attempts = 0
+    
+    async def seconds_left(self, aternos_server, snapshot, fresh=False):
+        """Seconds left on the countdown: from the status, else from the panel page"""
+        if snapshot.countdown_remaining is not None:
+            return snapshot.countdown_remaining
+        panel = await get_panel_snapshot(aternos_server, 0 if fresh else PANEL_SNAPSHOT_TTL)
+        if panel is None:
+            return None
+        if panel.countdown_seconds is not None:
+            return panel.countdown_seconds - panel.age
+        if panel.extend_button_exists:
+            return EXTEND_THRESHOLD
+        return None
+    
+    async def step(self):
+        guild_id = self.guild_id
+        aternos_server = server_servers.get(self.key) or self.aternos_server
+        if not get_auto_start_enabled(guild_id):
+            return None
+        if self.pending is not None:
+            # Confirm the extend from the next status
+            await aternos_fetch(aternos_server)
+        snapshot = snapshot_of(aternos_server)
+        if snapshot.status != 'online' or snapshot.players:
+            print(f"⏹️ Extend timer for guild {guild_id} stopped (status {snapshot.status}, {snapshot.players} player(s) online)")
+            return None
+        remaining = await self.seconds_left(aternos_server, snapshot, fresh=self.pending is not None)
+        
+        if self.pending is not None:
+            before, endpoint = self.pending
+            self.pending = None
+            if remaining is not None and remaining > before:
+                print(f"✅ Server time extended for guild {guild_id} ({remaining:.0f}s left)")
+                self.attempts = 0
+            else:
+                print(f"⚠️ Extend for guild {guild_id} was accepted but the countdown didn't go up")
+                if endpoint is not None:
+                    endpoint_registry.record_failure('extend', endpoint)
+                if self.attempts >= EXTEND_MAX_ATTEMPTS:
+                    print(f"❌ Giving up extending guild {guild_id} after {self.attempts} attempts")
+                    return None
+        
+        if remaining is None:
+            print(f"ℹ️ No countdown for guild {guild_id}, extend timer not armed")
+            return None
+        if remaining > EXTEND_THRESHOLD:
+            delay = remaining - EXTEND_THRESHOLD + EXTEND_FIRE_MARGIN
+            print(f"⏲️ Extend timer for guild {guild_id}: {remaining:.0f}s left, extending in {delay:.0f}s")
+            return delay
+        
+        print(f"🚨 Extending server time for guild {guild_id} ({remaining:.0f}s left)...")
+        self.attempts += 1
+        if await extend_server_time(aternos_server):
+            self.pending = (remaining, endpoint_registry.last_success.get('extend'))
+            return EXTEND_VERIFY_DELAY
+        if self.attempts >= EXTEND_MAX_ATTEMPTS:
+            print(f"❌ Giving up extending guild {guild_id} after {self.attempts} attempts")
+            return None
+        print(f"⚠️ Failed to extend server time for guild {guild_id}, retrying in {EXTEND_RETRY_DELAY}s")
+        return EXTEND_RETRY_DELAY
+
+def arm_extend(guild_id, aternos_server):
+    """Start the extend timer of a guild's server, unless one is already armed"""
+    job = extend_jobs.get(str(guild_id))
+    if job is not None and not job.done():
+        return job
+    job = ExtendJob(guild_id, aternos_server)
+    extend_jobs[job.key] = job
+    return monitor_scheduler.add(job)
+
+class AutoStartJob(MonitorJob):
+    """Monitors a guild's server and auto-starts it if it goes offline"""
+    registry = auto_start_tasks
+    
+    def __init__(self, guild_id):
+        super().__init__(guild_id)
+        self.last_status = None
+        self.last_snapshot = None
+        self.last_extend_check = None
+        self.policy = PollingPolicy(guild_id)
+        self.confirm_attempts = 0  # Automatic confirm attempts since the confirmation was detected
+        self.confirm_detected_at = None
+        print(f"🔄 Auto-start monitoring started for guild {guild_id}")
     
-    while True:
+    async def step(self):
+        guild_id = self.guild_id
         try:
             # Check if auto-start is still enabled
             if not get_auto_start_enabled(guild_id):
                 print(f"⏸️ Auto-start disabled for guild {guild_id}, stopping monitor")
-                if str(guild_id) in auto_start_tasks:
-                    del auto_start_tasks[str(guild_id)]
+                self.unregister()
                 return
             
             # Get server
             aternos_server = server_servers.get(str(guild_id))
             if not aternos_server:
                 # Server not configured, wait longer before retry
-                await asyncio.sleep(60)
-                continue
+                return 60
+            
+            self.watch(aternos_server)
             
             try:
-                # Refresh server status
-                aternos_server.fetch()
-                current_status = aternos_server.status
+                # Refresh server status (shared with other guilds on the same account)
+                await refresh_guild_server(guild_id, aternos_server)
+                snapshot = snapshot_of(aternos_server)
+                current_status = snapshot.status
                 
                 # Only log status changes
-                if current_status != last_status:
+                if current_status != self.last_status:
                     print(f"📊 Server status for guild {guild_id}: {current_status}")
-                    last_status = current_status
+                    self.last_status = current_status
                 
                 # Check if server needs confirmation (works for any status, including "waiting")
-                confirm_needed = False
-                confirm_reason = None
-                
-                try:
-                    # Use the same comprehensive detection as monitor_queue
-                    if hasattr(aternos_server, '_info'):
-                        info_data = getattr(aternos_server, '_info')
-                        if isinstance(info_data, dict):
-                            # PRIMARY CHECK: queue.pending == 'pending'
-                            if 'queue' in info_data:
-                                queue_info = info_data.get('queue', {})
-                                if isinstance(queue_info, dict):
-                                    pending = queue_info.get('pending', '')
-                                    position = queue_info.get('position', None)
-                                    
-                                    # Most reliable indicator
-                                    if pending:
-                                        pending_lower = str(pending).lower()
-                                        if pending_lower == 'pending':
-                                            confirm_needed = True
-                                            confirm_reason = f"queue.pending='{pending}'"
-                                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                        elif 'confirm' in pending_lower:
-                                            confirm_needed = True
-                                            confirm_reason = f"queue.pending contains 'confirm': '{pending}'"
-                                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                    
-                                    # Position 1 or 0 means queue finished - ALWAYS needs confirmation
-                                    if not confirm_needed and position is not None and position <= 1:
-                                        # Position <= 1 means queue finished, needs confirmation
-                                        confirm_needed = True
-                                        confirm_reason = f"queue position={position} (queue finished)"
-                                        print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                    
-                                    # Also check if position is very low (2-5) and status is waiting
-                                    if not confirm_needed and position is not None and 2 <= position <= 5:
-                                        if current_status == 'waiting':
-                                            # Queue is almost done, check more frequently
-                                            print(f"🔍 Queue position is {position}, monitoring closely...")
-                            
-                            # Check label, class, lang
-                            if not confirm_needed:
-                                label = info_data.get('label', '')
-                                info_class = info_data.get('class', '')
-                                lang = info_data.get('lang', '')
-                                
-                                if label:
-                                    label_lower = str(label).lower()
-                                    if 'confirm' in label_lower:
-                                        confirm_needed = True
-                                        confirm_reason = f"label contains 'confirm': '{label}'"
-                                        print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                    elif 'pending' in label_lower and 'waiting' not in label_lower:
-                                        confirm_needed = True
-                                        confirm_reason = f"label contains 'pending': '{label}'"
-                                        print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                
-                                if not confirm_needed and info_class:
-                                    class_lower = str(info_class).lower()
-                                    if 'confirm' in class_lower or 'queueconfirm' in class_lower:
-                                        confirm_needed = True
-                                        confirm_reason = f"class contains 'confirm': '{info_class}'"
-                                        print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                    elif 'pending' in class_lower and 'queueing' not in class_lower:
-                                        confirm_needed = True
-                                        confirm_reason = f"class contains 'pending': '{info_class}'"
-                                        print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                            
-                            # Check status_num
-                            if not confirm_needed:
-                                status_num = info_data.get('status', None)
-                                if status_num is not None and status_num != 10:  # 10 = waiting
-                                    if 'queue' in info_data:
-                                        queue_info = info_data.get('queue', {})
-                                        if isinstance(queue_info, dict):
-                                            pending = queue_info.get('pending', '')
-                                            if pending and str(pending).lower() == 'pending':
-                                                confirm_needed = True
-                                                confirm_reason = f"status_num={status_num}, pending='{pending}'"
-                                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                    
-                    # Check css_class
-                    if not confirm_needed and hasattr(aternos_server, 'css_class'):
-                        css_class = str(aternos_server.css_class)
-                        css_class_lower = css_class.lower()
-                        if 'confirm' in css_class_lower or 'queueconfirm' in css_class_lower:
-                            if 'queueing' not in css_class_lower:
-                                confirm_needed = True
-                                confirm_reason = f"css_class='{css_class}'"
-                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                        elif 'pending' in css_class_lower:
-                            if css_class_lower != 'queueing' and 'queueing' not in css_class_lower:
-                                confirm_needed = True
-                                confirm_reason = f"css_class contains 'pending': '{css_class}'"
-                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                    
-                    # Check is_confirm_required
-                    if not confirm_needed and hasattr(aternos_server, 'is_confirm_required'):
-                        try:
-                            if aternos_server.is_confirm_required:
-                                confirm_needed = True
-                                confirm_reason = "is_confirm_required=True"
-                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                        except:
-                            pass
-                            
-                except Exception as check_error:
-                    print(f"⚠️ Error checking confirmation need: {check_error}")
-                    import traceback
-                    traceback.print_exc()
+                confirm_needed = snapshot.needs_confirm
+                confirm_reason = snapshot.confirm_reason
+                if confirm_needed:
+                    print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
+                elif snapshot.queue_position is not None and 2 <= snapshot.queue_position <= 5 and current_status == 'waiting':
+                    # Queue is almost done, check more frequently
+                    if snapshot != self.last_snapshot:
+                        print(f"🔍 Queue position is {snapshot.queue_position}, monitoring closely...")
+                self.last_snapshot = snapshot
                 
-                # If confirmation is needed, try to confirm automatically with retries
+                # If confirmation is needed, confirm automatically: one attempt per step, retried by later steps
                 if confirm_needed:
-                    print(f"🚨🚨🚨 CONFIRMATION REQUIRED - REASON: {confirm_reason} 🚨🚨🚨")
-                    print(f"🚀 Attempting AUTOMATIC confirmation for guild {guild_id} (no manual interaction needed)...")
-                    
-                    auto_confirm_success = False
-                    max_retries = 5  # Increased retries
-                    
-                    for retry in range(max_retries):
-                        try:
-                            # Refresh server status and re-authenticate if needed
-                            try:
-                                aternos_server.fetch()
-                            except:
-                                # If fetch fails, try re-authenticating
-                                print(f"   Fetch failed, re-authenticating...")
-                                await connect_to_aternos(guild_id)
-                                aternos_server = server_servers.get(str(guild_id))
-                                if aternos_server:
-                                    aternos_server.fetch()
-                            
-                            if hasattr(aternos_server, 'atconn'):
-                                atconn = aternos_server.atconn
-                                server_id = getattr(aternos_server, 'servid', None)
-                                
-                                # Method 1: Try library confirm() method FIRST (most reliable)
-                                if hasattr(aternos_server, 'confirm') and callable(aternos_server.confirm):
-                                    try:
-                                        print(f"   Attempt {retry + 1}/{max_retries}: Trying library confirm() method...")
-                                        aternos_server.confirm()
-                                        auto_confirm_success = True
-                                        print(f"✅✅✅ AUTO-CONFIRMED (library method) for guild {guild_id}!")
-                                        break
-                                    except Exception as lib_err:
-                                        error_str = str(lib_err)
-                                        print(f"   Library confirm() failed: {lib_err}")
-                                        # If it's a token error, try re-auth
-                                        if '400' in error_str or '401' in error_str or 'token' in error_str.lower():
-                                            print(f"   Token error detected, re-authenticating...")
-                                            await connect_to_aternos(guild_id)
-                                            aternos_server = server_servers.get(str(guild_id))
-                                            if aternos_server:
-                                                aternos_server.fetch()
-                                
-                                # Method 2: Try request_cloudflare with server ID
-                                if not auto_confirm_success and hasattr(atconn, 'request_cloudflare'):
-                                    try:
-                                        # Build confirm URL with server ID if available
-                                        if server_id:
-                                            confirm_url = f'https://aternos.org/ajax/server/confirm?id={server_id}'
-                                        else:
-                                            confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                        
-                                        print(f"   Attempt {retry + 1}/{max_retries}: Trying POST request to {confirm_url}...")
-                                        
-                                        # Try POST first (more reliable for confirmations)
-                                        try:
-                                            response = atconn.request_cloudflare(confirm_url, 'POST')
-                                            if response is not None:
-                                                auto_confirm_success = True
-                                                print(f"✅✅✅ AUTO-CONFIRMED (POST) for guild {guild_id}!")
-                                                break
-                                        except Exception as post_err:
-                                            print(f"   POST failed: {post_err}, trying GET...")
-                                            try:
-                                                response = atconn.request_cloudflare(confirm_url, 'GET')
-                                                if response is not None:
-                                                    auto_confirm_success = True
-                                                    print(f"✅✅✅ AUTO-CONFIRMED (GET) for guild {guild_id}!")
-                                                    break
-                                            except Exception as get_err:
-                                                print(f"   GET also failed: {get_err}")
-                                    
-                                    except Exception as cf_error:
-                                        print(f"   request_cloudflare failed: {cf_error}")
-                                
-                                # Method 3: Direct session POST with proper data
-                                if not auto_confirm_success and hasattr(atconn, 'session'):
-                                    try:
-                                        session = atconn.session
-                                        if server_id:
-                                            confirm_url = f'https://aternos.org/ajax/server/confirm?id={server_id}'
-                                        else:
-                                            confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                        
-                                        print(f"   Attempt {retry + 1}/{max_retries}: Trying direct session POST...")
-                                        
-                                        import requests
-                                        if isinstance(session, requests.Session):
-                                            loop = asyncio.get_event_loop()
-                                            # Try POST with empty data
-                                            response = await loop.run_in_executor(None, lambda: session.post(confirm_url, data={}, timeout=10))
-                                            if response.status_code in [200, 201]:
-                                                auto_confirm_success = True
-                                                print(f"✅✅✅ AUTO-CONFIRMED (direct POST) for guild {guild_id}!")
-                                                break
-                                    except Exception as session_err:
-                                        print(f"   Direct session POST failed: {session_err}")
-                            else:
-                                # No atconn, try library method directly
-                                if hasattr(aternos_server, 'confirm') and callable(aternos_server.confirm):
-                                    try:
-                                        print(f"   Attempt {retry + 1}/{max_retries}: Trying library confirm() method (no atconn)...")
-                                        aternos_server.confirm()
-                                        auto_confirm_success = True
-                                        print(f"✅✅✅ AUTO-CONFIRMED (library method) for guild {guild_id}!")
-                                        break
-                                    except Exception as lib_err:
-                                        print(f"   Library confirm() failed: {lib_err}")
-                            
-                            # If we got here and didn't succeed, wait before retry
-                            if not auto_confirm_success and retry < max_retries - 1:
-                                wait_time = (retry + 1) * 2  # Exponential backoff: 2s, 4s, 6s, 8s
-                                print(f"   Waiting {wait_time} seconds before retry...")
-                                await asyncio.sleep(wait_time)
-                                
-                        except Exception as confirm_error:
-                            print(f"   Error in auto-confirm attempt {retry + 1}: {confirm_error}")
-                            import traceback
-                            traceback.print_exc()
-                            if retry < max_retries - 1:
-                                wait_time = (retry + 1) * 2
-                                await asyncio.sleep(wait_time)
-                    
+                    if self.confirm_attempts == 0:
+                        print(f"🚨🚨🚨 CONFIRMATION REQUIRED - REASON: {confirm_reason} 🚨🚨🚨")
+                        print(f"🚀 Attempting AUTOMATIC confirmation for guild {guild_id} (no manual interaction needed)...")
+                        self.confirm_detected_at = snapshot.fetched_at
+                    self.confirm_attempts += 1
+                    auto_confirm_success, aternos_server = await auto_confirm_attempt(
+                        guild_id, aternos_server, self.confirm_attempts, self.confirm_detected_at
+                    )
                     if auto_confirm_success:
-                        # Confirmation successful - wait and check status
-                        print(f"✅ Confirmation sent! Checking server status...")
-                        await asyncio.sleep(3)
-                        try:
-                            aternos_server.fetch()
-                            new_status = aternos_server.status
-                            print(f"📡 Server status after confirmation: {new_status}")
-                        except:
-                            pass
-                        # Continue monitoring
-                        continue
-                    else:
-                        print(f"⚠️ All auto-confirmation attempts failed for guild {guild_id}, will retry on next check")
-                        # Continue monitoring - might succeed on next iteration
-                        continue
+                        self.confirm_attempts = 0
+                        print(f"✅✅✅ AUTO-CONFIRMED for guild {guild_id}!")
+                        # The next step checks the status after confirmation
+                        print("✅ Confirmation sent! Checking server status in 3 seconds...")
+                        return 3
+                    if self.confirm_attempts < AUTO_CONFIRM_ATTEMPTS:
+                        wait_time = self.confirm_attempts * AUTO_CONFIRM_BACKOFF
+                        print(f"   Waiting {wait_time} seconds before retry...")
+                        return wait_time
+                    self.confirm_attempts = 0
+                    print(f"⚠️ All auto-confirmation attempts failed for guild {guild_id}, will retry on next check")
+                    # Continue monitoring - might succeed on next iteration
+                    return 0
+                self.confirm_attempts = 0
                 
                 # If server is offline, start it automatically
-                if current_status == 'offline':
+                if current_status == 'offline' and not claim_account_start(guild_id):
+                    print(f"⏭️ Server is offline for guild {guild_id}, but another guild on the same account just started it")
+                elif current_status == 'offline':
                     print(f"🔴 Server is offline for guild {guild_id}, auto-starting...")
                     
                     try:
                         # Start the server
-                        aternos_server.start()
+                        await aternos_start(aternos_server)
                         print(f"✅ Auto-start command sent for guild {guild_id}")
                         
                         # Wait a bit for status to update
                         await asyncio.sleep(5)
                         
                         # Check if it's in queue or starting
-                        aternos_server.fetch()
+                        await aternos_fetch(aternos_server)
                         new_status = aternos_server.status
                         
                         if new_status in ['waiting', 'starting', 'loading', 'loading_preparing']:
@@ -1781,1187 +3608,424 @@ async def monitor_auto_start(guild_id):
                     except Exception as start_error:
                         print(f"❌ Error auto-starting server for guild {guild_id}: {start_error}")
                 
-                # Auto-extend: If server is online and no players, check countdown and extend if < 60 seconds
+                # Auto-extend: If server is online and no players, arm the extend timer for when the button appears
                 elif current_status == 'online':
-                    try:
-                        # Check if players are online
-                        players_online = get_players_online(aternos_server)
-                        
-                        if players_online == 0:
-                            # No players online - check countdown timer
-                            print(f"👤 No players online for guild {guild_id}, checking countdown timer...")
-                            
-                            # Fetch countdown and check for button in one go (more efficient)
-                            countdown_seconds, extend_button_exists = await fetch_countdown_and_button(aternos_server)
-                            
-                            # If button exists OR countdown < 60, extend
-                            should_extend = False
-                            reason = ""
-                            
-                            if extend_button_exists:
-                                should_extend = True
-                                reason = "extend button is visible"
-                                if countdown_seconds is not None:
-                                    reason += f" (countdown: {countdown_seconds}s)"
-                            elif countdown_seconds is not None and countdown_seconds < 60:
-                                should_extend = True
-                                reason = f"countdown is {countdown_seconds}s (< 60s)"
-                            
-                            if should_extend:
-                                print(f"🚨 Extending server time - {reason}...")
-                                
-                                extend_success = await extend_server_time(aternos_server)
-                                
-                                if extend_success:
-                                    print(f"✅ Server time extended by 1 minute for guild {guild_id}")
-                                    # Wait a bit for the countdown to update
-                                    await asyncio.sleep(3)
-                                else:
-                                    print(f"⚠️ Failed to extend server time for guild {guild_id}, will retry on next check")
-                            else:
-                                if countdown_seconds is not None:
-                                    print(f"✅ Countdown is {countdown_seconds}s (>= 60s), no extension needed")
-                                elif extend_button_exists:
-                                    # Button exists but we couldn't parse countdown - extend anyway
-                                    print(f"🚨 Extend button visible but couldn't parse countdown, extending anyway...")
-                                    extend_success = await extend_server_time(aternos_server)
-                                    if extend_success:
-                                        print(f"✅ Server time extended by 1 minute for guild {guild_id}")
-                                        await asyncio.sleep(3)
-                                else:
-                                    print(f"ℹ️ Could not fetch countdown timer for guild {guild_id} (button not visible, countdown likely > 60s)")
-                        else:
-                            # Players are online, no need to extend
-                            print(f"👥 {players_online} player(s) online for guild {guild_id}, no extension needed")
-                    except Exception as extend_error:
-                        print(f"⚠️ Error in auto-extend check for guild {guild_id}: {extend_error}")
-                        import traceback
-                        traceback.print_exc()
+                    players_online = snapshot.players
+                    if players_online == 0:
+                        arm_extend(guild_id, aternos_server)
+                    elif snapshot != self.last_extend_check:
+                        # Players are online, no need to extend
+                        print(f"👥 {players_online} player(s) online for guild {guild_id}, no extension needed")
+                    self.last_extend_check = snapshot
                 
-                # Adjust wait time based on server status
-                # If server is waiting and might need confirmation soon, check more frequently
-                wait_time = 5
-                if current_status == 'waiting':
-                    # Check if queue position is low (might need confirmation soon)
-                    if hasattr(aternos_server, '_info'):
-                        info_data = getattr(aternos_server, '_info')
-                        if isinstance(info_data, dict) and 'queue' in info_data:
-                            queue_info = info_data.get('queue', {})
-                            if isinstance(queue_info, dict):
-                                position = queue_info.get('position', None)
-                                if position is not None and position <= 5:
-                                    # Queue is close to finishing, check every 2 seconds
-                                    wait_time = 2
-                                    print(f"⏱️ Queue position {position}, checking every {wait_time}s for confirmation...")
-                
-                await asyncio.sleep(wait_time)
+                # Next check from the polling policy (dense near confirmation, sparse early in a long queue)
+                position = queue_position_of(aternos_server)
+                wait_time = self.policy.next_delay(current_status, position, server_key(aternos_server))
+                if position is not None and position <= CONFIRM_ZONE_POSITION:
+                    print(f"⏱️ Queue position {position}, checking every {wait_time:g}s for confirmation...")
+                return wait_time
                 
             except Exception as fetch_error:
                 print(f"⚠️ Error fetching server status for guild {guild_id}: {fetch_error}")
                 # Wait longer on error
-                await asyncio.sleep(60)
+                return 60
                 
         except asyncio.CancelledError:
             print(f"🛑 Auto-start monitoring cancelled for guild {guild_id}")
-            if str(guild_id) in auto_start_tasks:
-                del auto_start_tasks[str(guild_id)]
+            self.unregister()
             return
         except Exception as e:
             print(f"❌ Error in auto-start monitor for guild {guild_id}: {e}")
             import traceback
             traceback.print_exc()
             # Wait longer on error
-            await asyncio.sleep(60)
+            return 60
 
-async def monitor_queue(ctx, loading_msg, aternos_server, guild_id):
-    """Monitor queue status with real-time updates"""
-    try:
-        start_time = time.time()
-        last_queue_time = None
-        last_queue_position = None
-        last_queue_time_str = None
-        static_queue_time_str = None  # Store the static "ca. X min" value
-        
-        while True:
-            try:
-                # Refresh server status
-                aternos_server.fetch()
-                current_status = aternos_server.status
-                
-                # Debug: Print status and key indicators
+# Minimum seconds between two routine edits of one progress message (state changes are sent at once)
+MESSAGE_EDIT_INTERVAL = float(os.getenv('MESSAGE_EDIT_INTERVAL', 5))
+
+class MessageEditor:
+    """Coalesces the edits of one progress message
+
+    Only edits that change the message are sent. A change of state (queue -> confirm -> starting -> online)
+    goes out right away; other changes (position, ETA, elapsed time) at most once per interval, latest wins.
+    """
+    def __init__(self, message, interval=MESSAGE_EDIT_INTERVAL):
+        self.message = message
+        self.interval = interval
+        self.state = None
+        self.sent = None  # Content of the last edit
+        self.sent_at = 0.0
+        self.latest = None  # Content waiting for the interval to pass
+        self.flusher = None  # Task sending self.latest when the interval has passed
+        self.error = None  # Error of a delayed edit, raised by the next update()
+        self.lock = asyncio.Lock()
+        self.edits = 0
+        self.coalesced = 0
+    
+    async def update(self, state, content):
+        """Show content; sent now on a state change, otherwise coalesced with later updates"""
+        if self.error is not None:
+            error, self.error = self.error, None
+            raise error
+        if state != self.state:
+            self.state = state
+            await self._send(content, OUTBOX_URGENT)
+            return
+        if content == self.sent:
+            self.latest = None
+            return
+        if self.latest is not None:
+            self.coalesced += 1
+        self.latest = content
+        if self.flusher is not None:
+            # A delayed edit is already waiting and will send the latest content
+            return
+        wait = self.sent_at + self.interval - time.time()
+        if wait <= 0:
+            await self._send(content)
+        else:
+            self.flusher = asyncio.ensure_future(self._flush_later(wait))
+    
+    async def _flush_later(self, wait):
+        try:
+            while self.latest is not None:
+                await asyncio.sleep(wait)
+                if self.latest is not None:
+                    await self._send(self.latest)
+                wait = self.interval
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            self.error = e
+        finally:
+            if self.flusher is asyncio.current_task():
+                self.flusher = None
+    
+    async def _send(self, content, priority=OUTBOX_COSMETIC):
+        if self.flusher is not None and self.flusher is not asyncio.current_task():
+            self.flusher.cancel()
+            self.flusher = None
+        self.latest = None
+        async with self.lock:
+            if content == self.sent:
+                return
+            await outbox_edit(self.message, priority, content=content)
+            self.sent = content
+            self.sent_at = time.time()
+            self.edits += 1
+    
+    def close(self):
+        """Drop a pending routine edit (the job is finished)"""
+        if self.flusher is not None:
+            self.flusher.cancel()
+            self.flusher = None
+        self.latest = None
+
+class QueueMonitorJob(MonitorJob):
+    """Keeps a guild's !start message updated with queue position, confirmation and startup progress"""
+    registry = queue_monitoring_tasks
+    
+    def __init__(self, ctx, loading_msg, aternos_server, guild_id):
+        super().__init__(guild_id)
+        self.ctx = ctx
+        self.loading_msg = loading_msg
+        self.editor = MessageEditor(loading_msg)
+        self.aternos_server = aternos_server
+        self.start_time = time.time()
+        self.last_queue_time = None
+        self.last_queue_position = None
+        self.last_queue_time_str = None
+        self.last_snapshot = None
+        self.policy = PollingPolicy(guild_id)
+        self.confirm_attempts = 0  # Automatic confirm attempts since the confirmation was detected
+        self.confirm_detected_at = None
+    
+    def unregister(self):
+        super().unregister()
+        self.editor.close()
+    
+    async def step(self):
+        guild_id = self.guild_id
+        editor = self.editor
+        # Follow re-logins (the account may have swapped in a new server object)
+        aternos_server = server_servers.get(str(guild_id), self.aternos_server)
+        self.aternos_server = aternos_server
+        self.watch(aternos_server)
+        try:
+            # Refresh server status (shared with other guilds on the same account)
+            await refresh_guild_server(guild_id, aternos_server)
+            snapshot = snapshot_of(aternos_server)
+            current_status = snapshot.status
+            
+            # Debug: Print status and key indicators (only when something changed)
+            if snapshot != self.last_snapshot:
                 print(f"Status: {current_status}")
-                
-                # Comprehensive debug output when checking for confirmation
-                if hasattr(aternos_server, '_info'):
-                    info_data = getattr(aternos_server, '_info')
-                    if isinstance(info_data, dict) and 'queue' in info_data:
-                        queue_info = info_data.get('queue', {})
-                        if isinstance(queue_info, dict):
-                            pending = queue_info.get('pending', '')
-                            position = queue_info.get('position', None)
-                            if pending or (position is not None and position <= 5):
-                                print(f"🔍 CONFIRM CHECK: status={current_status}, pending='{pending}', position={position}, css_class={getattr(aternos_server, 'css_class', 'N/A')}")
-                
-                # ========================================================================
-                # COMPREHENSIVE CONFIRMATION DETECTION - CHECK FIRST, BEFORE QUEUE STATUS
-                # ========================================================================
-                # This section checks EVERY possible indicator that confirmation is needed
-                # Multiple fallbacks ensure instant detection when website shows "Confirm now!"
-                # ========================================================================
-                confirm_required = False
-                confirm_reason = None
-                
-                try:
-                    # ====================================================================
-                    # METHOD 1: Check _info['queue']['pending'] - PRIMARY INDICATOR
-                    # ====================================================================
-                    if hasattr(aternos_server, '_info'):
-                        info_data = getattr(aternos_server, '_info')
-                        if isinstance(info_data, dict):
-                            # Check queue data in _info
-                            if 'queue' in info_data:
-                                queue_info = info_data['queue']
-                                if isinstance(queue_info, dict):
-                                    # PRIMARY CHECK: pending status
-                                    pending = queue_info.get('pending', '')
-                                    position = queue_info.get('position', None)
-                                    count = queue_info.get('count', None)
-                                    queue_status = queue_info.get('queue', None)
-                                    
-                                    # Check 1.1: pending == 'pending' (most reliable)
-                                    if pending:
-                                        pending_lower = str(pending).lower()
-                                        if pending_lower == 'pending':
-                                            confirm_required = True
-                                            confirm_reason = f"queue.pending='{pending}'"
-                                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                        
-                                        # Check 1.2: 'confirm' in pending
-                                        elif 'confirm' in pending_lower:
-                                            confirm_required = True
-                                            confirm_reason = f"queue.pending contains 'confirm': '{pending}'"
-                                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                    
-                                    # Check 1.3: Position is 1 or 0 (queue finished)
-                                    if not confirm_required and position is not None:
-                                        if position <= 1:
-                                            # Position 1 or 0 + pending = needs confirmation
-                                            if pending and str(pending).lower() == 'pending':
-                                                confirm_required = True
-                                                confirm_reason = f"queue position={position}, pending='{pending}'"
-                                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                            # Position <= 1 = queue finished, needs confirmation
-                                            elif position == 1:
-                                                confirm_required = True
-                                                confirm_reason = f"queue position={position} (queue finished), status={current_status}"
-                                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                            # Position 0 = definitely needs confirmation
-                                            elif position == 0:
-                                                confirm_required = True
-                                                confirm_reason = f"queue position={position} (queue finished), status={current_status}"
-                                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                    
-                                    # Check 1.4: Queue status changed
-                                    if not confirm_required and queue_status is not None:
-                                        if queue_status != 2 and position is not None and position <= 1:
-                                            confirm_required = True
-                                            confirm_reason = f"queue.queue={queue_status}, position={position}"
-                                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                    
-                                    # Debug logging for low positions
-                                    if position is not None and position <= 10:
-                                        print(f"🔍 DEBUG: position={position}, pending='{pending}', status={current_status}, queue={queue_status}")
-                            
-                            # ============================================================
-                            # METHOD 2: Check _info['label'] and _info['class']
-                            # ============================================================
-                            label = info_data.get('label', '')
-                            info_class = info_data.get('class', '')
-                            lang = info_data.get('lang', '')
-                            
-                            # Check 2.1: Label contains confirm/pending
-                            if not confirm_required and label:
-                                label_lower = str(label).lower()
-                                if 'confirm' in label_lower:
-                                    confirm_required = True
-                                    confirm_reason = f"label contains 'confirm': '{label}'"
-                                    print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                elif 'pending' in label_lower and 'waiting' not in label_lower:
-                                    confirm_required = True
-                                    confirm_reason = f"label contains 'pending': '{label}'"
-                                    print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                            
-                            # Check 2.2: Class contains confirm/pending/queueconfirm
-                            if not confirm_required and info_class:
-                                class_lower = str(info_class).lower()
-                                if 'confirm' in class_lower or 'queueconfirm' in class_lower:
-                                    confirm_required = True
-                                    confirm_reason = f"class contains 'confirm': '{info_class}'"
-                                    print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                elif 'pending' in class_lower and 'queueing' not in class_lower:
-                                    confirm_required = True
-                                    confirm_reason = f"class contains 'pending': '{info_class}'"
-                                    print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                            
-                            # Check 2.3: Lang field
-                            if not confirm_required and lang:
-                                lang_lower = str(lang).lower()
-                                if 'confirm' in lang_lower or 'pending' in lang_lower:
-                                    if 'waiting' not in lang_lower:
-                                        confirm_required = True
-                                        confirm_reason = f"lang contains confirm/pending: '{lang}'"
-                                        print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                            
-                            # ============================================================
-                            # METHOD 3: Check status_num and status changes
-                            # ============================================================
-                            status_num = info_data.get('status', None)
-                            if not confirm_required and status_num is not None:
-                                # Status 10 = waiting, other statuses might indicate confirmation needed
-                                if status_num != 10:  # Not waiting
-                                    if current_status != 'online' and current_status != 'starting' and current_status != 'offline':
-                                        # Check if queue has pending status
-                                        if 'queue' in info_data:
-                                            queue_info = info_data.get('queue', {})
-                                            if isinstance(queue_info, dict):
-                                                pending = queue_info.get('pending', '')
-                                                if pending and str(pending).lower() == 'pending':
-                                                    confirm_required = True
-                                                    confirm_reason = f"status_num={status_num}, pending='{pending}'"
-                                                    print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                            
-                            # ============================================================
-                            # METHOD 4: Check all _info keys for confirmation indicators
-                            # ============================================================
-                            if not confirm_required:
-                                for key, value in info_data.items():
-                                    if value and isinstance(value, (str, int)):
-                                        value_str = str(value).lower()
-                                        # Look for confirm/pending in any value
-                                        if key != 'label' and key != 'class' and key != 'lang':
-                                            if ('confirm' in value_str or 'pending' in value_str) and 'waiting' not in value_str:
-                                                # Check if this is a meaningful indicator
-                                                if key in ['message', 'text', 'status_text', 'action']:
-                                                    confirm_required = True
-                                                    confirm_reason = f"_info['{key}']='{value}'"
-                                                    print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                                    break
-                    
-                    
-                    # ============================================================
-                    # METHOD 5: Check css_class attribute
-                    # ============================================================
-                    if not confirm_required and hasattr(aternos_server, 'css_class'):
-                        css_class = str(aternos_server.css_class)
-                        css_class_lower = css_class.lower()
-                        
-                        # Check 5.1: Contains confirm/queueconfirm
-                        if 'confirm' in css_class_lower or 'queueconfirm' in css_class_lower:
-                            if 'queueing' not in css_class_lower or css_class_lower != 'queueing':
-                                confirm_required = True
-                                confirm_reason = f"css_class='{css_class}'"
-                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                        
-                        # Check 5.2: Contains pending (but not just "queueing")
-                        elif 'pending' in css_class_lower:
-                            if css_class_lower != 'queueing' and 'queueing' not in css_class_lower:
-                                confirm_required = True
-                                confirm_reason = f"css_class contains 'pending': '{css_class}'"
-                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                    
-                    # ============================================================
-                    # METHOD 6: Check status string
-                    # ============================================================
-                    if not confirm_required and current_status:
-                        status_lower = str(current_status).lower()
-                        
-                        # Check 6.1: Status contains confirm
-                        if 'confirm' in status_lower:
-                            confirm_required = True
-                            confirm_reason = f"status contains 'confirm': '{current_status}'"
-                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                        
-                        # Check 6.2: Status contains pending (but not waiting)
-                        elif 'pending' in status_lower and 'waiting' not in status_lower:
-                            confirm_required = True
-                            confirm_reason = f"status contains 'pending': '{current_status}'"
-                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                        
-                        # Check 6.3: Status is queueconfirm
-                        elif status_lower == 'queueconfirm':
-                            confirm_required = True
-                            confirm_reason = f"status='queueconfirm'"
-                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                    
-                    # ============================================================
-                    # METHOD 7: Check status transitions (waiting -> something else)
-                    # ============================================================
-                    if not confirm_required:
-                        # If status changed from waiting to something else (but not online/starting/offline)
-                        if current_status not in ['waiting', 'online', 'starting', 'offline', 'stopping']:
-                            # Check _info for pending status
-                            if hasattr(aternos_server, '_info'):
-                                info_data = getattr(aternos_server, '_info')
-                                if isinstance(info_data, dict) and 'queue' in info_data:
-                                    queue_info = info_data.get('queue', {})
-                                    if isinstance(queue_info, dict):
-                                        pending = queue_info.get('pending', '')
-                                        position = queue_info.get('position', None)
-                                        
-                                        # If pending is set or position is 1, needs confirmation
-                                        if pending and str(pending).lower() == 'pending':
-                                            confirm_required = True
-                                            confirm_reason = f"status changed to '{current_status}', pending='{pending}'"
-                                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                        elif position is not None and position <= 1:
-                                            confirm_required = True
-                                            confirm_reason = f"status changed to '{current_status}', position={position}"
-                                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                    
-                    # ============================================================
-                    # METHOD 8: Check countdown value
-                    # ============================================================
-                    if not confirm_required and hasattr(aternos_server, 'countdown'):
-                        countdown = aternos_server.countdown
-                        # Countdown 0 or None + not waiting/online = might need confirmation
-                        if (countdown == 0 or countdown is None) and current_status not in ['waiting', 'online', 'starting', 'offline']:
-                            # Double-check with _info
-                            if hasattr(aternos_server, '_info'):
-                                info_data = getattr(aternos_server, '_info')
-                                if isinstance(info_data, dict) and 'queue' in info_data:
-                                    queue_info = info_data.get('queue', {})
-                                    if isinstance(queue_info, dict):
-                                        pending = queue_info.get('pending', '')
-                                        if pending and str(pending).lower() == 'pending':
-                                            confirm_required = True
-                                            confirm_reason = f"countdown={countdown}, pending='{pending}'"
-                                            print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                    
-                    # ============================================================
-                    # METHOD 9: Check is_confirm_required attribute
-                    # ============================================================
-                    if not confirm_required and hasattr(aternos_server, 'is_confirm_required'):
-                        try:
-                            is_confirm = aternos_server.is_confirm_required
-                            if is_confirm:
-                                confirm_required = True
-                                confirm_reason = "is_confirm_required=True"
-                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                        except:
-                            pass
-                    
-                    # ============================================================
-                    # METHOD 10: Check all server attributes for confirmation indicators
-                    # ============================================================
-                    if not confirm_required:
-                        # Check all non-private attributes
-                        for attr_name in dir(aternos_server):
-                            if not attr_name.startswith('_') and not callable(getattr(aternos_server, attr_name, None)):
-                                try:
-                                    attr_value = getattr(aternos_server, attr_name)
-                                    if attr_value and isinstance(attr_value, str):
-                                        attr_lower = attr_value.lower()
-                                        # Look for confirm/pending in attribute values
-                                        if ('confirm' in attr_lower or 'pending' in attr_lower) and 'waiting' not in attr_lower:
-                                            # Check if this is a meaningful attribute
-                                            if attr_name in ['status_text', 'message', 'action', 'button_text', 'label_text']:
-                                                confirm_required = True
-                                                confirm_reason = f"{attr_name}='{attr_value}'"
-                                                print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                                break
-                                except:
-                                    pass
-                    
-                    # ============================================================
-                    # METHOD 11: Final check - if position is 1 and status is not waiting
-                    # ============================================================
-                    if not confirm_required and hasattr(aternos_server, '_info'):
-                        info_data = getattr(aternos_server, '_info')
-                        if isinstance(info_data, dict) and 'queue' in info_data:
-                            queue_info = info_data.get('queue', {})
-                            if isinstance(queue_info, dict):
-                                position = queue_info.get('position', None)
-                                pending = queue_info.get('pending', '')
-                                
-                                # Check if queue finished (position <= 1) or has pending status
-                                if position is not None and position <= 1:
-                                    # Position 1 or 0 means queue finished - needs confirmation even if status is "waiting"
-                                    if hasattr(aternos_server, 'confirm'):
-                                        confirm_required = True
-                                        confirm_reason = f"position={position} (queue finished), status={current_status}, confirm() method available"
-                                        print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                                # Also check for pending status even if position is not 1
-                                elif pending and str(pending).lower() == 'pending':
-                                    # Pending status means confirmation needed
-                                    confirm_required = True
-                                    confirm_reason = f"queue pending='{pending}', status={current_status}"
-                                    print(f"✅✅✅ CONFIRM DETECTED: {confirm_reason}")
-                    
-                    # ============================================================
-                    # FINAL ACTION: Auto-confirm when detected (NO MANUAL CONFIRMATION NEEDED)
-                    # ============================================================
-                    if confirm_required:
+                if snapshot.queue_pending or (snapshot.queue_position is not None and snapshot.queue_position <= 5):
+                    print(f"🔍 CONFIRM CHECK: status={current_status}, pending='{snapshot.queue_pending}', position={snapshot.queue_position}, css_class={snapshot.css_class}")
+            self.last_snapshot = snapshot
+            
+            # Confirmation is checked first, before the queue status
+            confirm_required = snapshot.needs_confirm
+            confirm_reason = snapshot.confirm_reason
+            
+            try:
+                # Auto-confirm when detected (no manual confirmation needed): one attempt per step, retried by later steps
+                if confirm_required:
+                    if self.confirm_attempts == 0:
                         print(f"🚨🚨🚨 CONFIRMATION REQUIRED - REASON: {confirm_reason} 🚨🚨🚨")
-                        
-                        # Try to confirm IMMEDIATELY and automatically (multiple attempts with retries)
+                        await editor.update('confirm', '🚨 **Confirmation required!**\n⏳ Confirming automatically...')
                         print("🚀 Attempting AUTOMATIC confirmation (no manual interaction needed)...")
-                        auto_confirm_success = False
-                        max_retries = 5  # Increased retries
-                        
-                        for retry in range(max_retries):
-                            try:
-                                # Refresh server status and re-authenticate if needed
-                                try:
-                                    aternos_server.fetch()
-                                except:
-                                    # If fetch fails, try re-authenticating
-                                    print(f"   Fetch failed, re-authenticating...")
-                                    await connect_to_aternos(guild_id)
-                                    aternos_server = server_servers.get(str(guild_id))
-                                    if aternos_server:
-                                        aternos_server.fetch()
-                                
-                                if hasattr(aternos_server, 'atconn'):
-                                    atconn = aternos_server.atconn
-                                    server_id = getattr(aternos_server, 'servid', None)
-                                    
-                                    # Method 1: Try library confirm() method FIRST (most reliable)
-                                    if hasattr(aternos_server, 'confirm') and callable(aternos_server.confirm):
-                                        try:
-                                            print(f"   Attempt {retry + 1}/{max_retries}: Trying library confirm() method...")
-                                            aternos_server.confirm()
-                                            auto_confirm_success = True
-                                            print("✅✅✅ AUTOMATIC CONFIRMATION SUCCESSFUL (library method)!")
-                                            break
-                                        except Exception as lib_err:
-                                            error_str = str(lib_err)
-                                            print(f"   Library confirm() failed: {lib_err}")
-                                            # If it's a token error, try re-auth
-                                            if '400' in error_str or '401' in error_str or 'token' in error_str.lower():
-                                                print(f"   Token error detected, re-authenticating...")
-                                                await connect_to_aternos(guild_id)
-                                                aternos_server = server_servers.get(str(guild_id))
-                                                if aternos_server:
-                                                    aternos_server.fetch()
-                                    
-                                    # Method 2: Try request_cloudflare with server ID
-                                    if not auto_confirm_success and hasattr(atconn, 'request_cloudflare'):
-                                        try:
-                                            # Build confirm URL with server ID if available
-                                            if server_id:
-                                                confirm_url = f'https://aternos.org/ajax/server/confirm?id={server_id}'
-                                            else:
-                                                confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                            
-                                            print(f"   Attempt {retry + 1}/{max_retries}: Trying POST request to {confirm_url}...")
-                                            
-                                            # Try POST first (more reliable for confirmations)
-                                            try:
-                                                response = atconn.request_cloudflare(confirm_url, 'POST')
-                                                if response is not None:
-                                                    auto_confirm_success = True
-                                                    print("✅✅✅ AUTOMATIC CONFIRMATION SUCCESSFUL (POST)!")
-                                                    break
-                                            except Exception as post_err:
-                                                print(f"   POST failed: {post_err}, trying GET...")
-                                                try:
-                                                    response = atconn.request_cloudflare(confirm_url, 'GET')
-                                                    if response is not None:
-                                                        auto_confirm_success = True
-                                                        print("✅✅✅ AUTOMATIC CONFIRMATION SUCCESSFUL (GET)!")
-                                                        break
-                                                except Exception as get_err:
-                                                    print(f"   GET also failed: {get_err}")
-                                        
-                                        except Exception as cf_error:
-                                            print(f"   request_cloudflare failed: {cf_error}")
-                                    
-                                    # Method 3: Direct session POST with proper data
-                                    if not auto_confirm_success and hasattr(atconn, 'session'):
-                                        try:
-                                            session = atconn.session
-                                            if server_id:
-                                                confirm_url = f'https://aternos.org/ajax/server/confirm?id={server_id}'
-                                            else:
-                                                confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                            
-                                            print(f"   Attempt {retry + 1}/{max_retries}: Trying direct session POST...")
-                                            
-                                            import requests
-                                            if isinstance(session, requests.Session):
-                                                loop = asyncio.get_event_loop()
-                                                # Try POST with empty data
-                                                response = await loop.run_in_executor(None, lambda: session.post(confirm_url, data={}, timeout=10))
-                                                if response.status_code in [200, 201]:
-                                                    auto_confirm_success = True
-                                                    print("✅✅✅ AUTOMATIC CONFIRMATION SUCCESSFUL (direct POST)!")
-                                                    break
-                                        except Exception as session_err:
-                                            print(f"   Direct session POST failed: {session_err}")
-                                else:
-                                    # No atconn, try library method directly
-                                    if hasattr(aternos_server, 'confirm') and callable(aternos_server.confirm):
-                                        try:
-                                            print(f"   Attempt {retry + 1}/{max_retries}: Trying library confirm() method (no atconn)...")
-                                            aternos_server.confirm()
-                                            auto_confirm_success = True
-                                            print("✅✅✅ AUTOMATIC CONFIRMATION SUCCESSFUL (library method)!")
-                                            break
-                                        except Exception as lib_err:
-                                            print(f"   Library confirm() failed: {lib_err}")
-                                
-                                # If we got here and didn't succeed, wait before retry
-                                if not auto_confirm_success and retry < max_retries - 1:
-                                    wait_time = (retry + 1) * 2  # Exponential backoff: 2s, 4s, 6s, 8s
-                                    print(f"   Waiting {wait_time} seconds before retry...")
-                                    await asyncio.sleep(wait_time)
-                                    
-                            except Exception as confirm_error:
-                                print(f"   Error in auto-confirm attempt {retry + 1}: {confirm_error}")
-                                import traceback
-                                traceback.print_exc()
-                                if retry < max_retries - 1:
-                                    wait_time = (retry + 1) * 2
-                                    await asyncio.sleep(wait_time)
-                        
-                        if auto_confirm_success:
-                            # Confirmation successful - update message and continue monitoring
-                            await loading_msg.edit(content='✅ **Confirmation sent automatically!**\n⏳ Server is starting...\n\n_No manual confirmation needed!_')
-                            # Wait a bit and check status
-                            await asyncio.sleep(3)
-                            try:
-                                aternos_server.fetch()
-                                new_status = aternos_server.status
-                                print(f"📡 Server status after confirmation: {new_status}")
-                            except:
-                                pass
-                            # Continue monitoring to see server go online
-                            await asyncio.sleep(2)
-                            continue
-                        else:
-                            # All auto-confirm attempts failed - still try to continue, but log the issue
-                            print("⚠️⚠️⚠️ All auto-confirmation attempts failed, but continuing to monitor...")
-                            await loading_msg.edit(content='⚠️ **Confirmation required but auto-confirm failed**\n⏳ Retrying automatically...')
-                            # Wait a bit and continue monitoring - might succeed on next iteration
-                            await asyncio.sleep(3)
-                            continue
-                except Exception as e:
-                    print(f"Error checking confirmation: {e}")
-                
-                # Check for queue - Try different approaches
-                queue_position = None
-                queue_time = None
-                queue_time_str = None
-                in_queue = False
-                
-                # Approach 0: Check _info first (most reliable - contains queue data directly)
-                try:
-                    if hasattr(aternos_server, '_info'):
-                        info_data = getattr(aternos_server, '_info')
-                        if isinstance(info_data, dict) and 'queue' in info_data:
-                            queue_info = info_data['queue']
-                            if isinstance(queue_info, dict):
-                                # Extract position and count
-                                if 'position' in queue_info and 'count' in queue_info:
-                                    pos = queue_info['position']
-                                    count = queue_info['count']
-                                    queue_position = f"{pos} / {count}"
-                                    print(f"Found queue position in _info: {queue_position}")
-                                
-                                # Extract time (already in "ca. X min" format) - LOCK IT IN ONCE, NEVER UPDATE
-                                if 'time' in queue_info:
-                                    new_time_str = queue_info['time']
-                                    # ONLY set static value if it's not set yet - NEVER UPDATE IT AFTER THAT
-                                    if static_queue_time_str is None:
-                                        static_queue_time_str = new_time_str
-                                        print(f"🔒 LOCKED static queue time: {static_queue_time_str} (will never change)")
-                                    # Always use the locked static value - ignore any new values from _info
-                                    queue_time_str = static_queue_time_str
-                                    # Also set queue_time for compatibility (convert to seconds)
-                                    if 'minutes' in queue_info:
-                                        queue_time = queue_info['minutes'] * 60
-                                
-                                in_queue = True
-                                print(f"Queue data from _info: position={queue_position}, time={queue_time_str}")
-                except Exception as e:
-                    print(f"Error checking _info data: {e}")
-                
-                # Approach 1: Check status - "waiting" means in queue!
-                if current_status in ['loading', 'loading_preparing', 'waiting', 'queue'] or 'queue' in str(current_status).lower():
-                    in_queue = True
-                
-                # Approach 2: Check queue attribute
-                try:
-                    if hasattr(aternos_server, 'queue') and aternos_server.queue is not None:
-                        in_queue = True
-                        queue_obj = aternos_server.queue
-                        
-                        # Try different attribute names for position
-                        for attr in ['position', 'pos', 'place', 'number']:
-                            if hasattr(queue_obj, attr):
-                                val = getattr(queue_obj, attr)
-                                if val is not None:
-                                    queue_position = val
-                                    break
-                        
-                        # Try different attribute names for time
-                        for attr in ['time', 'wait', 'estimated', 'estimate', 'eta']:
-                            if hasattr(queue_obj, attr):
-                                val = getattr(queue_obj, attr)
-                                if val is not None:
-                                    queue_time = val
-                                    break
-                        
-                        if queue_position or queue_time:
-                            print(f"Queue from attribute - Position: {queue_position}, Time: {queue_time}")
-                except Exception as e:
-                    print(f"Error checking queue attribute: {e}")
-                
-                # Approach 3: Check for queue_position directly on server
-                try:
-                    if hasattr(aternos_server, 'queue_position'):
-                        queue_position = aternos_server.queue_position
-                        in_queue = True
-                except:
-                    pass
-                
-                # Approach 4: Check for queue_time directly
-                try:
-                    if hasattr(aternos_server, 'queue_time'):
-                        queue_time = aternos_server.queue_time
+                        self.confirm_detected_at = snapshot.fetched_at
+                    self.confirm_attempts += 1
+                    auto_confirm_success, aternos_server = await auto_confirm_attempt(
+                        guild_id, aternos_server, self.confirm_attempts, self.confirm_detected_at
+                    )
+                    self.aternos_server = aternos_server
+                    
+                    if auto_confirm_success:
+                        self.confirm_attempts = 0
+                        print("✅✅✅ AUTOMATIC CONFIRMATION SUCCESSFUL!")
+                        # Confirmation successful - update message and continue monitoring to see the server go online
+                        await editor.update('confirmed', '✅ **Confirmation sent automatically!**\n⏳ Server is starting...\n\n_No manual confirmation needed!_')
+                        return 3
+                    if self.confirm_attempts < AUTO_CONFIRM_ATTEMPTS:
+                        wait_time = self.confirm_attempts * AUTO_CONFIRM_BACKOFF
+                        print(f"   Waiting {wait_time} seconds before retry...")
+                        return wait_time
+                    # All auto-confirm attempts failed - still try to continue, but log the issue
+                    self.confirm_attempts = 0
+                    print("⚠️⚠️⚠️ All auto-confirmation attempts failed, but continuing to monitor...")
+                    await editor.update('confirm_failed', '⚠️ **Confirmation required but auto-confirm failed**\n⏳ Retrying automatically...')
+                    # Wait a bit and continue monitoring - might succeed on next iteration
+                    return 3
+                self.confirm_attempts = 0
+            except Exception as e:
+                print(f"Error checking confirmation: {e}")
+            
+            # Queue data from the status (Aternos' own estimate is used until the model has a position)
+            queue_position = snapshot.queue_position_str
+            queue_time = None
+            queue_time_str = snapshot.queue_eta
+            in_queue = snapshot.in_queue or current_status in ['loading', 'loading_preparing', 'queue']
+            
+            # The status had no queue data: ask the queue API
+            try:
+                if queue_position is None and in_queue and hasattr(aternos_server, 'atconn') and hasattr(aternos_server, 'servid'):
+                    api_position, api_max, api_seconds = await fetch_queue_api(aternos_server)
+                    if api_position is not None:
+                        queue_position = f"{api_position}/{api_max}" if api_max is not None else api_position
+                        print(f"Found queue position in API: {queue_position}")
+                    if api_seconds is not None:
+                        queue_time = api_seconds
+                        print(f"Found queue time in API: {queue_time}")
+                    if api_position is not None or api_seconds is not None:
                         in_queue = True
-                except:
-                    pass
+            except Exception as e:
+                print(f"Error with atconn approach: {e}")
+            
+            # If in queue - check status first to ensure "waiting" is always treated as queue
+            if current_status == 'waiting':
+                in_queue = True
                 
-                # Approach 5: Try to get queue info from atserver methods
-                try:
-                    # Some versions use atserver.get_queue()
-                    if hasattr(aternos_server, 'get_queue'):
-                        queue_info = aternos_server.get_queue()
-                        if queue_info:
-                            print(f"Queue from get_queue(): {queue_info}")
-                            in_queue = True
-                except:
-                    pass
+                # No queue data in the status: try the panel page HTML (downloaded at most once per PANEL_SNAPSHOT_TTL)
+                if queue_position is None:
+                    panel_queue_pos, panel_queue_time_str = await fetch_queue_data_from_panel(aternos_server)
+                    if panel_queue_pos:
+                        queue_position = panel_queue_pos
+                        self.last_queue_position = panel_queue_pos
+                        print(f"Updated queue position: {queue_position}")
+                    if panel_queue_time_str:
+                        self.last_queue_time_str = panel_queue_time_str
+                        print(f"Updated queue time: {panel_queue_time_str}")
+                    if not panel_queue_pos and not panel_queue_time_str:
+                        print("No queue data found from panel fetch")
+            
+            # If in queue, show queue message
+            if in_queue or current_status == 'waiting':
+                # Update last known values
+                if queue_time is not None:
+                    self.last_queue_time = queue_time
+                if queue_position is not None:
+                    self.last_queue_position = queue_position
+                if queue_time_str is not None:
+                    self.last_queue_time_str = queue_time_str
                 
-                # Approach 6: Check for loading/waiting attributes
-                try:
-                    if hasattr(aternos_server, 'loading') and aternos_server.loading:
-                        in_queue = True
-                except:
-                    pass
+                elapsed = int(time.time() - self.start_time)
+                elapsed_str = f'{elapsed // 60}m {elapsed % 60}s' if elapsed >= 60 else f'{elapsed}s'
                 
-                # Approach 7: Try to get queue info from atconn (connection object) - Direct API call
-                try:
-                    if hasattr(aternos_server, 'atconn') and hasattr(aternos_server, 'servid'):
-                        atconn = aternos_server.atconn
-                        server_id = aternos_server.servid
-                        
-                        # Try multiple methods to get queue data
-                        # Method 1: Using session.get() if available (could be requests or aiohttp)
-                        if hasattr(atconn, 'session'):
-                            try:
-                                queue_url = f'https://aternos.org/panel/ajax/queue.php?id={server_id}'
-                                print(f"Trying to fetch queue data from: {queue_url}")
-                                
-                                session = atconn.session
-                                
-                                # Check if it's aiohttp session (async) or requests session (sync)
-                                import aiohttp
-                                import requests
-                                
-                                if isinstance(session, aiohttp.ClientSession):
-                                    # Async aiohttp session
-                                    async with session.get(queue_url) as response:
-                                        if response.status == 200:
-                                            try:
-                                                queue_data = await response.json()
-                                                print(f"Queue API response (JSON): {queue_data}")
-                                                
-                                                if isinstance(queue_data, dict):
-                                                    # Try different possible keys for position
-                                                    for pos_key in ['position', 'pos', 'queue_pos', 'queue_position', 'current', 'now']:
-                                                        if pos_key in queue_data:
-                                                            pos_val = queue_data[pos_key]
-                                                            if isinstance(pos_val, (int, str)) and str(pos_val).isdigit():
-                                                                queue_position = int(pos_val)
-                                                                print(f"Found queue position in API ({pos_key}): {queue_position}")
-                                                                break
-                                                    
-                                                    # Try different possible keys for max position
-                                                    for max_key in ['max', 'max_position', 'total', 'queue_max', 'max_queue']:
-                                                        if max_key in queue_data:
-                                                            max_val = queue_data[max_key]
-                                                            if isinstance(max_val, (int, str)) and str(max_val).isdigit():
-                                                                if queue_position is not None:
-                                                                    queue_position = f"{queue_position}/{max_val}"
-                                                                print(f"Found queue max in API ({max_key}): {max_val}")
-                                                                break
-                                                    
-                                                    # Try different possible keys for time
-                                                    for time_key in ['time', 'wait', 'eta', 'estimated', 'estimate', 'wait_time', 'queue_time']:
-                                                        if time_key in queue_data:
-                                                            time_val = queue_data[time_key]
-                                                            if isinstance(time_val, (int, float)):
-                                                                queue_time = int(time_val)
-                                                                print(f"Found queue time in API ({time_key}): {queue_time}")
-                                                                break
-                                                            elif isinstance(time_val, str):
-                                                                # Try to parse time string like "8 min" or "480"
-                                                                import re
-                                                                numbers = re.findall(r'\d+', time_val)
-                                                                if numbers:
-                                                                    num = int(numbers[0])
-                                                                    if 'min' in time_val.lower():
-                                                                        queue_time = num * 60
-                                                                    else:
-                                                                        queue_time = num
-                                                                    print(f"Found queue time in API (parsed from '{time_key}'): {queue_time}")
-                                                                    break
-                                                    
-                                                    in_queue = True
-                                            except Exception as json_e:
-                                                # Try text response
-                                                text_data = await response.text()
-                                                print(f"Queue API response (text): {text_data}")
-                                        elif response.status == 503:
-                                            # Service Unavailable - don't spam console, just skip this fetch
-                                            pass  # Silently skip 503 errors
-                                        else:
-                                            # Only log non-503 errors
-                                            if response.status != 503:
-                                                print(f"Queue API returned status: {response.status}")
-                                elif isinstance(session, requests.Session):
-                                    # Sync requests session - run in executor to avoid blocking
-                                    loop = asyncio.get_event_loop()
-                                    response = await loop.run_in_executor(None, session.get, queue_url)
-                                    if response.status_code == 200:
-                                        try:
-                                            queue_data = response.json()
-                                            print(f"Queue API response (JSON): {queue_data}")
-                                            
-                                            if isinstance(queue_data, dict):
-                                                # Same parsing logic as above
-                                                for pos_key in ['position', 'pos', 'queue_pos', 'queue_position', 'current', 'now']:
-                                                    if pos_key in queue_data:
-                                                        pos_val = queue_data[pos_key]
-                                                        if isinstance(pos_val, (int, str)) and str(pos_val).isdigit():
-                                                            queue_position = int(pos_val)
-                                                            print(f"Found queue position in API ({pos_key}): {queue_position}")
-                                                            break
-                                                
-                                                for max_key in ['max', 'max_position', 'total', 'queue_max', 'max_queue']:
-                                                    if max_key in queue_data:
-                                                        max_val = queue_data[max_key]
-                                                        if isinstance(max_val, (int, str)) and str(max_val).isdigit():
-                                                            if queue_position is not None:
-                                                                queue_position = f"{queue_position}/{max_val}"
-                                                            print(f"Found queue max in API ({max_key}): {max_val}")
-                                                            break
-                                                
-                                                for time_key in ['time', 'wait', 'eta', 'estimated', 'estimate', 'wait_time', 'queue_time']:
-                                                    if time_key in queue_data:
-                                                        time_val = queue_data[time_key]
-                                                        if isinstance(time_val, (int, float)):
-                                                            queue_time = int(time_val)
-                                                            print(f"Found queue time in API ({time_key}): {queue_time}")
-                                                            break
-                                                        elif isinstance(time_val, str):
-                                                            import re
-                                                            numbers = re.findall(r'\d+', time_val)
-                                                            if numbers:
-                                                                num = int(numbers[0])
-                                                                if 'min' in time_val.lower():
-                                                                    queue_time = num * 60
-                                                                else:
-                                                                    queue_time = num
-                                                                print(f"Found queue time in API (parsed from '{time_key}'): {queue_time}")
-                                                                break
-                                                
-                                                in_queue = True
-                                        except Exception as json_e:
-                                            text_data = response.text
-                                            print(f"Queue API response (text): {text_data}")
-                                    elif response.status_code == 503:
-                                        # Service Unavailable - don't spam console, just skip this fetch
-                                        pass  # Silently skip 503 errors
-                                    else:
-                                        # Only log non-503 errors
-                                        if response.status_code != 503:
-                                            print(f"Queue API returned status: {response.status_code}")
-                            except Exception as e:
-                                print(f"Error fetching queue API with session: {e}")
-                        
-                        # Method 2: Using request_cloudflare if available
-                        if queue_position is None and hasattr(atconn, 'request_cloudflare'):
-                            try:
-                                queue_url = f'https://aternos.org/panel/ajax/queue.php?id={server_id}'
-                                print(f"Trying request_cloudflare for queue data: {queue_url}")
-                                
-                                response = atconn.request_cloudflare(queue_url, 'GET')
-                                print(f"Queue API response (cloudflare): {response}")
-                                
-                                if response:
-                                    if isinstance(response, dict):
-                                        # Extract queue position and time
-                                        for pos_key in ['position', 'pos', 'queue_pos']:
-                                            if pos_key in response:
-                                                queue_position = response[pos_key]
-                                                print(f"Found queue position in API ({pos_key}): {queue_position}")
-                                                break
-                                        
-                                        for time_key in ['time', 'wait', 'eta']:
-                                            if time_key in response:
-                                                queue_time = response[time_key]
-                                                print(f"Found queue time in API ({time_key}): {queue_time}")
-                                                break
-                                        
-                                        in_queue = True
-                                    elif isinstance(response, str):
-                                        # Try to parse HTML or text response
-                                        import re
-                                        # Look for position pattern like "3573 / 3852" or "3573/3852"
-                                        pos_match = re.search(r'(\d+)\s*[/]\s*(\d+)', response)
-                                        if pos_match:
-                                            queue_position = f"{pos_match.group(1)}/{pos_match.group(2)}"
-                                            print(f"Found queue position in text: {queue_position}")
-                                        
-                                        # Look for time pattern like "ca. 8 min" or "8 min"
-                                        time_match = re.search(r'(\d+)\s*min', response, re.IGNORECASE)
-                                        if time_match:
-                                            queue_time = int(time_match.group(1)) * 60
-                                            print(f"Found queue time in text: {queue_time}")
-                                        
-                                        if queue_position or queue_time:
-                                            in_queue = True
-                            except Exception as e:
-                                error_str = str(e)
-                                # Don't spam console with 503 errors
-                                if '503' not in error_str and 'Service Unavailable' not in error_str:
-                                    print(f"Error fetching queue API with request_cloudflare: {e}")
-                except Exception as e:
-                    print(f"Error with atconn approach: {e}")
+                # Build the message based on available data
+                message = '⏳ **Waiting in Queue**\n\n'
                 
-                # If in queue - check status first to ensure "waiting" is always treated as queue
-                if current_status == 'waiting':
-                    in_queue = True
-                    
-                    # IMPORTANT: Check if queue has finished and needs confirmation (even while status is "waiting")
-                    # This handles the case where server is "waiting" but queue finished and needs confirmation
-                    if hasattr(aternos_server, '_info'):
-                        info_data = getattr(aternos_server, '_info')
-                        if isinstance(info_data, dict) and 'queue' in info_data:
-                            queue_info = info_data.get('queue', {})
-                            if isinstance(queue_info, dict):
-                                position = queue_info.get('position', None)
-                                pending = queue_info.get('pending', '')
-                                
-                                # If position is 1 or 0, or pending status, queue finished - try to confirm automatically
-                                if (position is not None and position <= 1) or (pending and str(pending).lower() == 'pending'):
-                                    print(f"🔍 Queue finished while in 'waiting' status! Position: {position}, Pending: {pending}")
-                                    print("🚀 Attempting automatic confirmation...")
-                                    
-                                    auto_confirm_success = False
-                                    
-                                    try:
-                                        # Refresh server status first
-                                        aternos_server.fetch()
-                                        
-                                        # Try library confirm() method FIRST (most reliable)
-                                        if hasattr(aternos_server, 'confirm') and callable(aternos_server.confirm):
-                                            try:
-                                                aternos_server.confirm()
-                                                auto_confirm_success = True
-                                                print("✅✅✅ AUTO-CONFIRMED using library method!")
-                                            except Exception as lib_err:
-                                                print(f"   Library confirm() failed: {lib_err}")
-                                        
-                                        # Try request_cloudflare if library method failed
-                                        if not auto_confirm_success and hasattr(aternos_server, 'atconn'):
-                                            atconn = aternos_server.atconn
-                                            server_id = getattr(aternos_server, 'servid', None)
-                                            
-                                            if hasattr(atconn, 'request_cloudflare'):
-                                                if server_id:
-                                                    confirm_url = f'https://aternos.org/ajax/server/confirm?id={server_id}'
-                                                else:
-                                                    confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                                
-                                                try:
-                                                    # Try POST first
-                                                    response = atconn.request_cloudflare(confirm_url, 'POST')
-                                                    if response is not None:
-                                                        auto_confirm_success = True
-                                                        print("✅✅✅ AUTO-CONFIRMED while in waiting status (POST)!")
-                                                except:
-                                                    try:
-                                                        # Try GET as fallback
-                                                        response = atconn.request_cloudflare(confirm_url, 'GET')
-                                                        if response is not None:
-                                                            auto_confirm_success = True
-                                                            print("✅✅✅ AUTO-CONFIRMED while in waiting status (GET)!")
-                                                    except:
-                                                        pass
-                                        
-                                        if auto_confirm_success:
-                                            await loading_msg.edit(content='✅ **Queue finished! Confirmation sent automatically.**\n⏳ Server is starting...')
-                                            await asyncio.sleep(3)
-                                            try:
-                                                aternos_server.fetch()
-                                                new_status = aternos_server.status
-                                                print(f"📡 Server status after confirmation: {new_status}")
-                                            except:
-                                                pass
-                                            await asyncio.sleep(2)
-                                            continue
-                                        
-                                    except Exception as auto_confirm_err:
-                                        print(f"⚠️ Auto-confirm failed while waiting: {auto_confirm_err}")
-                                        import traceback
-                                        traceback.print_exc()
-                                        # Continue with normal queue monitoring
-                    
-                    # Try to fetch queue data from panel page HTML (fetch every 3 seconds to avoid rate limiting)
-                    current_elapsed = int(time.time() - start_time)
-                    # Fetch on first iteration (0 seconds) and then every 3 seconds
-                    if current_elapsed == 0 or current_elapsed % 3 == 0:
-                        print(f"Fetching queue data (elapsed: {current_elapsed}s)")
-                        panel_queue_pos, panel_queue_time_str = await fetch_queue_data_from_panel(aternos_server)
-                        if panel_queue_pos:
-                            queue_position = panel_queue_pos
-                            last_queue_position = panel_queue_pos
-                            print(f"Updated queue position: {queue_position}")
-                        if panel_queue_time_str:
-                            last_queue_time_str = panel_queue_time_str
-                            print(f"Updated queue time: {panel_queue_time_str}")
-                        if not panel_queue_pos and not panel_queue_time_str:
-                            print("No queue data found from panel fetch")
+                # Add queue position if available
+                if queue_position is not None:
+                    message += f'📊 **Queue Position:** {queue_position}\n'
+                elif self.last_queue_position is not None:
+                    message += f'📊 **Queue Position:** {self.last_queue_position}\n'
+                else:
+                    message += f'📊 **Queue Position:** Unknown\n'
                 
-                # If in queue, show queue message
-                if in_queue or current_status == 'waiting':
-                    # Update last known values
-                    if queue_time is not None:
-                        last_queue_time = queue_time
-                    if queue_position is not None:
-                        last_queue_position = queue_position
-                    if queue_time_str is not None:
-                        last_queue_time_str = queue_time_str
-                    elif 'last_queue_time_str' not in locals() or last_queue_time_str is None:
-                        last_queue_time_str = None
-                    
-                    elapsed = int(time.time() - start_time)
-                    elapsed_str = f'{elapsed // 60}m {elapsed % 60}s' if elapsed >= 60 else f'{elapsed}s'
-                    
-                    # Build the message based on available data
-                    message = '⏳ **Waiting in Queue**\n\n'
-                    
-                    # Add queue position if available
-                    if queue_position is not None:
-                        message += f'📊 **Queue Position:** {queue_position}\n'
-                    elif last_queue_position is not None:
-                        message += f'📊 **Queue Position:** {last_queue_position}\n'
-                    else:
-                        message += f'📊 **Queue Position:** Unknown\n'
-                    
-                    # Add estimated time - ALWAYS use static locked value (NEVER changes)
-                    if static_queue_time_str:
-                        # Use the LOCKED static "ca. X min" value (never changes, only elapsed time updates)
-                        message += f'⏱️ {static_queue_time_str}\n'
-                    elif queue_time_str:
-                        # First time only - lock it in
-                        if static_queue_time_str is None:
-                            static_queue_time_str = queue_time_str
-                            print(f"🔒 LOCKED static queue time from queue_time_str: {static_queue_time_str}")
-                        message += f'⏱️ {static_queue_time_str}\n'
-                    elif last_queue_time_str:
-                        # First time only - lock it in
-                        if static_queue_time_str is None:
-                            static_queue_time_str = last_queue_time_str
-                            print(f"🔒 LOCKED static queue time from last_queue_time_str: {static_queue_time_str}")
-                        message += f'⏱️ {static_queue_time_str}\n'
-                    elif queue_time is not None:
-                        # First time only - lock it in
-                        if static_queue_time_str is None:
-                            est_minutes = int(queue_time / 60)
-                            static_queue_time_str = f"ca. {est_minutes} min"
-                            print(f"🔒 LOCKED static queue time from queue_time: {static_queue_time_str}")
-                        message += f'⏱️ {static_queue_time_str}\n'
-                    elif last_queue_time is not None:
-                        # First time only - lock it in
-                        if static_queue_time_str is None:
-                            est_minutes = int(last_queue_time / 60)
-                            static_queue_time_str = f"ca. {est_minutes} min"
-                            print(f"🔒 LOCKED static queue time from last_queue_time: {static_queue_time_str}")
-                        message += f'⏱️ {static_queue_time_str}\n'
-                    else:
-                        # Check if countdown is available - first time only
-                        if static_queue_time_str is None:
-                            countdown = getattr(aternos_server, 'countdown', -1)
-                            if countdown >= 0:
-                                countdown_min = int(countdown / 60)
-                                static_queue_time_str = f"ca. {countdown_min} min"
-                                print(f"🔒 LOCKED static queue time from countdown: {static_queue_time_str}")
-                        
-                        if static_queue_time_str:
-                            message += f'⏱️ {static_queue_time_str}\n'
-                        else:
-                            message += f'⏱️ **ca.** Calculating...\n'
-                    
-                    message += f'🕐 **Elapsed:** {elapsed_str}\n'
-                    message += f'📡 **Status:** {current_status.upper()}'
-                    
-                    await loading_msg.edit(content=message)
-                    
-                    # Wait 1 second before next update
-                    await asyncio.sleep(1)
-                    continue
+                # Live estimate from the queue drain model once it has learned a rate; Aternos' estimate until then
+                position = queue_position_of(aternos_server, queue_position if queue_position is not None else self.last_queue_position)
+                eta_seconds = None
+                if position is not None:
+                    eta_seconds = queue_drain_model.seconds_until(position, key=server_key(aternos_server))
+                if eta_seconds is not None:
+                    message += f'⏱️ {format_eta(eta_seconds)}\n'
+                elif queue_time_str or self.last_queue_time_str:
+                    message += f'⏱️ {queue_time_str or self.last_queue_time_str}\n'
+                elif queue_time is not None or self.last_queue_time is not None:
+                    message += f'⏱️ {format_eta(queue_time if queue_time is not None else self.last_queue_time)}\n'
+                else:
+                    message += f'⏱️ **ca.** Calculating...\n'
                 
-                # Check if server is online
-                if current_status == 'online':
-                    if str(guild_id) in queue_monitoring_tasks:
-                        del queue_monitoring_tasks[str(guild_id)]
-                    
-                    await loading_msg.edit(content=f'✅ **Server Started!**\n🟢 **Status:** ONLINE\n\n_Server is ready to use!_')
-                    return
+                message += f'🕐 **Elapsed:** {elapsed_str}\n'
+                message += f'📡 **Status:** {current_status.upper()}'
                 
-                # Check if starting
-                if current_status == 'starting':
-                    elapsed = int(time.time() - start_time)
-                    elapsed_str = f'{elapsed // 60}m {elapsed % 60}s' if elapsed >= 60 else f'{elapsed}s'
-                    
-                    await loading_msg.edit(
-                        content=f'⏳ **Loading... Preparing server...**\n🟡 **Status:** STARTING\n'
-                                f'🕐 **Elapsed:** {elapsed_str}\n\n_Please wait, server is starting up..._'
-                    )
-                    await asyncio.sleep(2)
-                    continue
+                await editor.update('queue', message)
                 
-                # For other statuses, wait a bit longer
-                await asyncio.sleep(2)
+                # Next update from the polling policy (or sooner if Aternos pushes a new status)
+                return self.policy.next_delay(current_status, position, key=server_key(aternos_server))
+            
+            # Check if server is online
+            if current_status == 'online':
+                self.unregister()
                 
-            except discord.errors.NotFound:
-                # Message was deleted
-                if str(guild_id) in queue_monitoring_tasks:
-                    del queue_monitoring_tasks[str(guild_id)]
+                await editor.update('online', f'✅ **Server Started!**\n🟢 **Status:** ONLINE\n\n_Server is ready to use!_')
                 return
-            except Exception as e:
-                print(f'Error in queue monitoring loop: {e}')
-                await asyncio.sleep(2)
+            
+            # Check if starting
+            if current_status == 'starting':
+                elapsed = int(time.time() - self.start_time)
+                elapsed_str = f'{elapsed // 60}m {elapsed % 60}s' if elapsed >= 60 else f'{elapsed}s'
                 
-    except asyncio.CancelledError:
-        # Task was cancelled
-        if str(guild_id) in queue_monitoring_tasks:
-            del queue_monitoring_tasks[str(guild_id)]
-        return
-    except Exception as e:
-        print(f'Error in monitor_queue: {e}')
-        if str(guild_id) in queue_monitoring_tasks:
-            del queue_monitoring_tasks[str(guild_id)]
+                await editor.update(
+                    'starting',
+                    f'⏳ **Loading... Preparing server...**\n🟡 **Status:** STARTING\n'
+                    f'🕐 **Elapsed:** {elapsed_str}\n\n_Please wait, server is starting up..._'
+                )
+                return self.policy.next_delay(current_status)
+            
+            # For other statuses, wait a bit longer
+            return self.policy.next_delay(current_status)
+            
+        except discord.errors.NotFound:
+            # Message was deleted
+            self.unregister()
+            return
+        except Exception as e:
+            print(f'Error in queue monitoring loop: {e}')
+            return 2
+
+def progress_message(ctx, message):
+    """A reply that a monitor can keep editing
 
-@bot.command(name='start')
+    Slash command replies can only be edited through the interaction for 15 minutes, longer than a queue
+    may take, so they are edited as a plain channel message instead.
+    """
+    if ctx.interaction is None:
+        return message
+    return ctx.channel.get_partial_message(message.id)
+
+@bot.hybrid_command(name='start')
+@commands.guild_only()
 async def start_server(ctx):
     """Start the Aternos server"""
+    # Slash command: acknowledge right away, the rest is sent as followups
+    await ctx.defer()
     # Get server-specific Aternos server
-    aternos_server = server_servers.get(str(ctx.guild.id))
+    aternos_server = await ensure_connected(ctx.guild.id)
     
     if not aternos_server:
-        await ctx.send('❌ Server not configured. Please set up your Aternos credentials in the `server-setup` channel using `!username` and `!password` commands.')
+        await outbox_send(ctx, '❌ Server not configured. Please set up your Aternos credentials in the `server-setup` channel using `!username` and `!password` commands.', priority=OUTBOX_URGENT)
         return
     
     try:
         # Refresh server status
-        aternos_server.fetch()
+        await aternos_fetch(aternos_server, STATUS_MAX_AGE)
         status = aternos_server.status
         
         if status == 'online':
-            await ctx.send('✅ **Server Status:** 🟢 **ONLINE**')
+            await outbox_send(ctx, '✅ **Server Status:** 🟢 **ONLINE**')
             return
         elif status == 'starting':
-            await ctx.send('⏳ **Loading... Preparing server...**\n🟡 Status: STARTING')
+            await outbox_send(ctx, '⏳ **Loading... Preparing server...**\n🟡 Status: STARTING')
             return
         
         # Send loading message
-        loading_msg = await ctx.send('⏳ **Loading... Preparing server...**')
+        loading_msg = progress_message(ctx, await outbox_send(ctx, '⏳ **Loading... Preparing server...**'))
         
         # Start the server
-        aternos_server.start()
+        await aternos_start(aternos_server)
         
         # Wait a moment for status to update
         await asyncio.sleep(3)
         
-        # Cancel any existing queue monitoring task for this guild
+        # Cancel any existing queue monitoring job for this guild
         if str(ctx.guild.id) in queue_monitoring_tasks:
             queue_monitoring_tasks[str(ctx.guild.id)].cancel()
         
-        # Start queue monitoring task
-        task = asyncio.create_task(monitor_queue(ctx, loading_msg, aternos_server, ctx.guild.id))
-        queue_monitoring_tasks[str(ctx.guild.id)] = task
+        # Start queue monitoring job
+        job = QueueMonitorJob(ctx, loading_msg, aternos_server, ctx.guild.id)
+        queue_monitoring_tasks[str(ctx.guild.id)] = monitor_scheduler.add(job)
         
     except Exception as e:
-        await ctx.send(f'❌ Error starting server: {str(e)}')
+        await outbox_send(ctx, f'❌ Error starting server: {str(e)}', priority=OUTBOX_URGENT)
 
-@bot.command(name='stop')
+@bot.hybrid_command(name='stop')
+@commands.guild_only()
 async def stop_server(ctx):
     """Stop the Aternos server"""
+    await ctx.defer()
     # Get server-specific Aternos server
-    aternos_server = server_servers.get(str(ctx.guild.id))
+    aternos_server = await ensure_connected(ctx.guild.id)
     
     if not aternos_server:
-        await ctx.send('❌ Server not configured. Please set up your Aternos credentials in the `server-setup` channel using `!username` and `!password` commands.')
+        await outbox_send(ctx, '❌ Server not configured. Please set up your Aternos credentials in the `server-setup` channel using `!username` and `!password` commands.', priority=OUTBOX_URGENT)
         return
     
     try:
         # Refresh server status
-        aternos_server.fetch()
+        await aternos_fetch(aternos_server, STATUS_MAX_AGE)
         status = aternos_server.status
         
         if status == 'offline':
-            await ctx.send('✅ Server is already offline!')
+            await outbox_send(ctx, '✅ Server is already offline!')
             return
         elif status == 'stopping':
-            await ctx.send('⏳ Server is already stopping...')
+            await outbox_send(ctx, '⏳ Server is already stopping...')
             return
         
         # Stop the server
-        aternos_server.stop()
-        await ctx.send('✅ **Server stopped!** 🛑\nThe server is now shutting down.')
+        await aternos_stop(aternos_server)
+        await outbox_send(ctx, '✅ **Server stopped!** 🛑\nThe server is now shutting down.')
     except Exception as e:
-        await ctx.send(f'❌ Error stopping server: {str(e)}')
+        await outbox_send(ctx, f'❌ Error stopping server: {str(e)}', priority=OUTBOX_URGENT)
 
-@bot.command(name='status')
+@bot.hybrid_command(name='status')
+@commands.guild_only()
 async def server_status(ctx):
     """Check the Aternos server status"""
+    await ctx.defer()
     # Get server-specific Aternos server
-    aternos_server = server_servers.get(str(ctx.guild.id))
+    aternos_server = await ensure_connected(ctx.guild.id)
     
     if not aternos_server:
-        await ctx.send('❌ Server not configured. Please set up your Aternos credentials in the `server-setup` channel using `!username` and `!password` commands.')
+        await outbox_send(ctx, '❌ Server not configured. Please set up your Aternos credentials in the `server-setup` channel using `!username` and `!password` commands.', priority=OUTBOX_URGENT)
         return
     
     try:
-        # Refresh server info
-        aternos_server.fetch()
-        status = aternos_server.status
+        # Served from the last status while it is fresh enough; only an older one is fetched again
+        await aternos_fetch(aternos_server, STATUS_COMMAND_MAX_AGE)
+        snapshot = snapshot_of(aternos_server)
+        status = snapshot.status
         
-        # Get player count if available
-        players_count = getattr(aternos_server, 'players_count', None)
-        players_list = getattr(aternos_server, 'players_list', None)
+        # Online players, out of the server's slots when known
+        max_players = as_int(snapshot.info.get('slots'))
+        players_display = f'{snapshot.players}/{max_players}' if max_players else f'{snapshot.players}'
         
-        # Calculate online players from players_list
-        if players_list is not None:
-            # players_list is usually a list of online players
-            players_online = len(players_list) if isinstance(players_list, list) else 0
-        else:
-            players_online = 0
-        
-        # Get max players (players_count is usually max players)
-        max_players = players_count if players_count is not None else 'N/A'
-        
-        # Format display
-        if max_players == 'N/A':
-            players_display = f'{players_online}' if players_online > 0 else '0'
-        else:
-            players_display = f'{players_online}/{max_players}'
+        age = snapshot.age
+        age_display = 'just now' if age < 1 else f'{age:.0f}s ago'
         
         status_emoji = {
             'online': '🟢',
@@ -2977,12 +4041,13 @@ async def server_status(ctx):
             'stopping': '**STOPPING...**'
         }.get(status, status.upper() if status else 'UNKNOWN')
         
-        await ctx.send(
+        await outbox_send(ctx,
             f'{status_emoji} **Server Status:** {status_display}\n'
-            f'👥 **Players:** {players_display}'
+            f'👥 **Players:** {players_display}\n'
+            f'🕐 _Updated {age_display}_'
         )
     except Exception as e:
-        await ctx.send(f'❌ Error getting server status: {e}')
+        await outbox_send(ctx, f'❌ Error getting server status: {e}', priority=OUTBOX_URGENT)
 
 @bot.command(name='autostart')
 async def auto_start_toggle(ctx, action: str = None):
@@ -2991,7 +4056,7 @@ async def auto_start_toggle(ctx, action: str = None):
         # Show current status
         is_enabled = get_auto_start_enabled(ctx.guild.id)
         status_text = "🟢 **ENABLED**" if is_enabled else "🔴 **DISABLED**"
-        await ctx.send(
+        await outbox_send(ctx,
             f'**24/7 Auto-Start Status:** {status_text}\n\n'
             f'**Usage:**\n'
             f'`!autostart enable` - Enable 24/7 auto-start\n'
@@ -3004,24 +4069,23 @@ async def auto_start_toggle(ctx, action: str = None):
     
     if action_lower == 'enable':
         # Check if server is configured
-        aternos_server = server_servers.get(str(ctx.guild.id))
+        aternos_server = await ensure_connected(ctx.guild.id)
         if not aternos_server:
-            await ctx.send('❌ Server not configured. Please set up your Aternos credentials in the `server-setup` channel using `!username` and `!password` commands.')
+            await outbox_send(ctx, '❌ Server not configured. Please set up your Aternos credentials in the `server-setup` channel using `!username` and `!password` commands.', priority=OUTBOX_URGENT)
             return
         
         # Enable auto-start
         set_auto_start_enabled(ctx.guild.id, True)
         
-        # Start monitoring task if not already running
+        # Start monitoring job if not already running
         if str(ctx.guild.id) not in auto_start_tasks:
-            task = asyncio.create_task(monitor_auto_start(ctx.guild.id))
-            auto_start_tasks[str(ctx.guild.id)] = task
+            auto_start_tasks[str(ctx.guild.id)] = monitor_scheduler.add(AutoStartJob(ctx.guild.id))
             print(f'✅ Auto-start monitoring started for guild {ctx.guild.id}')
         
-        await ctx.send(
+        await outbox_send(ctx,
             '✅ **24/7 Auto-Start ENABLED!**\n\n'
             '🔄 The bot will now automatically start your server if it goes offline.\n'
-            '⏱️ Checking every 5 seconds...\n\n'
+            f'⏱️ {describe_polling(ctx.guild.id)}\n\n'
             '_Use `!autostart disable` to turn this off._'
         )
         
@@ -3029,42 +4093,75 @@ async def auto_start_toggle(ctx, action: str = None):
         # Disable auto-start
         set_auto_start_enabled(ctx.guild.id, False)
         
-        # Stop monitoring task if running
+        # Stop monitoring job if running (cancel() also removes it from auto_start_tasks)
         if str(ctx.guild.id) in auto_start_tasks:
-            task = auto_start_tasks[str(ctx.guild.id)]
-            task.cancel()
-            del auto_start_tasks[str(ctx.guild.id)]
+            auto_start_tasks[str(ctx.guild.id)].cancel()
             print(f'⏸️ Auto-start monitoring stopped for guild {ctx.guild.id}')
         
-        await ctx.send(
+        await outbox_send(ctx,
             '⏸️ **24/7 Auto-Start DISABLED**\n\n'
             '_The bot will no longer automatically start your server._\n'
             '_Use `!autostart enable` to turn it back on._'
         )
     else:
-        await ctx.send(
+        await outbox_send(ctx,
             '❌ Invalid action. Use:\n'
             '`!autostart enable` - Enable 24/7 auto-start\n'
             '`!autostart disable` - Disable 24/7 auto-start'
         )
 
+@bot.command(name='polling')
+async def polling_preset(ctx, preset: str = None):
+    """Show or change how often the bot checks the server (eco, balanced or fast)"""
+    if not preset:
+        current = get_polling_preset(ctx.guild.id)
+        lines = []
+        for name, values in POLLING_PRESETS.items():
+            marker = '👉 ' if name == current else ''
+            lines.append(
+                f"{marker}`{name}` - queue checks every {values['min']}-{values['max']}s, "
+                f"starting {values['starting']}s, online {values['online']}s, offline {values['idle']}s"
+            )
+        await outbox_send(ctx,
+            f'**Polling Preset:** `{current}`\n\n' + '\n'.join(lines) + '\n\n'
+            f'_Queue checks get more frequent as the queue nears confirmation._\n'
+            f'**Usage:** `!polling eco|balanced|fast`'
+        )
+        return
+    
+    preset_lower = preset.lower()
+    if preset_lower not in POLLING_PRESETS:
+        await outbox_send(ctx, f'❌ Unknown preset. Use one of: {", ".join(f"`{name}`" for name in POLLING_PRESETS)}', priority=OUTBOX_URGENT)
+        return
+    
+    set_polling_preset(ctx.guild.id, preset_lower)
+    await outbox_send(ctx, f'✅ **Polling preset set to `{preset_lower}`.**')
+
 @bot.command(name='debug')
 async def debug_server(ctx):
     """Debug command to see all server attributes"""
     # Get server-specific Aternos server
-    aternos_server = server_servers.get(str(ctx.guild.id))
+    aternos_server = await ensure_connected(ctx.guild.id)
     
     if not aternos_server:
-        await ctx.send('❌ Server not configured.')
+        await outbox_send(ctx, '❌ Server not configured.', priority=OUTBOX_URGENT)
         return
     
     try:
         # Refresh server info
-        aternos_server.fetch()
+        await aternos_fetch(aternos_server, STATUS_MAX_AGE)
         
         debug_info = f"**Debug Information:**\n\n"
         debug_info += f"**Status:** `{aternos_server.status}`\n"
         
+        debug_info += f"\n**Aternos Traffic:**\n```\n{aternos_limiter.describe()}\n{monitor_scheduler.describe()}\n{confirm_stats.describe()}\n{discord_outbox.describe()}\n```\n"
+        if ATERNOS_STREAMING:
+            stream = status_streams.get(server_key(aternos_server))
+            if stream is not None and stream.live:
+                debug_info += f"Status stream: live ({stream.pushes} pushes, last {time.time() - stream.last_push_at:.0f}s ago)\n" if stream.pushes else "Status stream: live (no pushes yet)\n"
+            else:
+                debug_info += "Status stream: down (polling)\n"
+        
         # Check all possible queue-related attributes
         debug_info += f"\n**Queue Detection:**\n"
         debug_info += f"Has 'queue' attr: {hasattr(aternos_server, 'queue')}\n"
@@ -3119,48 +4216,34 @@ async def debug_server(ctx):
             # Send in chunks
             chunks = [debug_info[i:i+1900] for i in range(0, len(debug_info), 1900)]
             for chunk in chunks:
-                await ctx.send(chunk)
+                await outbox_send(ctx, chunk)
         else:
-            await ctx.send(debug_info)
+            await outbox_send(ctx, debug_info)
         
     except Exception as e:
-        await ctx.send(f'❌ Error: {e}')
+        await outbox_send(ctx, f'❌ Error: {e}', priority=OUTBOX_URGENT)
 
-@bot.command(name='confirm')
+@bot.hybrid_command(name='confirm')
+@commands.guild_only()
 async def confirm_start(ctx):
     """Manually confirm server start if confirmation is required - Works same as button"""
-    aternos_server = server_servers.get(str(ctx.guild.id))
+    await ctx.defer()
+    aternos_server = await ensure_connected(ctx.guild.id)
     
     if not aternos_server:
-        await ctx.send('❌ Server not configured.')
+        await outbox_send(ctx, '❌ Server not configured.', priority=OUTBOX_URGENT)
         return
     
     try:
         # Refresh server status first
-        aternos_server.fetch()
-        current_status = aternos_server.status
+        await aternos_fetch(aternos_server, STATUS_MAX_AGE, PRIORITY_CONFIRM)
         
         # Check if confirmation is actually needed
-        needs_confirm = False
-        if hasattr(aternos_server, '_info'):
-            info_data = getattr(aternos_server, '_info')
-            if isinstance(info_data, dict) and 'queue' in info_data:
-                queue_info = info_data.get('queue', {})
-                if isinstance(queue_info, dict):
-                    pending = queue_info.get('pending', '')
-                    if pending and str(pending).lower() == 'pending':
-                        needs_confirm = True
-        
-        # Also check css_class
-        if not needs_confirm and hasattr(aternos_server, 'css_class'):
-            css_class = str(aternos_server.css_class).lower()
-            if 'pending' in css_class or 'confirm' in css_class:
-                if 'queueing' not in css_class:
-                    needs_confirm = True
+        needs_confirm = snapshot_of(aternos_server).needs_confirm
         
         # Try to confirm
         if hasattr(aternos_server, 'confirm') and callable(aternos_server.confirm):
-            confirm_msg = await ctx.send('⏳ Sending confirmation to Aternos...')
+            confirm_msg = await outbox_send(ctx, '⏳ Sending confirmation to Aternos...')
             
             try:
                 # ============================================================
@@ -3172,26 +4255,18 @@ async def confirm_start(ctx):
                 
                 # Refresh server status first
                 print("1. Refreshing server status...")
-                aternos_server.fetch()
-                current_status = aternos_server.status
+                await aternos_fetch(aternos_server, STATUS_MAX_AGE, PRIORITY_CONFIRM)
+                snapshot = snapshot_of(aternos_server)
+                current_status = snapshot.status
                 print(f"   Status after fetch: {current_status}")
                 
-                # Check _info for confirmation status
-                print("2. Checking _info for confirmation requirements...")
-                if hasattr(aternos_server, '_info'):
-                    info_data = getattr(aternos_server, '_info')
-                    if isinstance(info_data, dict):
-                        print(f"   _info keys: {list(info_data.keys())}")
-                        if 'queue' in info_data:
-                            queue_info = info_data.get('queue', {})
-                            if isinstance(queue_info, dict):
-                                pending = queue_info.get('pending', '')
-                                position = queue_info.get('position', None)
-                                print(f"   Queue pending: '{pending}', position: {position}")
+                # Confirmation requirements from the status
+                print("2. Checking status for confirmation requirements...")
+                print(f"   Queue pending: '{snapshot.queue_pending}', position: {snapshot.queue_position}")
+                print(f"   Needs confirm: {snapshot.needs_confirm} ({snapshot.confirm_reason})")
                 
-                # Check css_class
                 print("3. Checking css_class...")
-                css_class = getattr(aternos_server, 'css_class', 'N/A')
+                css_class = snapshot.css_class
                 print(f"   css_class: '{css_class}'")
                 
                 # Check if confirm method exists
@@ -3216,7 +4291,7 @@ async def confirm_start(ctx):
                 print("7. Attempting to refresh connection...")
                 try:
                     # Re-fetch to get fresh token
-                    aternos_server.fetch()
+                    await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
                     print("   ✅ Server status refreshed")
                 except Exception as refresh_error:
                     print(f"   ⚠️ Could not refresh: {refresh_error}")
@@ -3224,10 +4299,10 @@ async def confirm_start(ctx):
                 # FORCE RE-AUTHENTICATION before confirming to get fresh token
                 print("8. Force re-authenticating with Aternos to get fresh token...")
                 try:
-                    if await connect_to_aternos(ctx.guild.id):
+                    if await connect_to_aternos(ctx.guild.id, force_login=True):
                         aternos_server = server_servers.get(str(ctx.guild.id))
                         if aternos_server:
-                            aternos_server.fetch()
+                            await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
                             print("   ✅ Re-authenticated and refreshed server")
                         else:
                             print("   ⚠️ Re-authenticated but server not found")
@@ -3242,80 +4317,7 @@ async def confirm_start(ctx):
                 last_error = None
                 
                 try:
-                    # Get the connection
-                    if hasattr(aternos_server, 'atconn'):
-                        atconn = aternos_server.atconn
-                        server_id = aternos_server.servid
-                        
-                        # Method 1: Use request_cloudflare (most reliable for Aternos)
-                        if hasattr(atconn, 'request_cloudflare'):
-                            try:
-                                print("   Trying request_cloudflare method...")
-                                confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                response = atconn.request_cloudflare(confirm_url, 'GET')
-                                print(f"   request_cloudflare response: {response}")
-                                
-                                if response:
-                                    if isinstance(response, dict):
-                                        if response.get('status') == 'success' or 'success' in str(response).lower():
-                                            confirm_success = True
-                                            print("   ✅ Confirm successful via request_cloudflare")
-                                    elif isinstance(response, str):
-                                        if 'success' in response.lower() or 'ok' in response.lower():
-                                            confirm_success = True
-                                            print("   ✅ Confirm successful via request_cloudflare")
-                                    else:
-                                        confirm_success = True
-                                        print("   ✅ Confirm successful via request_cloudflare (got response)")
-                            except Exception as cf_error:
-                                print(f"   ⚠️ request_cloudflare failed: {cf_error}")
-                                last_error = cf_error
-                        
-                        # Method 2: Direct session call
-                        if not confirm_success and hasattr(atconn, 'session'):
-                            try:
-                                print("   Trying direct session call...")
-                                session = atconn.session
-                                import aiohttp
-                                import requests
-                                
-                                confirm_url = 'https://aternos.org/ajax/server/confirm'
-                                
-                                if isinstance(session, aiohttp.ClientSession):
-                                    async with session.get(confirm_url) as response:
-                                        if response.status == 200:
-                                            result = await response.text()
-                                            print(f"   ✅ Direct session GET successful: {result}")
-                                            confirm_success = True
-                                elif isinstance(session, requests.Session):
-                                    loop = asyncio.get_event_loop()
-                                    response = await loop.run_in_executor(None, session.get, confirm_url)
-                                    if response.status_code == 200:
-                                        print(f"   ✅ Direct session GET successful: {response.text}")
-                                        confirm_success = True
-                            except Exception as session_error:
-                                print(f"   ⚠️ Direct session call failed: {session_error}")
-                                if not last_error:
-                                    last_error = session_error
-                        
-                        # Method 3: Library method as fallback
-                        if not confirm_success:
-                            try:
-                                print("   Trying library confirm() method as fallback...")
-                                aternos_server.confirm()
-                                print("   ✅ Library confirm() method called")
-                                confirm_success = True
-                            except Exception as lib_error:
-                                print(f"   ⚠️ Library confirm() failed: {lib_error}")
-                                if not last_error:
-                                    last_error = lib_error
-                    else:
-                        # No atconn, try library method
-                        print("   No atconn, trying library confirm() method...")
-                        aternos_server.confirm()
-                        print("   ✅ Library confirm() method called")
-                        confirm_success = True
-                        
+                    confirm_success, last_error = await attempt_confirm(aternos_server)
                 except Exception as confirm_error:
                     print(f"   ❌ All confirm methods failed")
                     last_error = confirm_error
@@ -3329,21 +4331,22 @@ async def confirm_start(ctx):
                 await asyncio.sleep(2)
                 
                 # Check status after confirmation
-                aternos_server.fetch()
+                await aternos_fetch(aternos_server)
                 new_status = aternos_server.status
                 
                 # Update message with success
-                await confirm_msg.edit(
+                await outbox_edit(confirm_msg,
                     content=f'✅ **Confirmation sent!**\n'
                            f'📡 **Server Status:** `{new_status}`\n'
-                           f'⏳ The server should start soon...'
+                           f'⏳ The server should start soon...',
+                    priority=OUTBOX_URGENT
                 )
                 
                 # If status is starting or online, send additional message
                 if new_status in ['starting', 'online']:
-                    await ctx.send('🎉 **Server is starting!** Please wait...')
+                    await outbox_send(ctx, '🎉 **Server is starting!** Please wait...')
                 elif needs_confirm:
-                    await ctx.send('✅ **Confirmation processed!** The server should start soon.')
+                    await outbox_send(ctx, '✅ **Confirmation processed!** The server should start soon.')
                     
             except Exception as confirm_error:
                 error_msg = str(confirm_error)
@@ -3356,18 +4359,19 @@ async def confirm_start(ctx):
                     print("🔄 Attempting to re-authenticate due to 400/401 error...")
                     try:
                         # Try to reconnect
-                        if await connect_to_aternos(ctx.guild.id):
+                        if await connect_to_aternos(ctx.guild.id, force_login=True):
                             print("✅ Re-authenticated successfully")
                             aternos_server = server_servers.get(str(ctx.guild.id))
                             if aternos_server:
-                                aternos_server.fetch()
+                                await aternos_fetch(aternos_server, priority=PRIORITY_CONFIRM)
                                 # Try confirm again
                                 try:
-                                    aternos_server.confirm()
-                                    await confirm_msg.edit(
+                                    await aternos_confirm(aternos_server)
+                                    await outbox_edit(confirm_msg,
                                         content=f'✅ **Confirmation sent!** (After re-authentication)\n'
                                                f'📡 **Server Status:** `{aternos_server.status}`\n'
-                                               f'⏳ The server should start soon...'
+                                               f'⏳ The server should start soon...',
+                                        priority=OUTBOX_URGENT
                                     )
                                     return
                                 except Exception as retry_error:
@@ -3375,23 +4379,24 @@ async def confirm_start(ctx):
                     except Exception as reconnect_error:
                         print(f"❌ Re-authentication failed: {reconnect_error}")
                 
-                await confirm_msg.edit(
+                await outbox_edit(confirm_msg,
                     content=f'❌ **Error confirming:** {error_msg}\n\n'
                            f'**Possible causes:**\n'
                            f'• Server might not need confirmation right now\n'
                            f'• Token expired - try restarting the bot\n'
                            f'• Server status changed\n\n'
-                           f'**Please check the server status on Aternos website.**'
+                           f'**Please check the server status on Aternos website.**',
+                    priority=OUTBOX_URGENT
                 )
         else:
-            await ctx.send('❌ No confirmation method available.\n'
-                          'The server might not need confirmation right now, or it\'s already confirmed.')
+            await outbox_send(ctx, '❌ No confirmation method available.\n'
+                          'The server might not need confirmation right now, or it\'s already confirmed.', priority=OUTBOX_URGENT)
     except Exception as e:
         error_msg = str(e)
         print(f'Error in confirm command: {e}')
         import traceback
         traceback.print_exc()
-        await ctx.send(f'❌ **Error:** {error_msg}')
+        await outbox_send(ctx, f'❌ **Error:** {error_msg}', priority=OUTBOX_URGENT)
 
 @bot.command(name='invite')
 async def invite_link(ctx):
@@ -3401,7 +4406,7 @@ async def invite_link(ctx):
     # Permissions: Manage Channels, Send Messages, Read Message History, Embed Links
     permissions = 2147568640
     
-    invite_url = f'https://discord.com/oauth2/authorize?client_id={bot_id}&permissions={permissions}&scope=bot'
+    invite_url = f'https://discord.com/oauth2/authorize?client_id={bot_id}&permissions={permissions}&scope=bot+applications.commands'
     
     embed = discord.Embed(
         title='🔗 Add Bot to Your Server',
@@ -3420,7 +4425,7 @@ async def invite_link(ctx):
     )
     embed.set_footer(text='Make sure the bot is set as "Public Bot" in Developer Portal')
     
-    await ctx.send(embed=embed)
+    await outbox_send(ctx, embed=embed)
 
 # Run the bot
 if __name__ == '__main__':
@@ -3463,7 +4468,7 @@ if __name__ == '__main__':
     print(f'   1. Go to: https://discord.com/developers/applications/1442827241892352073/bot')
     print(f'   2. Enable "Public Bot" toggle')
     print(f'\n🔗 Invite URL:')
-    print(f'   https://discord.com/oauth2/authorize?client_id=1442827241892352073&permissions=2147568640&scope=bot')
+    print(f'   https://discord.com/oauth2/authorize?client_id=1442827241892352073&permissions=2147568640&scope=bot+applications.commands')
     print(f'\n' + '='*50 + '\n')
     
     # Start HTTP server for Render.com port binding (runs in background thread)
@@ -3473,12 +4478,45 @@ if __name__ == '__main__':
         
         class HealthHandler(BaseHTTPRequestHandler):
             def do_GET(self):
+                path = self.path.split('?', 1)[0]
+                if STATUS_API and (path == '/api/status' or path.startswith('/api/status/')):
+                    self.send_status_document(path)
+                    return
                 self.send_response(200)
                 self.send_header('Content-type', 'text/plain; charset=utf-8')
                 self.end_headers()
-                message = '🤖 Aternos Discord Bot is running!'
+                message = health_report
                 self.wfile.write(message.encode('utf-8'))
             
+            def send_status_document(self, path):
+                """JSON from the status feed (memory only), with ETag revalidation"""
+                document = status_feed.get(path)
+                if document is None:
+                    body = json.dumps({'error': 'unknown guild or no status yet'}).encode('utf-8')
+                    self.send_response(404)
+                    self.send_header('Content-type', 'application/json')
+                    self.send_header('Content-Length', str(len(body)))
+                    self.end_headers()
+                    self.wfile.write(body)
+                    return
+                body, etag = document
+                if_none_match = self.headers.get('If-None-Match', '')
+                if if_none_match.strip() == '*' or etag in [tag.strip().replace('W/', '', 1) for tag in if_none_match.split(',')]:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.send_header('Cache-Control', 'no-cache')
+                    self.send_header('Access-Control-Allow-Origin', '*')
+                    self.end_headers()
+                    return
+                self.send_response(200)
+                self.send_header('Content-type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.send_header('ETag', etag)
+                self.send_header('Cache-Control', 'no-cache')
+                self.send_header('Access-Control-Allow-Origin', '*')
+                self.end_headers()
+                self.wfile.write(body)
+            
             def log_message(self, format, *args):
                 pass  # Suppress HTTP server logs
         